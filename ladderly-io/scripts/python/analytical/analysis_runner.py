@@ -0,0 +1,200 @@
+# config-driven runner for the analytical/ regressions
+# declare a dataset, derived features, validations and model specs in a TOML
+# file under analyses/; fitted models are cached by data + spec + code hash and
+# uncached specs are fit in parallel
+# usage: python3 analysis_runner.py analyses/blog-15-job-search-regression.toml [--jobs N] [--no-cache]
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tomllib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import statsmodels
+import statsmodels.api as sm
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import instrumentation
+import job_search_features
+from dataset_cache import load_csv, source_digest
+from job_search_features import build_job_search_features, lowered_categorical
+from resampling import bootstrap_table, permutation_table
+
+ANALYTICAL_DIR = Path(__file__).resolve().parent
+CACHE_DIR = ANALYTICAL_DIR / 'analysis-cache.ignoreme.d'
+
+# Named feature builders a dataset can apply, in order, after loading
+FEATURE_BUILDERS = {
+    'job_search': build_job_search_features,
+}
+
+MODEL_TYPES = {
+    'ols': sm.OLS,
+    'logit': sm.Logit,
+}
+
+# Model spec fields that change the fitted model, and so key its cache entry
+FIT_FIELDS = ('name', 'type', 'outcome', 'predictors')
+
+
+def load_config(config_path):
+    with open(config_path, 'rb') as f:
+        config = tomllib.load(f)
+    config['dataset']['path'] = str(
+        (Path(config_path).parent / config['dataset']['path']).resolve()
+    )
+    return config
+
+
+def load_dataset(dataset):
+    """Reads the CSV once with declared categorical dtypes, then derives features.
+
+    The CSV goes through the Parquet cache; `columns`, when given, limits which
+    columns are read. `flags` entries become 0/1 columns: 1 when `column`,
+    lowercased, is one of `in`.
+    """
+    df = load_csv(
+        dataset['path'],
+        columns=dataset.get('columns'),
+        categorical=dataset.get('categorical', []),
+    )
+    for builder in dataset.get('features', []):
+        df = FEATURE_BUILDERS[builder](df)
+    for name, flag in dataset.get('flags', {}).items():
+        values = [value.lower() for value in flag['in']]
+        df[name] = lowered_categorical(df[flag['column']]).isin(values).astype(int)
+    return df
+
+
+def dataset_hash(dataset):
+    """Hashes the CSV bytes together with how features are derived from them."""
+    digest = hashlib.sha256(source_digest(dataset['path']).encode())
+    digest.update(json.dumps(dataset, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def code_hash():
+    """Hashes the code that builds features and models, so edits refit them."""
+    digest = hashlib.sha256(inspect.getsource(job_search_features).encode())
+    for fn in (load_dataset, fit_model):
+        digest.update(inspect.getsource(fn).encode())
+    return digest.hexdigest()
+
+
+def model_cache_path(data_hash, spec):
+    # only the fields fit_model reads; bootstrap/permutations/seed reuse the fit
+    fit_spec = {field: spec.get(field) for field in FIT_FIELDS}
+    key = json.dumps(
+        [data_hash, fit_spec, statsmodels.__version__, code_hash()], sort_keys=True
+    )
+    return CACHE_DIR / f"{spec['name']}-{hashlib.sha256(key.encode()).hexdigest()[:16]}.pickle"
+
+
+def run_validations(df, validations):
+    """Counts rows matching each `query` and compares against `expected`."""
+    passed = True
+    for validation in validations:
+        actual = len(df.query(validation['query']))
+        expected = validation['expected']
+        if actual == expected:
+            print(f"Success: {validation['name']} = {actual}")
+        else:
+            print(f"Failure: {validation['name']} = {actual}, expected {expected}")
+            passed = False
+    return passed
+
+
+def fit_model(df, spec):
+    X = sm.add_constant(df[spec['predictors']])
+    y = df[spec['outcome']]
+    return MODEL_TYPES[spec.get('type', 'ols')](y, X).fit()
+
+
+def fit_models(df, specs, data_hash, jobs=None, use_cache=True):
+    """Returns {name: (results, cached)}, fitting uncached specs in parallel."""
+    fitted = {}
+    misses = []
+    for spec in specs:
+        path = model_cache_path(data_hash, spec)
+        if use_cache and path.exists():
+            fitted[spec['name']] = (sm.load(path), True)
+            instrumentation.count('models.cache_hits')
+        else:
+            misses.append((spec, path))
+    instrumentation.count('models.fitted', len(misses))
+
+    if len(misses) == 1 or jobs == 1:
+        results = [fit_model(df, spec) for spec, _ in misses]
+    elif misses:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                pool.submit(fit_model, df[[s['outcome'], *s['predictors']]], s)
+                for s, _ in misses
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = []
+
+    for (spec, path), result in zip(misses, results):
+        if use_cache:
+            CACHE_DIR.mkdir(exist_ok=True)
+            result.save(path)
+        fitted[spec['name']] = (result, False)
+    return fitted
+
+
+def print_resampling(df, spec, jobs=None):
+    """Prints bootstrap/permutation tables for OLS specs that ask for them.
+
+    `bootstrap` and `permutations` set the resample counts; `seed` defaults to 0.
+    """
+    if spec.get('type', 'ols') != 'ols':
+        return
+    X = sm.add_constant(df[spec['predictors']])
+    y = df[spec['outcome']]
+    seed = spec.get('seed', 0)
+    if spec.get('bootstrap'):
+        print(bootstrap_table(X, y, n_resamples=spec['bootstrap'], seed=seed, workers=jobs))
+    if spec.get('permutations'):
+        print(permutation_table(X, y, n_permutations=spec['permutations'], seed=seed, workers=jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run declared analyses.')
+    parser.add_argument('configs', nargs='+', help='analysis TOML files')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help='parallel model fits')
+    parser.add_argument('--no-cache', action='store_true', help='refit every model')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    datasets = {}
+    for config_path in args.configs:
+        config = load_config(config_path)
+        dataset = config['dataset']
+        dataset_key = json.dumps(dataset, sort_keys=True)
+        if dataset_key not in datasets:
+            with instrumentation.span('load dataset'):
+                datasets[dataset_key] = (load_dataset(dataset), dataset_hash(dataset))
+        df, data_hash = datasets[dataset_key]
+
+        print(f'# {config.get("title", config_path)}')
+        with instrumentation.span('validations'):
+            run_validations(df, config.get('validations', []))
+        models = config.get('models', [])
+        with instrumentation.span('fit models'):
+            fitted = fit_models(df, models, data_hash, jobs=args.jobs, use_cache=not args.no_cache)
+        for spec in models:
+            result, cached = fitted[spec['name']]
+            print(f"\n## {spec['name']} ({'cached' if cached else 'fitted'})")
+            print(result.summary())
+            with instrumentation.span('resampling'):
+                print_resampling(df, spec, jobs=args.jobs)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# benchmarks Parquet-cached loads against pd.read_csv + category inference
+# on a synthetic job search log resampled from blog-15-job-search-regression.csv
+# usage: python3 benchmarks/bench_dataset_cache.py [--rows 2000000]
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ANALYTICAL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ANALYTICAL_DIR))
+sys.path.insert(0, str(ANALYTICAL_DIR / 'benchmarks'))
+
+import dataset_cache  # noqa: E402
+from bench_job_search_features import synthetic_log  # noqa: E402
+from job_search_features import JOB_SEARCH_COLUMNS  # noqa: E402
+
+CATEGORICAL = ['Company', 'Resume Version', 'Contact Role', 'Job Post Title', 'Status', 'Referral']
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='dataset cache benchmark')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / 'job-search.csv'
+        synthetic_log(args.rows).to_csv(csv_path, index=False)
+        # Keep the benchmark's conversions out of the real cache
+        dataset_cache.CACHE_DIR = Path(tmp) / 'cache'
+        dataset_cache.MANIFEST_PATH = dataset_cache.CACHE_DIR / 'manifest.json'
+
+        dtypes = {column: 'category' for column in CATEGORICAL}
+        csv_seconds, expected = timed(pd.read_csv, csv_path, usecols=JOB_SEARCH_COLUMNS, dtype=dtypes)
+        first_seconds, _ = timed(dataset_cache.load_csv, csv_path, categorical=CATEGORICAL)
+        warm_seconds, cached = timed(
+            dataset_cache.load_csv, csv_path, columns=JOB_SEARCH_COLUMNS, categorical=CATEGORICAL
+        )
+
+    print(f'{args.rows} applications')
+    print(f'read_csv + categories:      {csv_seconds:6.2f}s')
+    print(f'first load (converts):      {first_seconds:6.2f}s')
+    print(f'cached, projected columns:  {warm_seconds:6.2f}s')
+
+    pd.testing.assert_frame_equal(expected, cached[expected.columns])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# benchmarks vectorized job search features against the per-row apply version
+# on synthetic logs resampled from blog-15-job-search-regression.csv
+# usage: python3 benchmarks/bench_job_search_features.py [--rows 2000000]
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ANALYTICAL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ANALYTICAL_DIR))
+
+from job_search_features import build_job_search_features  # noqa: E402
+
+
+def legacy_features(df):
+    """The original blog-15 feature construction."""
+    df = df.copy()
+
+    def determine_interview_corrected(status):
+        status = status.lower()
+        if status in ['rejected, pre-r1', 'r1 cancelled', 'applied', 'timed out']:
+            return 0
+        return 1
+
+    df['attained_interview'] = df['Status'].apply(lambda x: determine_interview_corrected(x))
+    df['is_low_effort'] = ((df['Contact Role'].str.lower() == 'skipped') & (df['Job Post Title'].str.lower() == 'skipped')).astype(int)
+    df['Company'] = df['Company'].astype('category').cat.codes
+    df['Resume Version'] = df['Resume Version'].astype('category').cat.codes
+    df['Referral'] = (df['Referral'].str.upper() == 'YES').astype(int)
+    df['Inbound Opportunity'] = df['Inbound Opportunity'].astype(int)
+    return df
+
+
+def synthetic_log(rows, seed=0):
+    """Resamples the real log to `rows` applications with varied casing."""
+    source = pd.read_csv(ANALYTICAL_DIR / 'blog-15-job-search-regression.csv')
+    rng = np.random.default_rng(seed)
+    df = source.iloc[rng.integers(0, len(source), rows)].reset_index(drop=True)
+    df['Company'] = df['Company'] + ' ' + (rng.integers(0, 5000, rows)).astype(str)
+    recased = rng.random(rows) < 0.3
+    df.loc[recased, 'Status'] = df.loc[recased, 'Status'].str.title()
+    return df
+
+
+def timed(fn, df):
+    started = time.perf_counter()
+    result = fn(df)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='job search feature benchmark')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_log(args.rows)
+    legacy_seconds, legacy = timed(legacy_features, df)
+    vectorized_seconds, vectorized = timed(build_job_search_features, df)
+    print(f'{args.rows} applications')
+    print(f'apply + per-column lower: {legacy_seconds:6.2f}s')
+    print(f'vectorized categoricals:  {vectorized_seconds:6.2f}s')
+
+    columns = ['attained_interview', 'is_low_effort', 'Company', 'Resume Version', 'Referral', 'Inbound Opportunity']
+    pd.testing.assert_frame_equal(legacy[columns], vectorized[columns])
+
+
+if __name__ == '__main__':
+    main()
@@ -4,57 +4,69 @@
 # `blog/2024-08-04-no-cover-letters.md`
 # explains interview attainment
 
-import pandas as pd
+import argparse
+import os
+import sys
+
 import statsmodels.api as sm
 
-# Load the CSV file
-file_path = './blog-15-job-search-regression.csv'
-df = pd.read_csv(file_path)
-
-# Step 1 of 3: Construct Variables
-def determine_interview_corrected(status):
-    status = status.lower()
-    if status in ['rejected, pre-r1', 'r1 cancelled', 'applied', 'timed out']:
-        return 0
-    return 1
-
-# Apply the function to the Status column to create the attained_interview column
-df['attained_interview'] = df['Status'].apply(lambda x: determine_interview_corrected(x))
-
-# Calculate `is_low_effort`
-df['is_low_effort'] = ((df['Contact Role'].str.lower() == 'skipped') & (df['Job Post Title'].str.lower() == 'skipped')).astype(int)
-
-# Convert `Company` and `Resume Version` to categorical codes
-df['Company'] = df['Company'].astype('category').cat.codes
-df['Resume Version'] = df['Resume Version'].astype('category').cat.codes
-
-# Create dummy variables for Referral and Inbound Opportunity
-df['Referral'] = (df['Referral'].str.upper() == 'YES').astype(int)
-df['Inbound Opportunity'] = df['Inbound Opportunity'].astype(int)
-
-# Step 2 of 3: Validate Features
-# Expected values
-expected_total_inbound = 17
-expected_inbound_attained_interview = 14
-
-# Actual values
-total_inbound = df['Inbound Opportunity'].sum()
-inbound_attained_interview = df[(df['Inbound Opportunity'] == 1) & (df['attained_interview'] == 1)].shape[0]
-
-# Print validation results
-if total_inbound == expected_total_inbound:
-    print(f"Success: Total inbound records = {total_inbound}")
-else:
-    print(f"Failure: Total inbound records = {total_inbound}, expected {expected_total_inbound}")
-
-if inbound_attained_interview == expected_inbound_attained_interview:
-    print(f"Success: Inbound records that attained interview = {inbound_attained_interview}")
-else:
-    print(f"Failure: Inbound records that attained interview = {inbound_attained_interview}, expected {expected_inbound_attained_interview}")
-
-# Step 3 of 3: Run Multiple Regression
-X = df[['is_low_effort', 'Resume Version', 'Company', 'Referral', 'Inbound Opportunity']]
-y = df['attained_interview']
-X = sm.add_constant(X)
-model = sm.OLS(y, X).fit()
-print(model.summary())
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import instrumentation
+from dataset_cache import load_csv
+from job_search_features import JOB_SEARCH_COLUMNS, build_job_search_features
+from resampling import bootstrap_table, permutation_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Blog 15 job search regression.')
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    # Load the CSV file, through the Parquet cache, reading only the columns we use
+    file_path = './blog-15-job-search-regression.csv'
+    with instrumentation.span('load'):
+        df = load_csv(file_path, columns=JOB_SEARCH_COLUMNS)
+
+    # Step 1 of 3: Construct Variables
+    # attained_interview, is_low_effort, coded Company/Resume Version, 0/1 Referral and Inbound Opportunity
+    df = build_job_search_features(df)
+
+    # Step 2 of 3: Validate Features
+    # Expected values
+    expected_total_inbound = 17
+    expected_inbound_attained_interview = 14
+
+    # Actual values
+    total_inbound = df['Inbound Opportunity'].sum()
+    inbound_attained_interview = df[(df['Inbound Opportunity'] == 1) & (df['attained_interview'] == 1)].shape[0]
+
+    # Print validation results
+    if total_inbound == expected_total_inbound:
+        print(f"Success: Total inbound records = {total_inbound}")
+    else:
+        print(f"Failure: Total inbound records = {total_inbound}, expected {expected_total_inbound}")
+
+    if inbound_attained_interview == expected_inbound_attained_interview:
+        print(f"Success: Inbound records that attained interview = {inbound_attained_interview}")
+    else:
+        print(f"Failure: Inbound records that attained interview = {inbound_attained_interview}, expected {expected_inbound_attained_interview}")
+
+    # Step 3 of 3: Run Multiple Regression
+    X = df[['is_low_effort', 'Resume Version', 'Company', 'Referral', 'Inbound Opportunity']]
+    y = df['attained_interview']
+    X = sm.add_constant(X)
+    with instrumentation.span('fit'):
+        model = sm.OLS(y, X).fit()
+    print(model.summary())
+
+    # Resampling checks for the binary outcome: bootstrap intervals and permutation p-values
+    with instrumentation.span('resampling'):
+        print(bootstrap_table(X, y, n_resamples=2000, seed=15))
+        print(permutation_table(X, y, n_permutations=2000, seed=15))
+
+
+# The resampling tables fan out to worker processes, which re-import this
+# script when they are spawned (the default on macOS and Windows)
+if __name__ == '__main__':
+    main()
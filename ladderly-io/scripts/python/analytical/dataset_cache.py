@@ -0,0 +1,100 @@
+# transparent Parquet cache for the analytical/ CSV inputs
+# the first load converts a CSV to typed Parquet; later loads memory-map it
+# and read only the requested columns
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - falls back to parsing the CSV every time
+    pq = None
+
+ANALYTICAL_DIR = Path(__file__).resolve().parent
+CACHE_DIR = ANALYTICAL_DIR / 'dataset-cache.ignoreme.d'
+MANIFEST_PATH = CACHE_DIR / 'manifest.json'
+
+
+def _read_manifest():
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(path):
+    """sha256 of a source file, rehashed only when its size or mtime changes."""
+    path = Path(path).resolve()
+    stat = path.stat()
+    manifest = _read_manifest()
+    entry = manifest.get(str(path))
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['sha256']
+
+    digest = _file_digest(path)
+    manifest[str(path)] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': digest}
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return digest
+
+
+def _csv_dtypes(categorical):
+    return {column: 'category' for column in categorical}
+
+
+def _source_prefix(path):
+    """Names every conversion of one CSV; the path hash keeps same-named CSVs apart."""
+    path_key = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    return f'{Path(path).stem}-{path_key}-'
+
+
+def _version_prefix(path):
+    return f'{_source_prefix(path)}{source_digest(path)[:16]}-'
+
+
+def cached_parquet_path(path, categorical=()):
+    dtypes_key = hashlib.sha256(json.dumps(sorted(categorical)).encode()).hexdigest()[:8]
+    return CACHE_DIR / f'{_version_prefix(path)}{dtypes_key}.parquet'
+
+
+def _convert(path, parquet_path, categorical):
+    df = pd.read_csv(path, dtype=_csv_dtypes(categorical))
+    # Drop conversions of older versions of this CSV before writing the new one
+    current = _version_prefix(path)
+    for stale in CACHE_DIR.glob(f'{_source_prefix(path)}*.parquet'):
+        if not stale.name.startswith(current):
+            stale.unlink()
+    tmp_path = parquet_path.with_suffix('.parquet.tmp')
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, parquet_path)
+
+
+def load_csv(path, columns=None, categorical=()):
+    """Loads a CSV through the Parquet cache, like pd.read_csv(path, usecols=columns).
+
+    `categorical` columns are read with the category dtype, which Parquet keeps,
+    so category inference also happens once per version of the file. Without
+    pyarrow this just parses the CSV.
+    """
+    if pq is None:
+        return pd.read_csv(path, usecols=columns, dtype=_csv_dtypes(categorical))
+
+    parquet_path = cached_parquet_path(path, categorical)
+    if not parquet_path.exists():
+        _convert(path, parquet_path, categorical)
+    table = pq.read_table(parquet_path, columns=columns, memory_map=True)
+    return table.to_pandas()
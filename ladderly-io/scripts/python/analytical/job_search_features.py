@@ -0,0 +1,70 @@
+# vectorized feature construction for job search logs
+# shared by the analytical/ scripts, e.g. blog-15-job-search-regression.py
+
+import numpy as np
+import pandas as pd
+
+# Raw columns build_job_search_features reads
+JOB_SEARCH_COLUMNS = [
+    'Company',
+    'Resume Version',
+    'Contact Role',
+    'Job Post Title',
+    'Status',
+    'Referral',
+    'Inbound Opportunity',
+]
+
+# Statuses that mean the application never reached an interview
+NO_INTERVIEW_STATUSES = ['rejected, pre-r1', 'r1 cancelled', 'applied', 'timed out']
+
+
+def lowered_categorical(values):
+    """Lowercases a text column as a categorical.
+
+    String work happens once per distinct value instead of once per row,
+    which matters for log columns with few distinct values and many rows.
+    """
+    codes, uniques = pd.factorize(values)
+    lowered = pd.Index(uniques, dtype=object).str.lower()
+    categories = lowered.unique()
+    remapped = categories.get_indexer(lowered)
+    new_codes = np.where(codes >= 0, remapped[codes], -1)
+    return pd.Series(
+        pd.Categorical.from_codes(new_codes, categories),
+        index=values.index,
+        name=values.name,
+    )
+
+
+def normalize_text_columns(df, columns):
+    """Returns lowered categoricals for `columns`, normalizing each column once."""
+    return {column: lowered_categorical(df[column]) for column in columns}
+
+
+def build_job_search_features(df):
+    """Adds model features to a job search log, replacing the coded columns.
+
+    - attained_interview: 1 unless Status is one of NO_INTERVIEW_STATUSES
+    - is_low_effort: 1 when both Contact Role and Job Post Title were skipped
+    - Company, Resume Version: categorical codes
+    - Referral, Inbound Opportunity: 0/1
+    """
+    df = df.copy()
+    text = normalize_text_columns(
+        df, ['Status', 'Contact Role', 'Job Post Title', 'Referral']
+    )
+
+    df['attained_interview'] = (
+        ~text['Status'].isin(NO_INTERVIEW_STATUSES)
+    ).astype(int)
+    df['is_low_effort'] = (
+        (text['Contact Role'] == 'skipped') & (text['Job Post Title'] == 'skipped')
+    ).astype(int)
+
+    df['Company'] = df['Company'].astype('category').cat.codes
+    df['Resume Version'] = df['Resume Version'].astype('category').cat.codes
+
+    df['Referral'] = (text['Referral'] == 'yes').astype(int)
+    df['Inbound Opportunity'] = df['Inbound Opportunity'].astype(int)
+    return df
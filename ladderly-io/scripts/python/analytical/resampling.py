@@ -0,0 +1,111 @@
+# bootstrap confidence intervals and permutation p-values for OLS fits
+# resamples are solved in stacked batches with NumPy instead of refitting sm.OLS in a loop
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def batched_ols(X, y):
+    """Solves a stack of least-squares problems at once.
+
+    X has shape (batch, n, k) and y has shape (batch, n); returns (batch, k).
+    Uses the pseudo-inverse of each X'X, like sm.OLS, so a resample that drops
+    every row of some category still gets a minimum-norm solution.
+    """
+    XtX = np.einsum('bnk,bnl->bkl', X, X)
+    Xty = np.einsum('bnk,bn->bk', X, y)
+    return np.einsum('bkl,bl->bk', np.linalg.pinv(XtX, hermitian=True), Xty)
+
+
+def _bootstrap_batch(X, y, size, seed):
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(y), size=(size, len(y)))
+    return batched_ols(X[rows], y[rows])
+
+
+def _permutation_batch(X, y, column, size, seed):
+    # Shuffle one predictor per resample, breaking only its link to the outcome
+    rng = np.random.default_rng(seed)
+    order = rng.permuted(np.tile(np.arange(len(y)), (size, 1)), axis=1)
+    X_perm = np.broadcast_to(X, (size, *X.shape)).copy()
+    X_perm[:, :, column] = X[order, column]
+    return batched_ols(X_perm, np.broadcast_to(y, (size, len(y))))[:, column]
+
+
+def _run_batches(fn, args, n_resamples, batch_size, seed, workers):
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers == 1 or len(sizes) == 1:
+        return np.concatenate([fn(*args, size, s) for size, s in zip(sizes, seeds)])
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, *args, size, s) for size, s in zip(sizes, seeds)]
+        return np.concatenate([future.result() for future in futures])
+
+
+def _as_arrays(X, y):
+    return (
+        np.asarray(X, dtype=float),
+        np.asarray(y, dtype=float),
+        list(getattr(X, 'columns', range(np.shape(X)[1]))),
+    )
+
+
+def bootstrap_table(
+    X, y, n_resamples=2000, alpha=0.05, batch_size=500, seed=0, workers=None
+):
+    """Case-resampling bootstrap for OLS coefficients.
+
+    X should already include the constant (sm.add_constant). Returns one row per
+    coefficient with the full-sample estimate, bootstrap standard error and
+    percentile confidence interval.
+    """
+    X, y, names = _as_arrays(X, y)
+    coef = batched_ols(X[None], y[None])[0]
+    draws = _run_batches(
+        _bootstrap_batch, (X, y), n_resamples, batch_size, seed, workers or os.cpu_count()
+    )
+    lower, upper = np.percentile(draws, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+    return pd.DataFrame(
+        {
+            'coef': coef,
+            'boot std err': draws.std(axis=0, ddof=1),
+            f'[{alpha / 2:.3f}': lower,
+            f'{1 - alpha / 2:.3f}]': upper,
+        },
+        index=names,
+    )
+
+
+def permutation_table(
+    X, y, n_permutations=2000, batch_size=500, seed=0, workers=None, skip=('const',)
+):
+    """Permutation p-values for OLS coefficients.
+
+    Each predictor is permuted on its own while the others stay fixed; the
+    p-value is the share of permuted |coef| at least as large as observed,
+    with the +1 correction so it is never exactly zero. Columns named in
+    `skip` (the constant by default) are left out.
+    """
+    X, y, names = _as_arrays(X, y)
+    coef = batched_ols(X[None], y[None])[0]
+    rows = {}
+    for column, name in enumerate(names):
+        if name in skip:
+            continue
+        permuted = _run_batches(
+            _permutation_batch,
+            (X, y, column),
+            n_permutations,
+            batch_size,
+            seed,
+            workers or os.cpu_count(),
+        )
+        extreme = np.count_nonzero(np.abs(permuted) >= abs(coef[column]))
+        rows[name] = (coef[column], (extreme + 1) / (n_permutations + 1))
+    return pd.DataFrame.from_dict(rows, orient='index', columns=['coef', 'perm p-value'])
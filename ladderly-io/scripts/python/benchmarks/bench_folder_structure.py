@@ -0,0 +1,118 @@
+"""
+Benchmarks the AGENTS.md folder listing on a synthetic 200k-file checkout where
+most files sit in ignored node_modules/ and build output, comparing the
+os.walk implementation it replaced with the pruned os.scandir walker.
+
+Usage:
+  uv run python benchmarks/bench_folder_structure.py [--files 200000] [--keep DIR]
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pathspec
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(
+        filename.replace("-", "_").removesuffix(".py"), SCRIPTS_DIR / filename
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+instructions_script = load_script("create-copilot-instructions.py")
+import folder_listing_budget  # noqa: E402
+from synthetic import build_tree  # noqa: E402
+
+
+def legacy_folder_structure(project_root, ignore_file=".gitignore"):
+    """The previous os.walk implementation (root .gitignore only)."""
+    gitignore_path = project_root / ignore_file
+    migrations_dir_parts = ("prisma", "migrations")
+    ignored_paths = None
+    if gitignore_path.exists():
+        with open(gitignore_path, "r") as file:
+            ignored_paths = pathspec.PathSpec.from_lines("gitwildmatch", file)
+
+    folder_structure = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        relative_path = Path(dirpath).relative_to(project_root)
+        relative_path_parts = relative_path.parts
+        if ".git" in relative_path_parts:
+            dirnames[:] = []
+            continue
+        if (
+            len(relative_path_parts) > len(migrations_dir_parts)
+            and relative_path_parts[: len(migrations_dir_parts)] == migrations_dir_parts
+        ):
+            dirnames[:] = []
+            continue
+        if ignored_paths and ignored_paths.match_file(str(relative_path)):
+            dirnames[:] = []
+            continue
+        dirnames.sort()
+        filenames.sort()
+        indent = "    " * (len(relative_path_parts) - 1) if relative_path_parts else ""
+        folder_structure.append(f"{indent}{relative_path.as_posix()}/")
+        for filename in filenames:
+            file_path = relative_path / filename
+            if not ignored_paths or not ignored_paths.match_file(str(file_path)):
+                folder_structure.append(
+                    f"{'    ' * len(relative_path_parts)}{filename}"
+                )
+    if folder_structure and folder_structure[0] == "./":
+        folder_structure.pop(0)
+    return "\n".join(folder_structure)
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--token-budget", type=int, default=2000)
+    parser.add_argument("--keep", help="build (or reuse) the tree in this directory")
+    args = parser.parse_args()
+
+    root = Path(args.keep or tempfile.mkdtemp(prefix="folder-structure-bench-"))
+    if not (root / "app").exists():
+        print(f"Building {args.files} files under {root} ...")
+        root.mkdir(parents=True, exist_ok=True)
+        build_tree(root, args.files)
+
+    legacy_seconds, legacy = timed(legacy_folder_structure, root)
+    walker_seconds, walker = timed(instructions_script.walk_folder_structure, root)
+    print(
+        f"os.walk + per-path matching: {legacy_seconds:6.2f}s, {len(legacy.splitlines())} lines"
+    )
+    print(
+        f"pruned scandir walker:       {walker_seconds:6.2f}s, {len(walker.splitlines())} lines"
+    )
+    budget_seconds, budgeted = timed(
+        folder_listing_budget.budget_listing, walker, args.token_budget, str(root)
+    )
+    print(
+        f"budgeted summary:            {budget_seconds:6.2f}s, {len(budgeted.splitlines())} lines, "
+        f"{folder_listing_budget.estimate_tokens(budgeted)}/{args.token_budget} tokens "
+        f"(full listing {folder_listing_budget.estimate_tokens(walker)})"
+    )
+    # The legacy walk ignores app/.gitignore, so it also lists app/debug.log
+    assert "keep.log" in walker and "debug.log" not in walker
+
+
+if __name__ == "__main__":
+    main()
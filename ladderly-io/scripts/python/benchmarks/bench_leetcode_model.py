@@ -0,0 +1,135 @@
+"""
+Benchmarks merge + enrich over a synthetic 100k-problem catalog, comparing the
+plain-dict pipeline the scripts used to run with the typed Problem model.
+
+Usage:
+  uv run python benchmarks/bench_leetcode_model.py [--problems 100000]
+"""
+import argparse
+import copy
+import importlib.util
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from leetcode_problem import Problem  # noqa: E402
+from synthetic import synthetic_catalog  # noqa: E402
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(
+        filename.replace("-", "_").removesuffix(".py"), SCRIPTS_DIR / filename
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+merge_script = load_script("create-unified-leetcode-list.py")
+enrich_script = load_script("enrich_leetcode_difficulty.py")
+
+
+def legacy_trim(obj):
+    if isinstance(obj, dict):
+        return {k: legacy_trim(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [legacy_trim(v) for v in obj]
+    return obj.strip() if isinstance(obj, str) else obj
+
+
+def legacy_pipeline(lists, problem_map):
+    merged = {}
+    for source_name, problems in lists.items():
+        for problem in problems:
+            problem = legacy_trim(problem)
+            key = re.search(r"problems/([^/]+)", problem["href"]).group(1)
+            problem["name"] = re.sub(r"^\d+\.\s*", "", problem["name"]).strip()
+            if key in merged:
+                existing = merged[key]
+                sources = set(existing["source"])
+                sources.add(source_name)
+                if len(sources) > 1:
+                    sources.add("multiple")
+                existing["source"] = sorted(sources)
+                new_patterns = set(problem.get("patterns", []))
+                if new_patterns:
+                    existing["patterns"] = sorted(
+                        set(existing["patterns"]) | new_patterns
+                    )
+            else:
+                problem["source"] = [source_name]
+                problem.setdefault("patterns", [])
+                merged[key] = problem
+    out = []
+    for item in merged.values():
+        slug = item["href"].rstrip("/").split("/")[-1]
+        new_item = dict(item)
+        if slug in problem_map:
+            title, diff = problem_map[slug]
+            new_item["name"] = title
+            new_item["difficulty"] = diff
+        new_item["slug"] = slug
+        out.append(new_item)
+    return out
+
+
+def load_problem_lists(lists, problem_map):
+    return [
+        (source, [Problem.from_dict(raw) for raw in problems])
+        for source, problems in lists.items()
+    ]
+
+
+def model_pipeline(problem_lists, problem_map):
+    merged = merge_script.merge_problem_lists(problem_lists)
+    return enrich_script.enrich_data(list(merged.values()), problem_map)
+
+
+def measure(label, fn, inputs, problem_map, trace_memory):
+    inputs = copy.deepcopy(inputs)
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(inputs, problem_map)
+    elapsed = time.perf_counter() - started
+    line = f"{label:<22} {elapsed:6.2f}s"
+    if trace_memory:
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        line += f"  retained {retained / 2**20:6.1f} MiB  peak {peak / 2**20:6.1f} MiB"
+    print(line)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", type=int, default=100_000)
+    args = parser.parse_args()
+
+    lists, problem_map = synthetic_catalog(args.problems)
+    print(f"{sum(map(len, lists.values()))} source entries, {args.problems} problems")
+    # Timings without tracemalloc, then memory with it (it slows allocation).
+    for trace_memory in (False, True):
+        legacy = measure(
+            "dicts: merge+enrich", legacy_pipeline, lists, problem_map, trace_memory
+        )
+        problem_lists = measure(
+            "model: load+validate", load_problem_lists, lists, None, trace_memory
+        )
+        typed = measure(
+            "model: merge+enrich",
+            model_pipeline,
+            problem_lists,
+            problem_map,
+            trace_memory,
+        )
+    assert sorted(p["slug"] for p in legacy) == sorted(p.slug for p in typed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmarks slug canonicalization against the per-script regexes it replaced,
+and checks that the merge and enrich scripts derive identical keys.
+
+Usage:
+  uv run python benchmarks/bench_leetcode_slugs.py
+"""
+import glob
+import importlib.util
+import json
+import random
+import re
+import sys
+import timeit
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from leetcode_slugs import canonical_slug  # noqa: E402
+
+
+def load_script(filename):
+    spec = importlib.util.spec_from_file_location(
+        filename.replace("-", "_").removesuffix(".py"), SCRIPTS_DIR / filename
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_normalize_href(href):
+    match = re.search(r"problems/([^/]+)", href)
+    if match:
+        return match.group(1).strip("/")
+    return href.strip("/")
+
+
+LEGACY_SLUG_RE = re.compile(r"https?://leetcode\.com/problems/([^/]+)/?")
+
+
+def legacy_parse_slug(href):
+    m = LEGACY_SLUG_RE.match(href.strip())
+    if not m:
+        return href.rstrip("/").split("/")[-1]
+    return m.group(1)
+
+
+def href_variants(slug, rng):
+    base = f"https://leetcode.com/problems/{slug}"
+    return [
+        base,
+        base + "/",
+        base + "/description/",
+        base + "/editorial/?envType=study-plan",
+        base + "?tab=description#solution",
+        f"  leetcode.com/problems/{slug.upper()}/  ",
+        slug,
+        f"/problems/{slug}/submissions/{rng.randint(1, 10**9)}/",
+    ]
+
+
+def main():
+    rng = random.Random(0)
+    hrefs = [
+        problem["href"]
+        for path in glob.glob(str(SCRIPTS_DIR / "leetcode-problems" / "*.json"))
+        for problem in json.load(open(path, encoding="utf-8"))
+    ]
+    slugs = sorted({canonical_slug(h) for h in hrefs})
+
+    merge = load_script("create-unified-leetcode-list.py")
+    enrich = load_script("enrich_leetcode_difficulty.py")
+    disagreements = [
+        (href, slug)
+        for slug in slugs
+        for href in href_variants(slug, rng)
+        if not (merge.normalize_href(href) == enrich.parse_slug(href) == slug)
+    ]
+    legacy_disagreements = sum(
+        legacy_normalize_href(h) != legacy_parse_slug(h)
+        for slug in slugs
+        for h in href_variants(slug, rng)
+    )
+    print(f"{len(slugs)} slugs x 8 href shapes")
+    print(f"  legacy scripts disagree on {legacy_disagreements} hrefs")
+    print(f"  shared module disagrees on {len(disagreements)} hrefs")
+    if disagreements:
+        print(f"  e.g. {disagreements[:5]}")
+        sys.exit(1)
+
+    workload = hrefs * 200
+    for label, fn in [
+        ("legacy normalize_href", legacy_normalize_href),
+        ("legacy parse_slug", legacy_parse_slug),
+        ("canonical_slug (cold)", canonical_slug.__wrapped__),
+        ("canonical_slug (cached)", canonical_slug),
+    ]:
+        seconds = min(
+            timeit.repeat(lambda: [fn(h) for h in workload], number=1, repeat=5)
+        )
+        print(f"{label:<26} {len(workload) / seconds / 1e6:6.2f} M hrefs/s")
+
+
+if __name__ == "__main__":
+    main()
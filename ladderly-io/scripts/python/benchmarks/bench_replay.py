@@ -0,0 +1,149 @@
+"""
+Times the networked scripts end to end against recorded HTTP cassettes.
+
+Record each cassette once against the live services (this runs the real
+scripts, so manage_playlist really rewrites the "Replay Benchmark" playlist):
+  uv run python benchmarks/bench_replay.py --record enrich report
+
+Then replay offline, optionally with simulated latency and injected errors:
+  uv run python benchmarks/bench_replay.py [--latency-ms 50] [--error-rate 0.05] [--repeat 5]
+
+The committed benchmarks/cassettes/enrich.json was recorded against the
+local LeetCode stub instead (benchmarks/check_enrich_stub.py
+--record-cassette), so enrich replays without anyone recording it live.
+
+Cassettes live in benchmarks/cassettes/<script>.json (format versioned by
+http_transport.CASSETTE_VERSION; credentials are scrubbed before writing).
+Every run happens in a scratch copy of scripts/python, so outputs and local
+caches start from the same state and the working tree is never touched.
+youtube-transcriber/main.py is not included: pytube opens its own urllib
+connections, which the shared session cannot record.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+CASSETTES_DIR = SCRIPTS_DIR / "benchmarks" / "cassettes"
+
+# name -> (working directory relative to scripts/python, command arguments)
+SCRIPTS = {
+    "enrich": (".", ["enrich_leetcode_difficulty.py"]),
+    "report": ("youtube-transcriber", ["report.py"]),
+    "manage_playlist": (
+        "youtube-transcriber",
+        [
+            "manage_playlist.py",
+            "--playlist-name",
+            "Replay Benchmark",
+            "--video-count",
+            "10",
+        ],
+    ),
+}
+
+
+def scratch_copy(destination: Path) -> Path:
+    """Copies scripts/python without local caches, virtualenvs or benchmarks."""
+    return Path(
+        shutil.copytree(
+            SCRIPTS_DIR,
+            destination / "python",
+            ignore=shutil.ignore_patterns(
+                ".venv", "__pycache__", "benchmarks", "*.ignoreme.*"
+            ),
+        )
+    )
+
+
+def run_once(
+    name: str, env: dict[str, str]
+) -> tuple[float, subprocess.CompletedProcess]:
+    workdir, args = SCRIPTS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = scratch_copy(Path(tmp))
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *args],
+            cwd=root / workdir,
+            env=env,
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+        )
+        return time.perf_counter() - started, result
+
+
+def script_env(name: str, mode: str, args) -> dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "LADDERLY_HTTP_CASSETTE": str(CASSETTES_DIR / f"{name}.json"),
+            "LADDERLY_HTTP_CASSETTE_MODE": mode,
+            "LADDERLY_HTTP_LATENCY_MS": str(args.latency_ms),
+            "LADDERLY_HTTP_ERROR_RATE": str(args.error_rate),
+            "LADDERLY_HTTP_SEED": str(args.seed),
+        }
+    )
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="record/replay script benchmark")
+    parser.add_argument("scripts", nargs="*", help=f"any of {', '.join(SCRIPTS)}")
+    parser.add_argument("--record", action="store_true", help="record live cassettes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if args.record and not args.scripts:
+        # Recording runs the real scripts; manage_playlist edits a live playlist
+        parser.error(
+            "--record needs the scripts to record, e.g. --record enrich report"
+        )
+    names = args.scripts or list(SCRIPTS)
+    unknown = set(names) - SCRIPTS.keys()
+    if unknown:
+        parser.error(f"unknown scripts: {', '.join(sorted(unknown))}")
+
+    if args.record:
+        for name in names:
+            seconds, result = run_once(name, script_env(name, "record", args))
+            status = "ok" if result.returncode == 0 else f"exit {result.returncode}"
+            print(f"recorded {name}: {status} in {seconds:.2f}s")
+            if result.returncode:
+                print(result.stderr[-2000:], file=sys.stderr)
+        return
+
+    print(
+        f"replay: latency {args.latency_ms:g}ms, error rate {args.error_rate:g}, "
+        f"{args.repeat} runs each"
+    )
+    for name in names:
+        if not (CASSETTES_DIR / f"{name}.json").exists():
+            print(f"{name:16} no cassette; run with --record {name} first")
+            continue
+        timings = []
+        for _ in range(args.repeat):
+            seconds, result = run_once(name, script_env(name, "replay", args))
+            if result.returncode:
+                print(f"{name:16} exit {result.returncode}")
+                print(result.stderr[-2000:], file=sys.stderr)
+                break
+            timings.append(seconds)
+        else:
+            print(
+                f"{name:16} median {statistics.median(timings):6.2f}s  "
+                f"min {min(timings):6.2f}s  max {max(timings):6.2f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
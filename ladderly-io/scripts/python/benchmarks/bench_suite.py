@@ -0,0 +1,283 @@
+"""
+Runs the script benchmarks on synthetic inputs and compares them to stored baselines.
+
+Each case times the best of --repeat samples (setup excluded) of one script entry
+point on data from synthetic.py:
+
+  consolidate.main          video_data/ transcripts -> consolidated_transcript.txt
+  wrangle_transcript        normalizing hours of caption text
+  recommend_next_videos     report CSV for a large playlist -> top N URLs
+  calculate_percentile      p75 over a million view counts
+  leetcode merge+enrich     100k-problem catalog from four source lists
+  get_folder_structure      large checkout, uncached and with a warm cache
+
+A case regresses when it is more than --threshold slower than its baseline in
+benchmarks/baselines.json; the run then exits with status 1. Baselines only
+apply to runs with the same sizes, and they are machine-specific: after a
+deliberate performance change, or on a new machine, rerun with --save-baselines.
+
+Usage:
+  uv run python benchmarks/bench_suite.py [--only consolidate.main,wrangle_transcript]
+      [--repeat 5] [--threshold 0.25] [--save-baselines]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(SCRIPTS_DIR / "youtube-transcriber"))
+
+from bench_leetcode_model import (  # noqa: E402
+    enrich_script,
+    load_problem_lists,
+    load_script,
+    merge_script,
+)
+from synthetic import (  # noqa: E402
+    build_tree,
+    report_rows,
+    synthetic_catalog,
+    transcript_segments,
+    write_report_csv,
+    write_video_data,
+)
+
+import consolidate  # noqa: E402
+import report  # noqa: E402
+
+instructions_script = load_script("create-copilot-instructions.py")
+
+
+@contextlib.contextmanager
+def quietly(cwd=None):
+    """Runs in `cwd` with the scripts' progress output discarded."""
+    previous = os.getcwd()
+    if cwd:
+        os.chdir(cwd)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(
+            io.StringIO()
+        ):
+            yield
+    finally:
+        os.chdir(previous)
+
+
+# Each case takes (args, scratch dir) and returns (sizes, prepare), where
+# prepare() does untimed per-run setup and returns the callable to time.
+
+
+def consolidate_case(args, scratch):
+    workdir = scratch / "consolidate"
+    write_video_data(workdir / "video_data", args.transcripts)
+
+    def run():
+        argv = sys.argv
+        sys.argv = ["consolidate.py"]
+        try:
+            with quietly(workdir):
+                consolidate.main()
+        finally:
+            sys.argv = argv
+
+    return {"transcripts": args.transcripts}, lambda: run
+
+
+def wrangle_case(args, scratch):
+    rng = random.Random(0)
+    text = "\n".join(
+        segment["text"]
+        for segment in transcript_segments(rng, args.caption_hours * 3600)
+    )
+    return {"caption_hours": args.caption_hours}, lambda: (
+        lambda: consolidate.wrangle_transcript(text)
+    )
+
+
+def recommend_case(args, scratch):
+    workdir = scratch / "report"
+    workdir.mkdir()
+    write_report_csv(workdir / report.CSV_REPORT_FILE, report_rows(args.videos))
+
+    def run():
+        with quietly(workdir):
+            report.recommend_next_videos(50)
+
+    return {"videos": args.videos}, lambda: run
+
+
+def percentile_case(args, scratch):
+    rng = random.Random(0)
+    values = [int(rng.paretovariate(1.2) * 100) for _ in range(args.values)]
+    return {"values": args.values}, lambda: (
+        lambda: report.calculate_percentile(values, 75)
+    )
+
+
+def leetcode_case(args, scratch):
+    lists, problem_map = synthetic_catalog(args.problems)
+
+    def prepare():
+        # merge_problem_lists updates problems in place, so load fresh ones
+        problem_lists = load_problem_lists(lists, problem_map)
+
+        def run():
+            merged = merge_script.merge_problem_lists(problem_lists)
+            with quietly():
+                enrich_script.enrich_data(list(merged.values()), problem_map)
+
+        return run
+
+    return {"problems": args.problems}, prepare
+
+
+def folder_tree(args, scratch):
+    """Builds the tree once for both folder cases; returns a fake script path."""
+    root = scratch / "checkout"
+    if not root.exists():
+        root.mkdir()
+        build_tree(root, args.files)
+    # get_folder_structure lists the directory three levels above the script
+    return root / "ladderly-io" / "scripts" / "python" / "script.py"
+
+
+def folder_case(args, scratch):
+    script_path = folder_tree(args, scratch)
+    return {"files": args.files}, lambda: (
+        lambda: instructions_script.get_folder_structure(script_path, cache={})
+    )
+
+
+def folder_cached_case(args, scratch):
+    script_path = folder_tree(args, scratch)
+    cache = {}
+    instructions_script.get_folder_structure(script_path, cache=cache)
+    return {"files": args.files}, lambda: (
+        lambda: instructions_script.get_folder_structure(script_path, cache=cache)
+    )
+
+
+CASES = {
+    "consolidate.main": consolidate_case,
+    "wrangle_transcript": wrangle_case,
+    "recommend_next_videos": recommend_case,
+    "calculate_percentile": percentile_case,
+    "leetcode merge+enrich": leetcode_case,
+    "get_folder_structure": folder_case,
+    "get_folder_structure (cached)": folder_cached_case,
+}
+
+
+def timed_run(prepare):
+    run = prepare()
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        run()
+        return time.perf_counter() - started
+    finally:
+        gc.enable()
+
+
+def best_time(prepare, repeat, min_seconds=0.2):
+    """
+    Best of `repeat` samples, with garbage collection paused like timeit does.
+    Each sample averages as many runs as fit in `min_seconds`, so fast cases
+    are not dominated by timer and scheduler noise.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        total = runs = 0
+        while runs == 0 or total < min_seconds:
+            total += timed_run(prepare)
+            runs += 1
+        best = min(best, total / runs)
+    return best
+
+
+def load_baselines():
+    if not BASELINES_PATH.exists():
+        return {}
+    with open(BASELINES_PATH, "r") as f:
+        return json.load(f)
+
+
+def compare(seconds, sizes, baseline, threshold):
+    """Returns (status, change vs baseline or None)."""
+    if not baseline or baseline["sizes"] != sizes:
+        return "new", None
+    change = seconds / baseline["seconds"] - 1
+    return ("REGRESSION" if change > threshold else "ok"), change
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--only", help=f"comma-separated cases (default: all of {', '.join(CASES)})"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown over the baseline, as a fraction",
+    )
+    parser.add_argument("--save-baselines", action="store_true")
+    parser.add_argument("--transcripts", type=int, default=500)
+    parser.add_argument("--caption-hours", type=int, default=200)
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--values", type=int, default=1_000_000)
+    parser.add_argument("--problems", type=int, default=100_000)
+    parser.add_argument("--files", type=int, default=200_000)
+    args = parser.parse_args()
+
+    names = args.only.split(",") if args.only else list(CASES)
+    unknown = set(names) - CASES.keys()
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    baselines = load_baselines()
+    results = {}
+    regressions = 0
+    print(f"{'case':<30} {'seconds':>9} {'baseline':>9} {'change':>8}  status")
+    with tempfile.TemporaryDirectory(prefix="bench-suite-") as scratch:
+        for name in names:
+            sizes, prepare = CASES[name](args, Path(scratch))
+            seconds = best_time(prepare, args.repeat)
+            results[name] = {"sizes": sizes, "seconds": round(seconds, 4)}
+            baseline = baselines.get(name)
+            status, change = compare(seconds, sizes, baseline, args.threshold)
+            regressions += status == "REGRESSION"
+            if change is None:
+                baseline_text = change_text = "-"
+            else:
+                baseline_text = f"{baseline['seconds']:.3f}"
+                change_text = f"{change:+.0%}"
+            print(
+                f"{name:<30} {seconds:9.3f} {baseline_text:>9} {change_text:>8}  {status}"
+            )
+
+    if args.save_baselines:
+        baselines.update(results)
+        with open(BASELINES_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baselines for {len(results)} cases to {BASELINES_PATH}")
+    elif regressions:
+        print(f"{regressions} case(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Compares disk footprint and load time of video_data/ stored plain, gzipped and
+as dictionary-compressed zstd, on synthetic transcripts.
+
+With the files in the page cache, loading is dominated by JSON parsing and the
+formats are close; --cold evicts them before every run (Linux), which is what
+a first consolidate or similarity run after fetching sees.
+
+Usage:
+  uv run python benchmarks/bench_video_store.py [--videos 2000] [--repeat 3] [--cold]
+"""
+import argparse
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR / "youtube-transcriber"))
+
+import video_store  # noqa: E402
+from synthetic import write_video_data  # noqa: E402
+
+
+def legacy_load(data_dir):
+    """How consolidate.py read video_data/ before video_store.py."""
+    videos = []
+    for filename in os.listdir(data_dir):
+        if filename.endswith(".json"):
+            with open(os.path.join(data_dir, filename), "r") as f:
+                videos.append(json.load(f))
+    return videos
+
+
+def evict(data_dir):
+    """Drops the directory's files from the page cache."""
+    for entry in os.scandir(data_dir):
+        fd = os.open(entry.path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+
+
+def best_time(fn, repeat, cold_dir=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if cold_dir:
+            evict(cold_dir)
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--videos", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--cold", action="store_true", help="evict the files before each load"
+    )
+    parser.add_argument("--dir", help="scratch directory on the disk to measure")
+    args = parser.parse_args()
+
+    compressions = ["none", "gzip"]
+    if video_store.zstandard is not None:
+        compressions.append("zstd")
+    else:
+        print("zstandard is not installed; skipping zstd")
+
+    if args.cold and not hasattr(os, "posix_fadvise"):
+        parser.error("--cold needs os.posix_fadvise (Linux)")
+
+    with tempfile.TemporaryDirectory(
+        prefix="video-store-bench-", dir=args.dir
+    ) as scratch:
+        plain_dir = Path(scratch) / "none"
+        write_video_data(plain_dir, args.videos)
+        seconds, expected = best_time(
+            lambda: legacy_load(plain_dir), args.repeat, args.cold and plain_dir
+        )
+        expected = sorted(expected, key=lambda v: v["id"])
+        print(f"{'format':<16} {'MB on disk':>10} {'load s':>8} {'JSON MB/s':>10}")
+        plain_mb = video_store.disk_usage(plain_dir)["none"][1] / 2**20
+        print(
+            f"{'json (legacy)':<16} {plain_mb:10.2f} {seconds:8.3f} "
+            f"{plain_mb / seconds:10.1f}"
+        )
+
+        for compression in compressions:
+            data_dir = Path(scratch) / f"store-{compression}"
+            shutil.copytree(plain_dir, data_dir)
+            video_store.compress_all(compression, data_dir)
+            seconds, videos = best_time(
+                lambda: list(video_store.iter_videos(data_dir)),
+                args.repeat,
+                args.cold and data_dir,
+            )
+            assert sorted(videos, key=lambda v: v["id"]) == expected
+            mb = video_store.disk_usage(data_dir)[compression][1] / 2**20
+            dictionary = data_dir / video_store.DICTIONARY_FILE
+            if dictionary.exists():
+                mb += dictionary.stat().st_size / 2**20
+            print(
+                f"{video_store.EXTENSIONS[compression]:<16} {mb:10.2f} "
+                f"{seconds:8.3f} {plain_mb / seconds:10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
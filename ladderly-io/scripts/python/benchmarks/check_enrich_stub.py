@@ -0,0 +1,284 @@
+"""
+Checks enrich_leetcode_difficulty.py's per-slug detail stage against a local
+stub of LeetCode's REST and GraphQL endpoints, with no network access.
+
+The stub's bulk map covers every problem in the unified list except a few
+slugs. Their GraphQL lookups answer with scripted failures before succeeding
+(429 then 503, or one 500), or report that the question does not exist. The
+script runs twice in a scratch copy of scripts/python (see bench_replay.py),
+pointed at the stub with LADDERLY_HTTP_REWRITE and --graphql-url, and checks:
+  - each slug was retried exactly through its scripted failures
+  - the merged output has the bulk titles and difficulties, plus the detail
+    fields for the misses
+  - the details cache holds every miss, and the second run sends no GraphQL
+    requests (details.cache_hits in --metrics-out)
+Exits with status 1 on the first failed check.
+
+With --record-cassette, the first run also records
+benchmarks/cassettes/enrich.json for bench_replay.py, with the stub's address
+replaced by https://leetcode.com.
+
+Usage:
+  uv run python benchmarks/check_enrich_stub.py [--record-cassette]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from bench_replay import CASSETTES_DIR, scratch_copy
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+UNIFIED_PATH = Path("leetcode-problems") / "unified-leetcode-problems.json"
+DETAILS_CACHE_PATH = Path("leetcode-problems") / "leetcode-details-cache.ignoreme.json"
+LIVE_ORIGIN = "https://leetcode.com"
+LEVELS = {"Easy": 1, "Medium": 2, "Hard": 3}
+
+# Bulk map misses: slug -> GraphQL statuses answered in order, then the question
+DETAIL_SCRIPT = {
+    "24-game": (
+        [429, 503, 200],
+        {
+            "title": "24 Game",
+            "difficulty": "Hard",
+            "isPaidOnly": False,
+            "acRate": 49.123,
+            "topicTags": [{"name": "Array", "slug": "array"}],
+        },
+    ),
+    "01-matrix": (
+        [500, 200],
+        {
+            "title": "01 Matrix",
+            "difficulty": "Medium",
+            "isPaidOnly": True,
+            "acRate": 50.0,
+            "topicTags": [{"name": "Matrix", "slug": "matrix"}],
+        },
+    ),
+    # LeetCode answers unknown slugs with a null question
+    "no-such-problem": ([200], None),
+}
+
+
+class StubLeetCode(ThreadingHTTPServer):
+    """Serves the bulk map and the scripted GraphQL answers; counts requests."""
+
+    def __init__(self, problems: list[dict]):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.bulk = {
+            "stat_status_pairs": [
+                {
+                    "stat": {
+                        "question__title_slug": p["slug"],
+                        "question__title": p["name"],
+                    },
+                    "difficulty": {"level": LEVELS.get(p.get("difficulty"), 2)},
+                }
+                for p in problems
+                if p["slug"] not in DETAIL_SCRIPT
+            ]
+        }
+        self.graphql_requests: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    @property
+    def origin(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def reply(self, status: int, payload: dict | None = None) -> None:
+        body = json.dumps(payload or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/problems/all/":
+            self.reply(200, self.server.bulk)
+        else:
+            self.reply(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        slug = json.loads(self.rfile.read(length))["variables"]["titleSlug"]
+        with self.server.lock:
+            attempt = self.server.graphql_requests.get(slug, 0)
+            self.server.graphql_requests[slug] = attempt + 1
+        statuses, question = DETAIL_SCRIPT.get(slug, ([200], None))
+        status = statuses[min(attempt, len(statuses) - 1)]
+        self.reply(status, {"data": {"question": question}} if status == 200 else {})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_enrich(root: Path, stub: StubLeetCode, env: dict[str, str]):
+    metrics_path = root / "metrics.ignoreme.json"
+    result = subprocess.run(
+        [
+            sys.executable,
+            "enrich_leetcode_difficulty.py",
+            "--graphql-url",
+            f"{stub.origin}/graphql",
+            "--workers",
+            "4",
+            "--metrics-out",
+            str(metrics_path),
+        ],
+        cwd=root,
+        env={
+            **os.environ,
+            "LADDERLY_HTTP_REWRITE": f"{LIVE_ORIGIN}={stub.origin}",
+            **env,
+        },
+        capture_output=True,
+        text=True,
+        stdin=subprocess.DEVNULL,
+    )
+    if result.returncode:
+        sys.exit(f"enrich exited {result.returncode}:\n{result.stderr[-2000:]}")
+    with open(metrics_path, "r", encoding="utf-8") as f:
+        return json.load(f)["counters"]
+
+
+def check(condition: bool, message: str) -> None:
+    print(f"{'ok  ' if condition else 'FAIL'} {message}")
+    if not condition:
+        sys.exit(1)
+
+
+def save_stub_cassette(path: Path, stub: StubLeetCode) -> None:
+    """Keys the recording on the live URLs, so bench_replay.py needs no rewrite."""
+    with open(path, "r", encoding="utf-8") as f:
+        cassette = json.load(f)
+    for interaction in cassette["interactions"]:
+        interaction["key"] = interaction["key"].replace(stub.origin, LIVE_ORIGIN)
+        # Date and Server vary between recordings and carry no information
+        for header in ("Date", "Server"):
+            interaction["response"]["headers"].pop(header, None)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(cassette, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="enrich detail stage stub check")
+    parser.add_argument(
+        "--record-cassette",
+        action="store_true",
+        help="Also record benchmarks/cassettes/enrich.json from the first run",
+    )
+    args = parser.parse_args()
+
+    with open(SCRIPTS_DIR / UNIFIED_PATH, "r", encoding="utf-8") as f:
+        problems = json.load(f)
+    problems.append(
+        {
+            "href": "https://leetcode.com/problems/no-such-problem/",
+            "name": "No Such Problem",
+            "source": ["stub"],
+            "patterns": [],
+            "slug": "no-such-problem",
+        }
+    )
+    stub = StubLeetCode(problems)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = scratch_copy(Path(tmp))
+        with open(root / UNIFIED_PATH, "w", encoding="utf-8") as f:
+            json.dump(problems, f, indent=2)
+
+        cassette_path = Path(tmp) / "enrich.json"
+        record_env = (
+            {
+                "LADDERLY_HTTP_CASSETTE": str(cassette_path),
+                "LADDERLY_HTTP_CASSETTE_MODE": "record",
+            }
+            if args.record_cassette
+            else {}
+        )
+        counters = run_enrich(root, stub, record_env)
+        for slug, (statuses, _) in DETAIL_SCRIPT.items():
+            check(
+                stub.graphql_requests.get(slug) == len(statuses),
+                f"{slug}: {len(statuses)} GraphQL requests "
+                f"(got {stub.graphql_requests.get(slug)})",
+            )
+        check(
+            stub.graphql_requests.keys() == DETAIL_SCRIPT.keys(),
+            "only the bulk map misses were looked up",
+        )
+        check(counters.get("details.cache_hits") == 0, "first run: no cache hits")
+
+        with open(root / UNIFIED_PATH, "r", encoding="utf-8") as f:
+            enriched = {p["slug"]: p for p in json.load(f)}
+        mapped = [p for p in problems if p["slug"] not in DETAIL_SCRIPT]
+        check(
+            all(
+                enriched[p["slug"]]["name"] == p["name"]
+                and enriched[p["slug"]].get("difficulty")
+                == (p.get("difficulty") if p.get("difficulty") in LEVELS else "Medium")
+                for p in mapped
+            ),
+            f"{len(mapped)} bulk-mapped problems keep the bulk title and difficulty",
+        )
+        game = enriched["24-game"]
+        check(
+            (
+                game["difficulty"],
+                game.get("isPaidOnly"),
+                game.get("acceptanceRate"),
+                game.get("topicTags"),
+            )
+            == ("Hard", False, 49.12, ["Array"]),
+            f"24-game merged from its details: {game}",
+        )
+        check(
+            enriched["01-matrix"]["difficulty"] == "Medium"
+            and enriched["01-matrix"].get("isPaidOnly") is True,
+            "01-matrix merged from its details",
+        )
+        check(
+            "difficulty" not in enriched["no-such-problem"],
+            "no-such-problem is left without a difficulty",
+        )
+        with open(root / DETAILS_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        check(
+            cache.keys() == DETAIL_SCRIPT.keys() and cache["no-such-problem"] is None,
+            "details cache holds every miss, including the unknown slug",
+        )
+
+        stub.graphql_requests.clear()
+        counters = run_enrich(root, stub, {})
+        check(not stub.graphql_requests, "second run: no GraphQL requests")
+        check(
+            counters.get("details.cache_hits") == len(DETAIL_SCRIPT),
+            f"second run: {len(DETAIL_SCRIPT)} cache hits",
+        )
+
+        if args.record_cassette:
+            save_stub_cassette(cassette_path, stub)
+            CASSETTES_DIR.mkdir(parents=True, exist_ok=True)
+            target = CASSETTES_DIR / "enrich.json"
+            target.write_text(
+                cassette_path.read_text(encoding="utf-8"), encoding="utf-8"
+            )
+            print(f"Recorded {target}")
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Synthetic inputs for the benchmarks: playlist report stats, video_data
+transcript JSONs, LeetCode source lists and catalogs, and checkout-like
+directory trees. Every generator is deterministic for a given seed.
+"""
+import csv
+import json
+import os
+import random
+from pathlib import Path
+
+REPORT_FIELDS = [
+    "video_id",
+    "title",
+    "view_count",
+    "like_count",
+    "comment_count",
+    "duration_seconds",
+]
+
+# Caption vocabulary, including the mis-hearings consolidate.py corrects
+CAPTION_WORDS = (
+    "so the thing about landing a software job is that you need to practice "
+    "interview questions and build a resume that shows real projects um uh "
+    "latterly laterally doio arya tale career engineer developer coding "
+    "leetcode hiring salary react python data structures algorithms"
+).split()
+
+PATTERNS = ["Array", "Hash Table", "Two Pointers", "Graph", "Dynamic Programming"]
+SOURCES = ["grind-75", "neetcode-250", "taro-75", "sean-prashad-patterns"]
+
+
+def video_id(i):
+    return f"v{i:010d}"
+
+
+def report_rows(n, seed=0):
+    """Report CSV rows for a playlist of `n` videos with long-tailed views."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        views = int(rng.paretovariate(1.2) * 100)
+        rows.append(
+            {
+                "video_id": video_id(i),
+                "title": f"Video {i}",
+                "view_count": views,
+                "like_count": int(views * rng.uniform(0, 0.08)),
+                "comment_count": int(views * rng.uniform(0, 0.01)),
+                "duration_seconds": float(rng.randint(60, 3600)),
+            }
+        )
+    return rows
+
+
+def write_report_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=REPORT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def transcript_segments(rng, seconds):
+    """Auto-caption style segments: ~2.5s each, 5-10 words, tails sometimes repeated."""
+    segments = []
+    start = 0.0
+    previous = []
+    while start < seconds:
+        words = rng.choices(CAPTION_WORDS, k=rng.randint(5, 10))
+        if previous and rng.random() < 0.3:
+            words = previous[-2:] + words
+        duration = round(rng.uniform(1.5, 3.5), 3)
+        segments.append({"text": " ".join(words), "start": start, "duration": duration})
+        start = round(start + duration + (rng.random() < 0.05) * 3.0, 3)
+        previous = words
+    return segments
+
+
+def write_video_data(directory, n, seed=0, minutes=(5, 40)):
+    """Writes `n` video_data/<id>.json files shaped like main.py's output."""
+    rng = random.Random(seed)
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(n):
+        vid = video_id(i)
+        video_data = {
+            "id": vid,
+            "url": f"https://youtu.be/{vid}",
+            "title": f"Video ‘{i}’ #career #shorts",
+            "description": "Career advice for “new” developers.",
+            "publish_date": "2024-01-01T00:00:00",
+            "length": 0,
+            "views": rng.randint(0, 100_000),
+            "channel": "Ladderly",
+            "transcript": (
+                None
+                if rng.random() < 0.05
+                else transcript_segments(rng, 60 * rng.uniform(*minutes))
+            ),
+        }
+        with open(directory / f"{vid}.json", "w") as f:
+            json.dump(video_data, f, indent=2)
+
+
+def synthetic_catalog(n, seed=0):
+    """Source lists that together cover `n` distinct problems with overlap."""
+    rng = random.Random(seed)
+    lists = {s: [] for s in SOURCES}
+    for i in range(n):
+        slug = f"problem-{i}"
+        for source in rng.sample(SOURCES, rng.randint(1, 3)):
+            item = {
+                "href": f" https://leetcode.com/problems/{slug}/ ",
+                "name": f"{i}. Problem {i}",
+            }
+            if rng.random() < 0.5:
+                item["patterns"] = rng.sample(PATTERNS, 2)
+            lists[source].append(item)
+    problem_map = {
+        f"problem-{i}": (f"Problem {i}", rng.choice(["Easy", "Medium", "Hard"]))
+        for i in range(n)
+        if rng.random() < 0.9
+    }
+    return lists, problem_map
+
+
+def touch(path):
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+
+
+def build_tree(root, total_files):
+    """~2% source files, the rest split between node_modules/ and .next/."""
+    root = Path(root)
+    (root / ".gitignore").write_text("node_modules/\n.next/\n*.log\n")
+    (root / "app").mkdir()
+    (root / "app" / ".gitignore").write_text("coverage/\n!keep.log\n")
+
+    source_files = max(1, total_files // 50)
+    for i in range(source_files):
+        folder = root / "app" / "src" / f"feature-{i // 40}"
+        folder.mkdir(parents=True, exist_ok=True)
+        touch(folder / f"component-{i}.tsx")
+    touch(root / "app" / "keep.log")
+    touch(root / "app" / "debug.log")
+
+    remaining = total_files - source_files
+    for base, share in (("node_modules", 0.85), (".next", 0.15)):
+        count = int(remaining * share)
+        for i in range(count):
+            folder = root / "app" / base / f"pkg-{i // 200}" / "dist"
+            if i % 200 == 0:
+                folder.mkdir(parents=True, exist_ok=True)
+            touch(folder / f"file-{i}.js")
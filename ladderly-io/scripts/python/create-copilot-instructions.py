@@ -1,9 +1,29 @@
 from pathlib import Path
+import argparse
+import json
 import os
+import struct
 import textwrap
+import time
 
 import pathspec
 
+import instrumentation
+from folder_listing_budget import MIN_TOKEN_BUDGET, budget_listing, estimate_tokens
+from git_index import (
+    GitIndexError,
+    find_git_dir,
+    read_index_checksum,
+    read_tracked_paths,
+)
+
+MIGRATIONS_DIR_PARTS = ("prisma", "migrations")
+
+# Per-directory scans and the last git-index listing, so reruns only re-scan
+# directories whose mtime (or applicable .gitignore) changed.
+STRUCTURE_CACHE_PATH = Path(__file__).resolve().parent / "agents-md-cache.ignoreme.json"
+STRUCTURE_CACHE_VERSION = 1
+
 # Appended to AGENTS.md after generated package.json and folder listing.
 # Edit this block when team agent instructions change—do not add that content
 # to AGENTS.md by hand, or the next run of this script will remove it.
@@ -42,96 +62,248 @@ def read_package_json(script_path):
             return f"Error reading package.json file: {e}"
 
 
-def get_folder_structure(script_path, ignore_file=".gitignore"):
-    """Generates a folder structure representation, respecting .gitignore with glob syntax."""
-    project_root = script_path.parents[3]
-    gitignore_path = project_root / ignore_file
-    migrations_dir_parts = ("prisma", "migrations")
-
-    ignored_paths = None
-    if gitignore_path.exists():
-        with open(gitignore_path, "r") as file:
-            ignored_paths = pathspec.PathSpec.from_lines("gitwildmatch", file)
-
-    folder_structure = []
-    for dirpath, dirnames, filenames in os.walk(project_root):
+def load_ignore_spec(dir_path, ignore_file=".gitignore"):
+    """Returns the PathSpec for `dir_path`/`ignore_file`, or None if there is none."""
+    ignore_path = os.path.join(dir_path, ignore_file)
+    if not os.path.isfile(ignore_path):
+        return None
+    with open(ignore_path, "r") as file:
+        return pathspec.PathSpec.from_lines("gitwildmatch", file)
+
+
+def is_ignored(ignore_specs, relative_path_parts, is_dir):
+    """
+    Applies every .gitignore between the root and the entry, outermost first,
+    so a deeper file's rules (including `!` negations) override its parents'.
+    `ignore_specs` is a list of (depth of the .gitignore's directory, PathSpec).
+    """
+    ignored = False
+    for base_depth, spec in ignore_specs:
+        path = "/".join(relative_path_parts[base_depth:])
+        if is_dir:
+            path += "/"
+        for pattern in reversed(spec.patterns):
+            if pattern.include is not None and pattern.match_file(path) is not None:
+                ignored = pattern.include
+                break
+    return ignored
+
+
+def scan_directory(dir_path, relative_path_parts, ignore_specs):
+    """Returns the sorted (files, subdirectories) of a directory that are listed."""
+    dirnames, filenames = [], []
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk, symlinked directories are not descended into
+                if not entry.is_symlink():
+                    dirnames.append(entry.name)
+            else:
+                filenames.append(entry.name)
+
+    # Under prisma/migrations, list files but skip the per-migration folders
+    if relative_path_parts[-2:] == MIGRATIONS_DIR_PARTS:
+        dirnames = []
+
+    files = [
+        filename
+        for filename in sorted(filenames)
+        if not is_ignored(ignore_specs, relative_path_parts + (filename,), False)
+    ]
+    subdirectories = [
+        dirname
+        for dirname in sorted(dirnames)
         # Never list or traverse .git (huge and not useful in AGENTS.md)
-        dirnames[:] = [d for d in dirnames if d != ".git"]
+        if dirname != ".git"
+        and not is_ignored(ignore_specs, relative_path_parts + (dirname,), True)
+    ]
+    return files, subdirectories
+
+
+def walk_folder_structure(project_root, ignore_file=".gitignore", cache=None):
+    """
+    Lists the tree under `project_root` as indented lines, honoring nested
+    ignore files. Ignored directories are pruned before descending, and the
+    applicable ignore specs are resolved once per directory.
+
+    `cache`, if given, maps directory paths to their last scan. A directory is
+    only re-scanned when its mtime or one of its applicable ignore files
+    changed; the dict is replaced in place with this walk's scans.
+    """
+    previous_scans = dict(cache or {})
+    scans = {}
+    folder_structure = []
 
-        relative_path = Path(dirpath).relative_to(project_root)
-        relative_path_parts = relative_path.parts
+    def walk(dir_path, relative_path_parts, ignore_specs, ignore_stamps):
+        ignore_path = os.path.join(dir_path, ignore_file)
+        if os.path.isfile(ignore_path):
+            ignore_specs = ignore_specs + [
+                (len(relative_path_parts), load_ignore_spec(dir_path, ignore_file))
+            ]
+            stat = os.stat(ignore_path)
+            ignore_stamps = ignore_stamps + [
+                len(relative_path_parts),
+                stat.st_mtime_ns,
+                stat.st_size,
+            ]
+
+        key = "/".join(relative_path_parts)
+        stamp = [os.stat(dir_path).st_mtime_ns, ignore_stamps]
+        scan = previous_scans.get(key)
+        if scan is None or scan["stamp"] != stamp:
+            files, subdirectories = scan_directory(
+                dir_path, relative_path_parts, ignore_specs
+            )
+            scan = {"stamp": stamp, "files": files, "dirs": subdirectories}
+            instrumentation.count("walk.dirs_scanned")
+        else:
+            instrumentation.count("walk.cache_hits")
+        scans[key] = scan
+
+        if relative_path_parts:
+            indent = "    " * (len(relative_path_parts) - 1)
+            folder_structure.append(f"{indent}{key}/")
+        file_indent = "    " * len(relative_path_parts)
+        for filename in scan["files"]:
+            folder_structure.append(f"{file_indent}{filename}")
+        for dirname in scan["dirs"]:
+            walk(
+                os.path.join(dir_path, dirname),
+                relative_path_parts + (dirname,),
+                ignore_specs,
+                ignore_stamps,
+            )
 
-        if ".git" in relative_path_parts:
-            dirnames[:] = []
-            continue
+    walk(os.fspath(project_root), (), [], [])
+    if cache is not None:
+        cache.clear()
+        cache.update(scans)
+    return "\n".join(folder_structure)
 
-        # Check if the current directory is a subdirectory of prisma/migrations
-        is_migrations_subdir = (
-            len(relative_path_parts) > len(migrations_dir_parts)
-            and relative_path_parts[: len(migrations_dir_parts)] == migrations_dir_parts
-        )
 
-        if is_migrations_subdir:
-            # Skip all subdirectories within prisma/migrations
-            dirnames[:] = []  # Clear dirnames to prevent further traversal
+def render_folder_structure(paths):
+    """
+    Renders repo-relative posix file paths in the same layout as
+    walk_folder_structure: a header per directory, its files, then its
+    subdirectories, each sorted by name.
+    """
+    root = ({}, [])  # (subdirectories by name, filenames)
+    for path in paths:
+        *dir_parts, filename = path.split("/")
+        if ".git" in dir_parts:
             continue
+        node = root
+        for depth, part in enumerate(dir_parts):
+            # Under prisma/migrations, list files but skip the per-migration folders
+            if (
+                depth >= 2
+                and tuple(dir_parts[depth - 2 : depth]) == MIGRATIONS_DIR_PARTS
+            ):
+                node = None
+                break
+            node = node[0].setdefault(part, ({}, []))
+        if node is not None:
+            node[1].append(filename)
 
-        # Ignore directories if they match .gitignore patterns
-        # Use str(relative_path) for matching as pathspec expects strings
-        if ignored_paths and ignored_paths.match_file(str(relative_path)):
-            dirnames[:] = []  # Prevent traversal if the directory is ignored
-            continue
+    folder_structure = []
 
-        # Sort dirnames and filenames alphabetically
-        dirnames.sort()
-        filenames.sort()
-
-        # Calculate indentation based on the depth
-        indent = "    " * (len(relative_path_parts) - 1) if relative_path_parts else ""
-        # Use '/' for consistent path separator display
-        folder_structure.append(f"{indent}{relative_path.as_posix()}/")
-
-        for filename in filenames:
-            file_path = relative_path / filename
-            file_path_parts = file_path.parts
-
-            # Check if the file is within a subdirectory of prisma/migrations
-            is_migrations_subdir_file = (
-                len(file_path_parts)
-                > (
-                    len(migrations_dir_parts) + 1
-                )  # Ensure it's in a sub-folder, not directly in migrations
-                and file_path_parts[: len(migrations_dir_parts)] == migrations_dir_parts
-            )
+    def render(node, relative_path_parts):
+        if relative_path_parts:
+            indent = "    " * (len(relative_path_parts) - 1)
+            folder_structure.append(f"{indent}{'/'.join(relative_path_parts)}/")
+        file_indent = "    " * len(relative_path_parts)
+        for filename in sorted(node[1]):
+            folder_structure.append(f"{file_indent}{filename}")
+        for dirname in sorted(node[0]):
+            render(node[0][dirname], relative_path_parts + (dirname,))
+
+    render(root, ())
+    return "\n".join(folder_structure)
 
-            # Special case: allow migration_lock.toml directly under prisma/migrations
-            is_migration_lock_toml = (
-                len(file_path_parts) == (len(migrations_dir_parts) + 1)
-                and file_path_parts[: len(migrations_dir_parts)] == migrations_dir_parts
-                and filename == "migration_lock.toml"
-            )
 
-            if is_migrations_subdir_file and not is_migration_lock_toml:
-                continue  # Skip files deep within migrations subdirectories
+def git_index_folder_structure(project_root, cache=None):
+    """
+    Builds the folder structure from the files tracked in the git index, or
+    returns None when there is no readable index (e.g. outside a repository).
+    `cache`, if given, holds the last listing keyed by the index checksum,
+    mtime and size.
+    """
+    git_dir = find_git_dir(project_root)
+    if git_dir is None or not (git_dir / "index").exists():
+        return None
+    try:
+        checksum = read_index_checksum(git_dir)
+        if cache and cache.get("checksum") == checksum:
+            return cache["structure"]
+        structure = render_folder_structure(read_tracked_paths(git_dir))
+    except (GitIndexError, OSError, struct.error, IndexError) as e:
+        print(f"Could not read the git index ({e}); walking the filesystem instead.")
+        return None
+    if cache is not None:
+        cache.update(checksum=checksum, structure=structure)
+    return structure
+
+
+def get_folder_structure(
+    script_path, ignore_file=".gitignore", source="walk", cache=None
+):
+    """
+    Generates a folder structure representation, respecting .gitignore files with glob syntax.
+    With source="git-index", lists the tracked files instead, falling back to the walk.
+    `cache` is the structural cache from load_structure_cache, updated in place.
+    """
+    project_root = script_path.parents[3]
+    if cache is None:
+        cache = {}
+    if source == "git-index":
+        structure = git_index_folder_structure(
+            project_root, cache.setdefault("git_index", {})
+        )
+        if structure is not None:
+            return structure
+    return walk_folder_structure(
+        project_root, ignore_file, cache.setdefault("walk", {})
+    )
 
-            if ".git" in file_path.parts:
-                continue
 
-            if not ignored_paths or not ignored_paths.match_file(str(file_path)):
-                # Adjust indent for files
-                file_indent = "    " * len(relative_path_parts)
-                folder_structure.append(f"{file_indent}{filename}")
+def load_structure_cache():
+    """Reads the structural cache, starting over if it is missing or stale."""
+    try:
+        with open(STRUCTURE_CACHE_PATH, "r") as file:
+            cache = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return cache if cache.get("version") == STRUCTURE_CACHE_VERSION else {}
 
-    # Remove the first element which is "./"
-    if folder_structure and folder_structure[0] == "./":
-        folder_structure.pop(0)
 
-    return "\n".join(folder_structure)
+def save_structure_cache(cache):
+    cache["version"] = STRUCTURE_CACHE_VERSION
+    with open(STRUCTURE_CACHE_PATH, "w") as file:
+        json.dump(cache, file)
 
 
-def create_copilot_instructions():
-    """Writes `AGENTS.md` at the repository root (three levels above this file)."""
+def create_copilot_instructions(source="walk", use_cache=True, token_budget=None):
+    """
+    Writes `AGENTS.md` at the repository root (three levels above this file).
+    The write is skipped when the generated content is unchanged.
+    With `token_budget`, the folder listing is summarized to fit that many tokens.
+    """
     script_path = Path(__file__).resolve()
+    cache = load_structure_cache() if use_cache else {}
+    with instrumentation.span("folder structure"):
+        folder_structure = get_folder_structure(script_path, source=source, cache=cache)
+    if token_budget is not None:
+        started = time.perf_counter()
+        full_tokens = estimate_tokens(folder_structure)
+        with instrumentation.span("token budget"):
+            folder_structure = budget_listing(
+                folder_structure, token_budget, script_path.parents[3]
+            )
+        print(
+            f"Folder listing: {estimate_tokens(folder_structure)} tokens "
+            f"(budget {token_budget}, full listing {full_tokens}), "
+            f"summarized in {time.perf_counter() - started:.3f}s."
+        )
     instructions = (
         "# AI Assistant Instructions"
         "\n\n"
@@ -150,16 +322,53 @@ def create_copilot_instructions():
         "Here is the project.json file for this project which describes the dependencies:\n"
         f"{read_package_json(script_path)}\n\n"
         "Here is the folder structure of the project:\n"
-        f"{get_folder_structure(script_path)}\n\n"
+        f"{folder_structure}\n\n"
         f"{AGENTS_MD_STATIC_TAIL}"
     )
 
+    if use_cache:
+        save_structure_cache(cache)
+
     output_path = script_path.parents[3] / "AGENTS.md"
+    if output_path.exists() and output_path.read_text() == instructions:
+        print(f"AGENTS.md at {output_path} is already up to date.")
+        return
+
     with open(output_path, "w") as file:
         file.write(instructions)
+    instrumentation.count_file_written(output_path)
 
     print(f"AGENTS.md has been created at {output_path}.")
 
 
 if __name__ == "__main__":
-    create_copilot_instructions()
+    parser = argparse.ArgumentParser(
+        description="Generate AGENTS.md at the repository root."
+    )
+    parser.add_argument(
+        "--source",
+        choices=["walk", "git-index"],
+        default="walk",
+        help="List the folder structure by walking the filesystem (honoring "
+        ".gitignore) or from the files tracked in the git index",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the structural cache",
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        help="Summarize the folder listing to fit this many tokens, collapsing "
+        "the least important folders into counts with samples. Budgets below "
+        f"about {MIN_TOKEN_BUDGET} still get a one-line summary of the tree",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+    create_copilot_instructions(
+        source=args.source,
+        use_cache=not args.no_cache,
+        token_budget=args.token_budget,
+    )
@@ -1,36 +1,82 @@
-import json
+import argparse
 import os
 import glob
 from pathlib import Path
 import re
+import sys
+
+import instrumentation
+from leetcode_changes import snapshot_baseline
+from leetcode_dedup import (
+    MERGE_PLAN_PATH,
+    confirmed_aliases,
+    find_duplicate_candidates,
+    load_merge_plan,
+    update_merge_plan,
+    write_merge_plan,
+)
+from leetcode_problem import ProblemValidationError, dump_problems, load_problems
+from leetcode_slugs import canonical_slug
+
+LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
 
 
 def normalize_href(href):
     """Extracts the problem slug from a LeetCode URL."""
-    match = re.search(r'problems/([^/]+)', href)
-    if match:
-        return match.group(1).strip('/')
-    return href.strip('/')
+    return canonical_slug(href)
 
 
 def normalize_name(name):
     """Removes leading 'number. ' from problem names."""
-    return re.sub(r'^\d+\.\s*', '', name).strip()
+    return LEADING_NUMBER_RE.sub('', name).strip()
+
+
+def merge_problem_into(existing_problem, sources, patterns):
+    """Merges sources and patterns into an already merged problem."""
+    # Merge sources — keep list of specific sources and add 'multiple' when applicable
+    new_sources = set(existing_problem.source)
+    new_sources.update(sources)
+    new_sources.discard("multiple")
+    if len(new_sources) > 1:
+        new_sources.add("multiple")
+    existing_problem.source = sorted(new_sources)
 
+    # Merge patterns
+    if patterns:
+        existing_problem.patterns = sorted(
+            set(existing_problem.patterns).union(patterns)
+        )
+
+
+def merge_problem_lists(problem_lists):
+    """Merges (source_name, problems) pairs into a dict keyed by slug."""
+    merged_problems = {}
+    for source_name, problems in problem_lists:
+        source_name = sys.intern(source_name)
+        for problem in problems:
+            href_key = problem.slug
+            problem.name = normalize_name(problem.name)
 
-def trim_string_values(obj):
-    """Trim all string values in the object."""
-    if isinstance(obj, dict):
-        return {k: trim_string_values(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [trim_string_values(item) for item in obj]
-    elif isinstance(obj, str):
-        return obj.strip()
-    else:
-        return obj
+            # If href already exists in merged_problems
+            if href_key in merged_problems:
+                merge_problem_into(
+                    merged_problems[href_key], [source_name], problem.patterns
+                )
+            else:
+                # Add the problem with its source (as a list)
+                problem.source = [source_name]
+                merged_problems[href_key] = problem
+    return merged_problems
 
 
 def main():
+    parser = argparse.ArgumentParser(
+        description="Merge the LeetCode problem lists into one unified list."
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
     # Directory containing the JSON files
     script_dir = os.path.dirname(__file__)
     directory = os.path.join(script_dir, "leetcode-problems")
@@ -42,74 +88,61 @@ def main():
         if not os.path.basename(f) == "unified-leetcode-problems.json"
     ]
 
-    # Dictionary to store merged problems
-    merged_problems = {}
-
-    # Process each JSON file
-    for file_path in json_files:
-        # Extract source name from filename
-        filename = os.path.basename(file_path)
-        source_name = filename.replace("leetcode-", "").replace(".json", "")
-
-        # Read and parse JSON file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            problems = json.load(f)
-
-        # Process each problem
-        for problem in problems:
-            # Trim all string values
-            problem = trim_string_values(problem)
-
-            href_key = normalize_href(problem["href"])
-
-            if "name" in problem:
-                problem["name"] = normalize_name(problem["name"])
-
-            # If href already exists in merged_problems
-            if href_key in merged_problems:
-                existing_problem = merged_problems[href_key]
-
-                # Merge sources — keep list of specific sources and add 'multiple' when applicable
-                existing_sources = existing_problem.get("source", [])
-                if isinstance(existing_sources, str):
-                    existing_sources = [existing_sources]
-                new_sources = set(existing_sources)
-                new_sources.add(source_name)
-                if len(new_sources) > 1:
-                    new_sources.add("multiple")
-                existing_problem["source"] = sorted(list(new_sources))
-
-                # Merge patterns
-                new_patterns = set(problem.get("patterns", []))
-                if new_patterns:
-                    existing_patterns = set(existing_problem.get("patterns", []))
-                    merged_patterns = sorted(
-                        list(existing_patterns.union(new_patterns))
-                    )
-                    existing_problem["patterns"] = merged_patterns
-            else:
-                # Add the problem with its source (as a list)
-                problem["source"] = [source_name]
-                if "patterns" not in problem:
-                    problem["patterns"] = []
-                merged_problems[href_key] = problem
+    # Read and validate each JSON file, extracting the source name from the filename
+    problem_lists = []
+    try:
+        with instrumentation.span("load lists"):
+            for file_path in json_files:
+                filename = os.path.basename(file_path)
+                source_name = filename.replace("leetcode-", "").replace(".json", "")
+                problem_lists.append((source_name, load_problems(file_path)))
+                instrumentation.count_file_read(file_path)
+    except ProblemValidationError as e:
+        print(f"Invalid problem list: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with instrumentation.span("merge"):
+        merged_problems = merge_problem_lists(problem_lists)
+
+    # Fold confirmed aliases into the problem they duplicate
+    merge_plan = load_merge_plan()
+    for alias, keep in confirmed_aliases(merge_plan).items():
+        if alias in merged_problems and keep in merged_problems:
+            alias_problem = merged_problems.pop(alias)
+            merge_problem_into(
+                merged_problems[keep],
+                alias_problem.source,
+                alias_problem.patterns,
+            )
+
+    # Propose remaining near-duplicates for review
+    with instrumentation.span("find duplicates"):
+        merge_plan = update_merge_plan(
+            merge_plan, find_duplicate_candidates(merged_problems)
+        )
+    write_merge_plan(merge_plan)
+    pending = sum(1 for e in merge_plan if e["status"] == "pending")
+    if pending:
+        print(f"{pending} likely duplicates pending review in {MERGE_PLAN_PATH}")
 
     # Convert dictionary to list
     merged_list = list(merged_problems.values())
-    merged_list.sort(key=lambda x: x["href"])
+    merged_list.sort(key=lambda x: x.href)
 
     # Write the merged list to a new JSON file in the data directory
     output_dir = Path(directory)
     output_file = "unified-leetcode-problems.json"
     output_dir.mkdir(parents=True, exist_ok=True)  # Ensure directory exists
-    with open(output_dir / output_file, 'w', encoding='utf-8') as f:
-        json.dump(merged_list, f, indent=2)
+    # Keep the pre-refresh list so the enrich step can report what changed
+    snapshot_baseline(output_dir / output_file)
+    dump_problems(merged_list, output_dir / output_file)
+    instrumentation.count_file_written(output_dir / output_file)
 
     print(
         f"Merged {len(merged_list)} problems from {len(json_files)} files into {output_dir / output_file}"
     )
     print(
-        f"Problems from multiple sources: {sum(1 for p in merged_list if (isinstance(p.get('source'), list) and 'multiple' in p['source']) or p.get('source') == 'multiple')}"
+        f"Problems from multiple sources: {sum(1 for p in merged_list if 'multiple' in p.source)}"
     )
 
 
@@ -6,51 +6,95 @@ Reads a JSON array of LeetCode problems with "href" and "name" fields,
 fetches canonical title (as name) and difficulty via LeetCode's public REST endpoint,
 and writes an enriched JSON file.
 
+Slugs missing from the bulk REST map are looked up one by one through the
+GraphQL endpoint, concurrently, and cached on disk so reruns only fetch new misses.
+
 Usage:
   python enrich_leetcode_difficulty.py
 
 Optional:
   --timeout 15                       # seconds per HTTP request
+  --workers 8                        # concurrent per-slug detail requests
+  --graphql-url URL                  # e.g. a local stub server
+  --no-details                       # skip the per-slug detail stage
+
+HTTP setup (pooling, timeouts, retries, caching, fixture rewrites) comes from
+http_transport.py; see its docstring for the LADDERLY_HTTP_* variables.
 
 This script always reads from and writes to the same JSON file located
 at './leetcode-problems/unified-leetcode-problems.json' relative to this script's directory.
 """
 import argparse
 import json
-import re
+import random
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 import requests
 from pathlib import Path
 
+import http_transport
+import instrumentation
+from leetcode_changes import (
+    CHANGE_SET_PATH,
+    describe,
+    diff_problems,
+    load_baseline,
+    write_change_set,
+)
+from leetcode_problem import (
+    Difficulty,
+    Problem,
+    ProblemValidationError,
+    dump_problems,
+    load_problems,
+)
+from leetcode_slugs import canonical_slug
+
 LEETCODE_ALL_PROBLEMS_URL = "https://leetcode.com/api/problems/all/"
+LEETCODE_GRAPHQL_URL = "https://leetcode.com/graphql"
+
+DETAILS_CACHE_PATH = (
+    Path(__file__).resolve().parent
+    / "leetcode-problems"
+    / "leetcode-details-cache.ignoreme.json"
+)
+
+QUESTION_DETAIL_QUERY = """
+query questionDetail($titleSlug: String!) {
+  question(titleSlug: $titleSlug) {
+    title
+    difficulty
+    isPaidOnly
+    acRate
+    topicTags { name slug }
+  }
+}
+"""
 
-SLUG_RE = re.compile(r"https?://leetcode\.com/problems/([^/]+)/?")
+RETRYABLE_STATUS = http_transport.RETRYABLE_STATUS
 
 
 def parse_slug(href: str) -> str:
     """
     Extract the problem slug from a LeetCode problem URL.
     """
-    m = SLUG_RE.match(href.strip())
-    if not m:
-        # Fallback: take last non-empty path segment
-        slug = href.rstrip("/").split("/")[-1]
-        return slug
-    return m.group(1)
-
-
-def make_session(timeout: int = 15) -> requests.Session:
-    s = requests.Session()
-    s.headers.update(
-        {
+    return canonical_slug(href)
+
+
+def make_session(timeout: int = 15, pool_size: int = 8) -> requests.Session:
+    # Size the keep-alive pool to the worker count so concurrent detail
+    # requests reuse connections instead of opening one per slug.
+    return http_transport.make_session(
+        timeout=timeout,
+        pool_size=pool_size,
+        headers={
             "User-Agent": "leetcode-difficulty-enricher/1.0 (+https://leetcode.com)",
             "Content-Type": "application/json",
-        }
+        },
     )
-    s.request_timeout = timeout  # custom attr for convenience
-    return s
 
 
 def fetch_rest_problem_map(
@@ -60,9 +104,7 @@ def fetch_rest_problem_map(
     Public REST fallback. Returns mapping slug -> (title, difficultyName)
     difficulty.level: 1=Easy, 2=Medium, 3=Hard.
     """
-    r = session.get(
-        LEETCODE_ALL_PROBLEMS_URL, timeout=getattr(session, "request_timeout", 15)
-    )
+    r = session.get(LEETCODE_ALL_PROBLEMS_URL)
     r.raise_for_status()
     data = r.json() or {}
     pairs = data.get("stat_status_pairs") or []
@@ -81,32 +123,144 @@ def fetch_rest_problem_map(
     return problem_map
 
 
+def fetch_problem_detail(
+    session: requests.Session,
+    slug: str,
+    graphql_url: str = LEETCODE_GRAPHQL_URL,
+    retries: int = 4,
+    backoff: float = 0.5,
+) -> dict | None:
+    """
+    Fetch per-problem details for one slug via GraphQL.
+    Retries rate limits, server errors and connection failures with
+    exponential backoff. Returns None when LeetCode has no such question.
+    """
+    payload = {
+        "operationName": "questionDetail",
+        "query": QUESTION_DETAIL_QUERY,
+        "variables": {"titleSlug": slug},
+    }
+    for attempt in range(retries + 1):
+        try:
+            r = session.post(
+                graphql_url,
+                json=payload,
+                headers={"Referer": f"https://leetcode.com/problems/{slug}/"},
+            )
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+        else:
+            if r.status_code not in RETRYABLE_STATUS or attempt >= retries:
+                r.raise_for_status()
+                break
+        time.sleep(backoff * (2**attempt) + random.uniform(0, backoff))
+
+    question = ((r.json() or {}).get("data") or {}).get("question")
+    if not question:
+        return None
+    return {
+        "title": question.get("title"),
+        "difficulty": question.get("difficulty"),
+        "isPaidOnly": question.get("isPaidOnly"),
+        "acRate": question.get("acRate"),
+        "topicTags": [t.get("name") for t in question.get("topicTags") or []],
+    }
+
+
+def load_details_cache(
+    cache_path: Path = DETAILS_CACHE_PATH,
+) -> dict[str, dict | None]:
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"[warn] Ignoring unreadable details cache: {e}", file=sys.stderr)
+        return {}
+
+
+def save_details_cache(
+    cache: dict[str, dict | None], cache_path: Path = DETAILS_CACHE_PATH
+) -> None:
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True, ensure_ascii=False)
+
+
+def fetch_problem_details(
+    session: requests.Session,
+    slugs: list[str],
+    cache: dict[str, dict | None],
+    graphql_url: str = LEETCODE_GRAPHQL_URL,
+    workers: int = 8,
+) -> dict[str, dict | None]:
+    """
+    Fetch details for every slug not already cached, at most `workers` at a time.
+    Successful lookups (including "no such question") are written into `cache`;
+    failed ones are logged and retried on the next run.
+    Returns mapping slug -> details for the requested slugs.
+    """
+    pending = sorted({s for s in slugs if s not in cache})
+    instrumentation.count("details.cache_hits", len(set(slugs)) - len(pending))
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {
+                pool.submit(
+                    instrumentation.propagate(fetch_problem_detail),
+                    session,
+                    slug,
+                    graphql_url,
+                ): slug
+                for slug in pending
+            }
+            for future in as_completed(futures):
+                slug = futures[future]
+                try:
+                    cache[slug] = future.result()
+                except Exception as e:
+                    sys.stderr.write(f"[warn] Detail fetch failed for {slug}: {e}\n")
+
+    return {s: cache[s] for s in slugs if cache.get(s)}
+
+
 def enrich_data(
-    input_items: list[dict],
+    problems: list[Problem],
     problem_map: dict[str, tuple[str | None, str | None]],
-) -> list[dict]:
+    details: dict[str, dict] | None = None,
+) -> list[Problem]:
     """
     Adds 'difficulty' and 'isPaidOnly' fields when available.
-    Uses only the bulk map.
+    Uses the bulk map first, then per-slug details for slugs it missed.
+    Problems are updated in place and returned.
     """
-    out: list[dict] = []
+    details = details or {}
     misses: list[str] = []
-    for item in input_items:
-        href = item.get("href", "")
-        slug = parse_slug(href)
+    for problem in problems:
+        slug = problem.slug
         title: str | None = None
-        diff: str | None = None
+        diff: Difficulty | None = None
+        detail = None
 
         if slug in problem_map:
-            title, diff = problem_map[slug]
+            title, diff_name = problem_map[slug]
+            diff = Difficulty.from_name(diff_name)
+        if diff is None and slug in details:
+            detail = details[slug]
+            title = title or detail.get("title")
+            diff = Difficulty.from_name(detail.get("difficulty"))
 
-        new_item = dict(item)
         if title:
-            new_item["name"] = title
+            problem.name = title
         if diff is not None:
-            new_item["difficulty"] = diff
-        new_item["slug"] = slug
-        out.append(new_item)
+            problem.difficulty = diff
+        if detail is not None:
+            if detail.get("isPaidOnly") is not None:
+                problem.is_paid_only = detail["isPaidOnly"]
+            if detail.get("acRate") is not None:
+                problem.acceptance_rate = round(detail["acRate"], 2)
+            if detail.get("topicTags"):
+                problem.topic_tags = detail["topicTags"]
 
         if diff is None:
             misses.append(slug)
@@ -116,7 +270,7 @@ def enrich_data(
             f"[info] Missing difficulty for {len(misses)} slugs (e.g., {misses[:5]})\n"
         )
 
-    return out
+    return problems
 
 
 def main():
@@ -126,9 +280,27 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=15, help="HTTP timeout per request (seconds)"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent per-slug detail requests",
+    )
+    parser.add_argument(
+        "--graphql-url",
+        default=LEETCODE_GRAPHQL_URL,
+        help="GraphQL endpoint for per-slug details (e.g. a local stub server)",
+    )
+    parser.add_argument(
+        "--no-details",
+        action="store_true",
+        help="Skip the per-slug detail stage for slugs the bulk map missed",
+    )
+    instrumentation.add_arguments(parser)
     args = parser.parse_args()
+    instrumentation.start(args)
 
-    session = make_session(timeout=args.timeout)
+    session = make_session(timeout=args.timeout, pool_size=args.workers)
 
     # Resolve the unified problems file path relative to this script
     problems_file_path = (
@@ -137,33 +309,65 @@ def main():
         / "unified-leetcode-problems.json"
     )
 
-    # Load input
-    with open(problems_file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-        if not isinstance(data, list):
-            print("Input must be a JSON array.", file=sys.stderr)
-            sys.exit(1)
+    # Load and validate input, plus the list as it was before this refresh
+    try:
+        data = load_problems(problems_file_path)
+        previous = load_baseline(problems_file_path)
+    except ProblemValidationError as e:
+        print(f"Invalid input: {e}", file=sys.stderr)
+        sys.exit(1)
 
     # Fetch via REST
     try:
-        problem_map = fetch_rest_problem_map(session)
+        with instrumentation.span("fetch problem map"):
+            problem_map = fetch_rest_problem_map(session)
     except Exception as e:
         print(f"[warn] REST fetch failed: {e}", file=sys.stderr)
         problem_map = {}
 
+    # Fetch per-slug details for bulk map misses
+    details: dict[str, dict] = {}
+    if not args.no_details:
+        bulk_misses = [
+            slug
+            for slug in (x.slug for x in data)
+            if (problem_map.get(slug) or (None, None))[1] is None
+        ]
+        if bulk_misses:
+            cache = load_details_cache()
+            started = time.perf_counter()
+            with instrumentation.span("fetch details"):
+                details = fetch_problem_details(
+                    session,
+                    bulk_misses,
+                    cache,
+                    graphql_url=args.graphql_url,
+                    workers=args.workers,
+                )
+            save_details_cache(cache)
+            print(
+                f"Resolved details for {len(details)}/{len(bulk_misses)} bulk misses "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+
     # Enrich
-    enriched = enrich_data(data, problem_map)
+    enriched = enrich_data(data, problem_map, details)
 
     # Write output
-    with open(problems_file_path, "w", encoding="utf-8") as f:
-        json.dump(enriched, f, indent=2, ensure_ascii=False)
+    dump_problems(enriched, problems_file_path, ensure_ascii=False)
+    instrumentation.count_file_written(problems_file_path)
+
+    # Record what this refresh changed
+    change_set = diff_problems(previous, enriched)
+    write_change_set(change_set)
 
     # Summary
     total = len(enriched)
-    got = sum(1 for x in enriched if "difficulty" in x)
-    hard = sum(1 for x in enriched if x.get("difficulty") == "Hard")
+    got = sum(1 for x in enriched if x.difficulty is not None)
+    hard = sum(1 for x in enriched if x.difficulty is Difficulty.HARD)
     print(f"Enriched {got}/{total} items; Hard: {hard}")
     print(f"Wrote: {problems_file_path}")
+    print(f"Changes: {describe(change_set)}; see {CHANGE_SET_PATH}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,274 @@
+"""
+folder_listing_budget.py
+
+Fits the AGENTS.md folder listing into a token budget. The full listing from
+create-copilot-instructions.py is parsed back into a tree. Folders are then
+expanded greedily, most important first, and each folder that stays collapsed
+is shown as one line with file/folder counts and representative samples.
+
+Importance favors entry points (package.json, README, page/layout/index
+files, configs) and recently modified files.
+"""
+import heapq
+import math
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+try:
+    import tiktoken
+except ImportError:  # optional: fall back to the heuristic estimate below
+    tiktoken = None
+
+MAX_FILES_PER_FOLDER = 20
+MAX_FOLDERS_PER_FOLDER = 12
+SAMPLES_PER_SUMMARY = 3
+RECENCY_HALF_LIFE_DAYS = 30
+# Roughly what the one-line summary of a whole tree costs
+MIN_TOKEN_BUDGET = 20
+
+ENTRY_POINT_NAMES = {
+    "package.json",
+    "pyproject.toml",
+    "README.md",
+    "Makefile",
+    "Dockerfile",
+    "schema.prisma",
+    "tsconfig.json",
+}
+ENTRY_POINT_STEMS = {"index", "main", "app", "page", "layout", "route", "server"}
+
+TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d+|\s+|[^\sA-Za-z\d]")
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Counts tokens with tiktoken's cl100k_base when it is installed and its
+    encoding is available, else estimates them piecewise: letters in runs of
+    up to 8, digits in runs of up to 3, one token per whitespace run or
+    punctuation character.
+    """
+    global _encoding
+    if tiktoken is not None and _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:  # e.g. the encoding file cannot be downloaded
+            _encoding = False
+    if _encoding:
+        return len(_encoding.encode(text))
+
+    tokens = 0
+    for piece in TOKEN_PIECE_RE.findall(text):
+        if piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 8)
+        elif piece[0].isdigit():
+            tokens += math.ceil(len(piece) / 3)
+        else:
+            tokens += 1
+    return tokens
+
+
+@dataclass(slots=True)
+class Folder:
+    key: str
+    depth: int
+    files: list[str] = field(default_factory=list)
+    children: list["Folder"] = field(default_factory=list)
+    file_scores: dict[str, float] = field(default_factory=dict)
+    importance: float = 0.0
+    file_count: int = 0
+    folder_count: int = 0
+    samples: list[str] = field(default_factory=list)
+
+
+def parse_listing(listing: str) -> Folder:
+    """Rebuilds the folder tree from a listing in get_folder_structure's layout."""
+    root = Folder(key="", depth=0)
+    folders = {"": root}
+    current = root
+    for line in listing.splitlines():
+        name = line.lstrip(" ")
+        if name.endswith("/"):
+            key = name[:-1]
+            parent = folders.get(key.rpartition("/")[0], root)
+            current = Folder(key=key, depth=parent.depth + 1)
+            parent.children.append(current)
+            folders[key] = current
+        elif name:
+            current.files.append(name)
+    return root
+
+
+def file_score(path: str, name: str, now: float) -> float:
+    stem, _, extension = name.partition(".")
+    score = 0.0
+    if name in ENTRY_POINT_NAMES:
+        score += 2.0
+    elif stem in ENTRY_POINT_STEMS or ".config." in name or extension == "config":
+        score += 1.0
+    try:
+        age_days = max(0.0, now - os.stat(path).st_mtime) / 86400
+        score += 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+    except OSError:
+        pass
+    return score
+
+
+def score_tree(folder: Folder, project_root: str | None, now: float) -> None:
+    """Fills in scores, counts and samples bottom-up."""
+    for name in folder.files:
+        path = os.path.join(project_root, folder.key, name) if project_root else ""
+        folder.file_scores[name] = file_score(path, name, now)
+
+    candidates = [
+        (score, f"{folder.key}/{name}" if folder.key else name)
+        for name, score in folder.file_scores.items()
+    ]
+    folder.file_count = len(folder.files)
+    folder.folder_count = len(folder.children)
+    best = max(folder.file_scores.values(), default=0.0)
+    for child in folder.children:
+        score_tree(child, project_root, now)
+        folder.file_count += child.file_count
+        folder.folder_count += child.folder_count
+        best = max(best, child.importance)
+        candidates.extend((child.importance, s) for s in child.samples)
+
+    # Small bonus for size so that among equals the bigger subtree opens first
+    folder.importance = best + 0.05 * math.log1p(folder.file_count)
+    top = heapq.nlargest(SAMPLES_PER_SUMMARY, candidates, key=lambda c: c[0])
+    folder.samples = [sample for _, sample in top]
+
+
+def own_lines(folder: Folder, max_files: int = MAX_FILES_PER_FOLDER) -> list[str]:
+    """An expanded folder's header and files, keeping its top files if many."""
+    lines = []
+    if folder.key:
+        lines.append(f"{'    ' * (folder.depth - 1)}{folder.key}/")
+    file_indent = "    " * folder.depth
+    files = folder.files
+    if len(files) > max_files:
+        keep = set(heapq.nlargest(max_files, files, key=folder.file_scores.get))
+        files = [name for name in files if name in keep]
+    lines.extend(f"{file_indent}{name}" for name in files)
+    if len(folder.files) > len(files):
+        lines.append(f"{file_indent}... ({len(folder.files) - len(files)} more files)")
+    return lines
+
+
+def visible_children(folder: Folder) -> list[Folder]:
+    """A folder's subfolders, keeping only the most important ones if many."""
+    if len(folder.children) <= MAX_FOLDERS_PER_FOLDER:
+        return folder.children
+    keep = {
+        id(child)
+        for child in heapq.nlargest(
+            MAX_FOLDERS_PER_FOLDER, folder.children, key=lambda c: c.importance
+        )
+    }
+    return [child for child in folder.children if id(child) in keep]
+
+
+def hidden_folders_line(folder: Folder) -> list[str]:
+    hidden = len(folder.children) - len(visible_children(folder))
+    if not hidden:
+        return []
+    return [f"{'    ' * folder.depth}... ({hidden} more folders)"]
+
+
+def summary_line(folder: Folder, with_samples: bool = True) -> str:
+    if not folder.key:
+        return (
+            f"./ [collapsed: {folder.file_count} files, {folder.folder_count} folders]"
+        )
+    prefix = len(folder.key) + 1
+    samples = ", ".join(sample[prefix:] for sample in folder.samples)
+    return (
+        f"{'    ' * (folder.depth - 1)}{folder.key}/ "
+        f"[collapsed: {folder.file_count} files, {folder.folder_count} folders"
+        f"{'; e.g. ' + samples if samples and with_samples else ''}]"
+    )
+
+
+def cost(lines) -> int:
+    return sum(estimate_tokens(line) + 1 for line in lines)
+
+
+def expand_greedily(
+    root: Folder, token_budget: int, with_samples: bool, root_files: bool
+) -> list[str]:
+    """
+    Expands the root, then the most important folders while they fit, and
+    renders the result. Collapsed folders are summarized with samples only
+    if `with_samples` is set; without `root_files` the root's files are
+    replaced by a count.
+    """
+
+    def folder_lines(folder):
+        if folder is root and not root_files:
+            return own_lines(folder, max_files=0)
+        return own_lines(folder)
+
+    # Expanding a folder replaces its summary line with its own lines plus
+    # one summary line per child.
+    def expansion_cost(folder):
+        return (
+            cost(folder_lines(folder))
+            + cost(summary_line(c, with_samples) for c in visible_children(folder))
+            + cost(hidden_folders_line(folder))
+            - (cost([summary_line(folder, with_samples)]) if folder is not root else 0)
+        )
+
+    expanded = {id(root)}
+    used = expansion_cost(root)
+    queue = [(-c.importance, c.key, c) for c in visible_children(root)]
+    heapq.heapify(queue)
+    while queue:
+        _, _, folder = heapq.heappop(queue)
+        extra = expansion_cost(folder)
+        if used + extra > token_budget:
+            continue
+        used += extra
+        expanded.add(id(folder))
+        for child in visible_children(folder):
+            heapq.heappush(queue, (-child.importance, child.key, child))
+
+    lines = []
+
+    def render(folder):
+        lines.extend(folder_lines(folder))
+        for child in visible_children(folder):
+            if id(child) in expanded:
+                render(child)
+            else:
+                lines.append(summary_line(child, with_samples))
+        lines.extend(hidden_folders_line(folder))
+
+    render(root)
+    return lines
+
+
+def budget_listing(
+    listing: str, token_budget: int, project_root: str | None = None
+) -> str:
+    """
+    Returns `listing` unchanged if it fits in `token_budget` tokens, otherwise
+    a summarized listing that does. When even the root's own files and
+    subfolder summaries do not fit, collapsed folders lose their samples, then
+    the root's files are replaced by a count, and as a last resort the whole
+    tree becomes a single summary line (about MIN_TOKEN_BUDGET tokens), which
+    is returned even if it exceeds the budget.
+    """
+    if estimate_tokens(listing) <= token_budget:
+        return listing
+
+    root = parse_listing(listing)
+    score_tree(root, project_root, time.time())
+    for with_samples, root_files in ((True, True), (False, True), (False, False)):
+        lines = expand_greedily(root, token_budget, with_samples, root_files)
+        if cost(lines) <= token_budget:
+            return "\n".join(lines)
+    return summary_line(root)
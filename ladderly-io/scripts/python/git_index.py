@@ -0,0 +1,137 @@
+"""
+git_index.py
+
+Minimal reader for the git index (`.git/index`), used to list tracked files
+without running git or walking the working tree. Supports index versions 2-4
+and SHA-1 or SHA-256 repositories; split and sparse indexes are rejected with
+GitIndexError so callers can fall back to a filesystem walk.
+
+Format reference: https://git-scm.com/docs/index-format
+"""
+import os
+import re
+import struct
+from pathlib import Path
+
+ENTRY_FIXED_SIZE = 40  # ctime, mtime, dev, ino, mode, uid, gid, size
+EXTENDED_FLAG = 0x4000
+NAME_LENGTH_MASK = 0x0FFF
+MODE_TYPE_MASK = 0o170000
+MODE_DIRECTORY = 0o040000  # sparse-index directory entry
+
+OBJECT_FORMAT_RE = re.compile(r"^\s*objectformat\s*=\s*sha256\s*$", re.I | re.M)
+
+
+class GitIndexError(ValueError):
+    pass
+
+
+def find_git_dir(project_root: Path) -> Path | None:
+    """Resolves `.git`, following the `gitdir:` file used by worktrees."""
+    dot_git = Path(project_root) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        content = dot_git.read_text().strip()
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:") :].strip())
+            return git_dir if git_dir.is_absolute() else dot_git.parent / git_dir
+    return None
+
+
+def _hash_size(git_dir: Path) -> int:
+    config_dir = git_dir
+    commondir = git_dir / "commondir"
+    if commondir.exists():
+        config_dir = git_dir / commondir.read_text().strip()
+    config = config_dir / "config"
+    if config.exists() and OBJECT_FORMAT_RE.search(config.read_text()):
+        return 32
+    return 20
+
+
+def read_index_checksum(git_dir: Path) -> str:
+    """
+    A key that changes whenever the index does: its trailing checksum plus
+    its mtime and size, since with index.skipHash (set by feature.manyFiles)
+    git writes the checksum as all zeros.
+    """
+    hash_size = _hash_size(Path(git_dir))
+    with open(Path(git_dir) / "index", "rb") as f:
+        stat = os.fstat(f.fileno())
+        f.seek(-hash_size, 2)
+        checksum = f.read(hash_size).hex()
+    return f"{checksum}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def read_tracked_paths(git_dir: Path) -> list[str]:
+    """Returns the tracked paths (posix, repo-relative) recorded in the index."""
+    data = (Path(git_dir) / "index").read_bytes()
+    hash_size = _hash_size(Path(git_dir))
+    if len(data) < 12 or data[:4] != b"DIRC":
+        raise GitIndexError("not a git index file")
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"unsupported index version {version}")
+
+    paths: list[str] = []
+    previous = b""
+    offset = 12
+    for _ in range(count):
+        mode = struct.unpack_from(">I", data, offset + 24)[0]
+        if mode & MODE_TYPE_MASK == MODE_DIRECTORY:
+            raise GitIndexError("sparse index is not supported")
+        flags_offset = offset + ENTRY_FIXED_SIZE + hash_size
+        (flags,) = struct.unpack_from(">H", data, flags_offset)
+        name_offset = flags_offset + 2
+        if flags & EXTENDED_FLAG:
+            name_offset += 2
+
+        if version == 4:
+            # Path is the previous path minus N bytes plus a NUL-terminated suffix
+            strip, name_offset = _read_varint(data, name_offset)
+            end = data.index(b"\0", name_offset)
+            name = previous[: len(previous) - strip] + data[name_offset:end]
+            offset = end + 1
+        else:
+            name_length = flags & NAME_LENGTH_MASK
+            if name_length == NAME_LENGTH_MASK:
+                end = data.index(b"\0", name_offset)
+            else:
+                end = name_offset + name_length
+            name = data[name_offset:end]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            entry_length = end - offset
+            offset += (entry_length + 8) & ~7
+
+        # Conflicted files appear once per merge stage
+        if name != previous:
+            paths.append(name.decode("utf-8", "surrogateescape"))
+        previous = name
+
+    _check_extensions(data, offset, hash_size)
+    return paths
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    byte = data[offset]
+    offset += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        value += 1
+        byte = data[offset]
+        offset += 1
+        value = (value << 7) + (byte & 0x7F)
+    return value, offset
+
+
+def _check_extensions(data: bytes, offset: int, hash_size: int) -> None:
+    end = len(data) - hash_size
+    while offset + 8 <= end:
+        signature = data[offset : offset + 4]
+        (size,) = struct.unpack_from(">I", data, offset + 4)
+        if signature == b"link":
+            raise GitIndexError("split index is not supported")
+        if signature == b"sdir":
+            raise GitIndexError("sparse index is not supported")
+        offset += 8 + size
@@ -0,0 +1,448 @@
+"""
+http_transport.py
+
+Shared HTTP client setup for the scripts in this directory and its
+subprojects (youtube-transcriber/ imports it from the parent directory).
+
+make_session() returns a requests.Session with:
+  - a keep-alive connection pool sized for concurrent workers
+  - a default timeout applied to every request
+  - retries with backoff for idempotent requests that hit rate limits or
+    server errors
+  - an optional on-disk HTTP cache that revalidates with ETag/Last-Modified
+  - URL rewrites, so a script can be pointed at a local fixture server
+
+Rewrites and the cache can also be configured from the environment, which
+lets any script run offline without new flags:
+  LADDERLY_HTTP_REWRITE="https://leetcode.com=http://127.0.0.1:8765,https://youtube.googleapis.com=http://127.0.0.1:8766"
+  LADDERLY_HTTP_CACHE_DIR=/tmp/http-cache.ignoreme.d
+
+Sessions can also record every response into a cassette, or replay one
+with no network access, optionally adding latency and injected errors (see
+benchmarks/bench_replay.py):
+  LADDERLY_HTTP_CASSETTE=benchmarks/cassettes/enrich.json
+  LADDERLY_HTTP_CASSETTE_MODE=record|replay      # default: replay
+  LADDERLY_HTTP_LATENCY_MS=50                    # replay: delay per request
+  LADDERLY_HTTP_ERROR_RATE=0.05                  # replay: share answered 503
+  LADDERLY_HTTP_SEED=0                           # replay: error injection seed
+
+GoogleApiHttp adapts a session to the httplib2 interface googleapiclient
+expects, so YouTube Data API calls share the same pool and policy.
+"""
+import atexit
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+
+import instrumentation
+
+DEFAULT_TIMEOUT = 15
+DEFAULT_POOL_SIZE = 8
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+REWRITE_ENV = "LADDERLY_HTTP_REWRITE"
+CACHE_DIR_ENV = "LADDERLY_HTTP_CACHE_DIR"
+CASSETTE_ENV = "LADDERLY_HTTP_CASSETTE"
+CASSETTE_MODE_ENV = "LADDERLY_HTTP_CASSETTE_MODE"
+LATENCY_ENV = "LADDERLY_HTTP_LATENCY_MS"
+ERROR_RATE_ENV = "LADDERLY_HTTP_ERROR_RATE"
+SEED_ENV = "LADDERLY_HTTP_SEED"
+
+CASSETTE_VERSION = 1
+# Credentials that must never be written to a cassette or used to match one
+SCRUBBED_PARAMS = {"key", "access_token"}
+SCRUBBED_HEADERS = {"authorization", "cookie", "set-cookie"}
+
+
+def parse_rewrites(spec: str | None) -> dict[str, str]:
+    """Parses "from=to,from=to" URL prefix pairs."""
+    rewrites = {}
+    for pair in (spec or "").split(","):
+        if "=" in pair:
+            prefix, target = pair.split("=", 1)
+            rewrites[prefix.strip()] = target.strip()
+    return rewrites
+
+
+class TransportSession(requests.Session):
+    """A Session that applies a default timeout and URL prefix rewrites."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, rewrites=None):
+        super().__init__()
+        self.timeout = timeout
+        self.rewrites = dict(rewrites or {})
+
+    def rewrite_url(self, url: str) -> str:
+        for prefix, target in self.rewrites.items():
+            if url.startswith(prefix):
+                return target + url[len(prefix) :]
+        return url
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, self.rewrite_url(url), **kwargs)
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps GET responses carrying an ETag or Last-Modified
+    header on disk and revalidates them with conditional requests. A 304
+    is answered from the cache, so unchanged payloads are not re-downloaded.
+    """
+
+    def __init__(self, cache_dir: Path, **kwargs):
+        super().__init__(**kwargs)
+        self.cache_dir = Path(cache_dir)
+
+    def _entry_path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _load(self, url: str) -> dict | None:
+        try:
+            with open(self._entry_path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        entry = {
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "body": response.content.decode("latin-1"),
+        }
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._entry_path(url).with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._entry_path(url))
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or "no-store" in request.headers.get(
+            "Cache-Control", ""
+        ):
+            return super().send(request, **kwargs)
+
+        entry = self._load(request.url)
+        if entry:
+            if "ETag" in entry["headers"]:
+                request.headers["If-None-Match"] = entry["headers"]["ETag"]
+            if "Last-Modified" in entry["headers"]:
+                request.headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = super().send(request, **kwargs)
+        if entry and response.status_code == 304:
+            response.status_code = entry["status"]
+            response.headers.update(entry["headers"])
+            response._content = entry["body"].encode("latin-1")
+            response.from_cache = True
+            instrumentation.count("http.cache_hits")
+        elif (
+            response.status_code == 200
+            and "no-store" not in response.headers.get("Cache-Control", "")
+            and ("ETag" in response.headers or "Last-Modified" in response.headers)
+        ):
+            self._store(request.url, response)
+        return response
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode for a request the cassette has no response for."""
+
+
+def _scrub_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in SCRUBBED_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _request_key(request) -> str:
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    body_hash = hashlib.sha256(body).hexdigest() if body else ""
+    return f"{request.method} {_scrub_url(request.url)} {body_hash}"
+
+
+class Cassette:
+    """
+    Recorded responses keyed by method, scrubbed URL and body hash. Repeated
+    requests replay their recordings in order, then keep returning the last.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self.interactions: dict[str, list[dict]] = {}
+        self._played: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "Cassette":
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"{self.path}: cassette version {data.get('version')!r}, "
+                f"expected {CASSETTE_VERSION}; record it again"
+            )
+        for interaction in data["interactions"]:
+            self.interactions.setdefault(interaction["key"], []).append(
+                interaction["response"]
+            )
+        return self
+
+    def save(self) -> None:
+        interactions = [
+            {"key": key, "response": response}
+            for key, responses in self.interactions.items()
+            for response in responses
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": interactions},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+            f.write("\n")
+
+    def record(self, request, response: requests.Response) -> None:
+        recorded = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                k: v
+                for k, v in response.headers.items()
+                if k.lower() not in SCRUBBED_HEADERS
+            },
+            "body": response.content.decode("latin-1"),
+        }
+        with self._lock:
+            self.interactions.setdefault(_request_key(request), []).append(recorded)
+
+    def play(self, request) -> dict | None:
+        key = _request_key(request)
+        with self._lock:
+            responses = self.interactions.get(key)
+            if not responses:
+                return None
+            index = self._played.get(key, 0)
+            self._played[key] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+
+class CassetteAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that records real responses into a cassette, or replays
+    them without touching the network. Replay can add a fixed latency and
+    answer a seeded share of requests with 503 to exercise retry paths;
+    injected errors reach the caller directly rather than urllib3's retries.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = "replay",
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode {mode!r}")
+        self.cassette = cassette
+        self.mode = mode
+        self.latency = latency
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def _response(self, request, recorded: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = recorded["body"].encode("latin-1")
+        # Already read: close(), `with` blocks and redirects expect a raw stream
+        response._content_consumed = True
+        response.raw = io.BytesIO(response._content)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def send(self, request, **kwargs):
+        if self.mode == "record":
+            response = super().send(request, **kwargs)
+            self.cassette.record(request, response)
+            return response
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error_rate:
+            with self._rng_lock:
+                inject = self._rng.random() < self.error_rate
+            if inject:
+                return self._response(
+                    request,
+                    {"status": 503, "reason": "Injected", "headers": {}, "body": ""},
+                )
+        recorded = self.cassette.play(request)
+        if recorded is None:
+            raise CassetteMiss(
+                f"{self.cassette.path} has no response for {_request_key(request)}",
+                request=request,
+            )
+        instrumentation.count("http.replayed")
+        return self._response(request, recorded)
+
+
+_cassettes: dict[str, Cassette] = {}
+
+
+def _shared_cassette_adapter(path: str, adapter_kwargs: dict) -> CassetteAdapter:
+    mode = os.getenv(CASSETTE_MODE_ENV, "replay")
+    cassette = _cassettes.get(path)
+    if cassette is None:
+        cassette = _cassettes[path] = Cassette(path)
+        if mode == "record":
+            atexit.register(cassette.save)
+        else:
+            cassette.load()
+    return CassetteAdapter(
+        cassette,
+        mode=mode,
+        latency=float(os.getenv(LATENCY_ENV, "0")) / 1000,
+        error_rate=float(os.getenv(ERROR_RATE_ENV, "0")),
+        seed=int(os.getenv(SEED_ENV, "0")),
+        **adapter_kwargs,
+    )
+
+
+def is_replaying() -> bool:
+    """True when sessions replay a cassette instead of using the network."""
+    return bool(os.getenv(CASSETTE_ENV)) and (
+        os.getenv(CASSETTE_MODE_ENV, "replay") == "replay"
+    )
+
+
+def make_session(
+    timeout: float = DEFAULT_TIMEOUT,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = 3,
+    backoff: float = 0.5,
+    headers: dict[str, str] | None = None,
+    cache_dir: Path | str | None = None,
+    rewrites: dict[str, str] | None = None,
+) -> TransportSession:
+    """
+    Builds a pooled session. `cache_dir` and `rewrites` default to the
+    LADDERLY_HTTP_CACHE_DIR and LADDERLY_HTTP_REWRITE environment variables.
+    When LADDERLY_HTTP_CASSETTE is set, the cassette takes the place of the
+    HTTP cache. Sessions in one process share the cassette file.
+    Only idempotent methods are retried here; callers that retry POSTs
+    (e.g. GraphQL queries) keep their own loop.
+    """
+    if rewrites is None:
+        rewrites = parse_rewrites(os.getenv(REWRITE_ENV))
+    if cache_dir is None:
+        cache_dir = os.getenv(CACHE_DIR_ENV) or None
+
+    session = TransportSession(timeout=timeout, rewrites=rewrites)
+    adapter_kwargs = {
+        "pool_connections": pool_size,
+        "pool_maxsize": pool_size,
+        "max_retries": Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRYABLE_STATUS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    }
+    if os.getenv(CASSETTE_ENV):
+        adapter = _shared_cassette_adapter(os.getenv(CASSETTE_ENV), adapter_kwargs)
+    elif cache_dir:
+        adapter = CachingAdapter(cache_dir, **adapter_kwargs)
+    else:
+        adapter = HTTPAdapter(**adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    session.hooks["response"].append(_count_response)
+    return session
+
+
+def _count_response(response, *args, **kwargs):
+    instrumentation.count("http.requests")
+    if response.status_code >= 400:
+        instrumentation.count(f"http.status_{response.status_code}")
+    # Count the body as it is read instead of reading it here, so stream=True
+    # responses stay lazy. .content, iter_lines() and streaming callers all
+    # read through iter_content(); wrapping response.raw would miss chunked
+    # bodies, which urllib3 reads without going through raw.read().
+    iter_content = response.iter_content
+
+    def counting_iter_content(*args, **kwargs):
+        for chunk in iter_content(*args, **kwargs):
+            instrumentation.count("http.bytes_received", len(chunk))
+            yield chunk
+
+    response.iter_content = counting_iter_content
+
+
+class GoogleApiHttp:
+    """
+    Minimal httplib2.Http stand-in backed by a requests session, for
+    googleapiclient.discovery.build(..., http=GoogleApiHttp(session)).
+    Wrap it in google_auth_httplib2.AuthorizedHttp for OAuth credentials.
+    """
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        # googleapiclient reads these attributes on its http object
+        self.timeout = getattr(session, "timeout", DEFAULT_TIMEOUT)
+        self.redirect_codes = {301, 302, 303, 307, 308}
+        self.follow_redirects = True
+        self.connections = {}
+
+    def close(self):
+        self.session.close()
+
+    def request(
+        self,
+        uri,
+        method="GET",
+        body=None,
+        headers=None,
+        redirections=5,
+        connection_type=None,
+    ):
+        import httplib2
+
+        response = self.session.request(
+            method,
+            uri,
+            data=body,
+            headers=headers,
+            allow_redirects=redirections > 0,
+        )
+        info = {k.lower(): v for k, v in response.headers.items()}
+        info["status"] = str(response.status_code)
+        # requests already decoded the body; drop the header so it is not decoded twice
+        info.pop("content-encoding", None)
+        return httplib2.Response(info), response.content
@@ -0,0 +1,207 @@
+"""
+instrumentation.py
+
+Lightweight timing and metrics for the scripts in this directory and its
+subprojects (youtube-transcriber/ and analytical/ import it from the parent
+directory).
+
+  - span("name"): nested timing spans, aggregated by their path
+    ("main/fetch details"), with the peak RSS seen when each span ends; also
+    usable as a decorator, @span("fetch details")
+  - propagate(fn): runs fn under the caller's spans on a worker thread, e.g.
+    pool.submit(propagate(fetch), ...); without it a worker's spans are roots
+  - count("http.requests"), count_file_read(path), count_file_written(path):
+    counters for API calls, bytes and cache hits
+  - add_arguments(parser) + start(args): the --metrics-out PATH and
+    --profile cprofile|pyinstrument flags every script accepts
+
+start() opens a root span named after the script; when the process exits the
+metrics are written as JSON to --metrics-out, and a cProfile or pyinstrument
+report is written next to it (or to --profile-out). Without those flags the
+spans cost a perf_counter call each and nothing is written.
+"""
+import atexit
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows has no resource module; RSS is reported as None
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class Metrics:
+    def __init__(self):
+        self.spans: dict[str, dict] = {}
+        self.counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+        # A context variable rather than a thread-local, so propagate() can
+        # hand the open spans to worker threads
+        self._stack = contextvars.ContextVar(f"spans-{id(self)}", default=())
+
+    @contextmanager
+    def span(self, name: str):
+        parent = self._stack.get()
+        self._stack.set((*parent, name))
+        path = "/".join((*parent, name))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            # set() rather than reset(token): the root span opened in start()
+            # is closed from an atexit hook
+            self._stack.set(parent)
+            rss = peak_rss_mb()
+            with self._lock:
+                entry = self.spans.setdefault(
+                    path, {"count": 0, "seconds": 0.0, "peak_rss_mb": rss}
+                )
+                entry["count"] += 1
+                entry["seconds"] += seconds
+                entry["peak_rss_mb"] = rss
+
+    def count(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "peak_rss_mb": peak_rss_mb(),
+                "spans": {
+                    path: {**entry, "seconds": round(entry["seconds"], 6)}
+                    for path, entry in self.spans.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+metrics = Metrics()
+span = metrics.span
+count = metrics.count
+_started = False
+
+
+def propagate(fn):
+    """
+    Wraps fn to run in a copy of the caller's context, so spans it opens on
+    another thread nest under the spans open where propagate() was called.
+    Each call gets its own copy, so one wrapper can go to pool.map().
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def count_file_read(path) -> None:
+    if os.path.exists(path):
+        count("bytes_read", os.path.getsize(path))
+
+
+def count_file_written(path) -> None:
+    if os.path.exists(path):
+        count("bytes_written", os.path.getsize(path))
+
+
+def add_arguments(parser) -> None:
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument(
+        "--metrics-out",
+        help="Write timing spans, counters and peak RSS to this JSON file",
+    )
+    group.add_argument(
+        "--profile",
+        choices=["cprofile", "pyinstrument"],
+        help="Profile the run (pyinstrument must be installed separately)",
+    )
+    group.add_argument(
+        "--profile-out",
+        help="Profile output path (default: <script>.prof or <script>.profile.html)",
+    )
+
+
+def _start_profiler(kind: str):
+    if kind == "cprofile":
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        print("[warn] pyinstrument is not installed; not profiling", file=sys.stderr)
+        return None
+    profiler = Profiler()
+    profiler.start()
+    return profiler
+
+
+def _stop_profiler(kind: str, profiler, path: str) -> None:
+    if kind == "cprofile":
+        profiler.disable()
+        profiler.dump_stats(path)
+    else:
+        profiler.stop()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(profiler.output_html())
+    print(f"Profile written to {path}", file=sys.stderr)
+
+
+def start(args, script_name: str | None = None) -> None:
+    """
+    Opens the root span and starts the profiler requested by `args` (from a
+    parser passed to add_arguments); both are finished when the process exits.
+    Only the first call does anything, so a main() can be run repeatedly.
+    """
+    global _started
+    if _started:
+        return
+    _started = True
+    script_name = script_name or os.path.splitext(os.path.basename(sys.argv[0]))[0]
+    metrics_out = getattr(args, "metrics_out", None)
+    profile = getattr(args, "profile", None)
+    profiler = _start_profiler(profile) if profile else None
+    profile_out = getattr(args, "profile_out", None) or (
+        f"{script_name}.prof"
+        if profile == "cprofile"
+        else f"{script_name}.profile.html"
+    )
+
+    root = span(script_name)
+    root.__enter__()
+    started = time.perf_counter()
+
+    def finish():
+        root.__exit__(None, None, None)
+        if profiler is not None:
+            _stop_profiler(profile, profiler, profile_out)
+        if metrics_out:
+            report = {
+                "script": script_name,
+                "argv": sys.argv[1:],
+                "wall_seconds": round(time.perf_counter() - started, 6),
+                **metrics.to_dict(),
+            }
+            with open(metrics_out, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            print(f"Metrics written to {metrics_out}", file=sys.stderr)
+
+    atexit.register(finish)
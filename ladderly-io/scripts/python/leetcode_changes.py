@@ -0,0 +1,107 @@
+"""
+leetcode_changes.py
+
+Change sets for refreshes of unified-leetcode-problems.json.
+
+create-unified-leetcode-list.py snapshots the unified list before its first
+overwrite; enrich_leetcode_difficulty.py (the last stage) diffs its output
+against that snapshot and writes leetcode-problems/changes/latest.json with
+added/removed slugs and per-field changes, so downstream sync such as the
+database seed can apply only the deltas.
+"""
+import json
+import shutil
+from pathlib import Path
+
+from leetcode_problem import Problem, load_problems
+
+CHANGES_DIR = Path(__file__).resolve().parent / "leetcode-problems" / "changes"
+BASELINE_PATH = CHANGES_DIR / "baseline.ignoreme.json"
+CHANGE_SET_PATH = CHANGES_DIR / "latest.json"
+
+# List-valued fields are reported as membership changes, the rest as old/new.
+SET_FIELDS = {"source", "patterns", "topicTags"}
+
+
+def snapshot_baseline(unified_path: Path) -> None:
+    """Keeps the pre-refresh unified list unless a refresh is already underway."""
+    if unified_path.exists() and not BASELINE_PATH.exists():
+        CHANGES_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(unified_path, BASELINE_PATH)
+
+
+def load_baseline(unified_path: Path) -> list[Problem]:
+    """The snapshot taken at the start of this refresh, else the current file."""
+    for path in (BASELINE_PATH, unified_path):
+        if path.exists():
+            return load_problems(path)
+    return []
+
+
+def diff_fields(old: dict, new: dict) -> dict:
+    changes = {}
+    for key in old.keys() | new.keys():
+        if key == "slug":
+            continue
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if key in SET_FIELDS:
+            before, after = set(before or ()), set(after or ())
+            if before == after:
+                continue
+            changes[key] = {
+                "added": sorted(after - before),
+                "removed": sorted(before - after),
+            }
+        else:
+            changes[key] = {"old": before, "new": after}
+    return dict(sorted(changes.items()))
+
+
+def diff_problems(old: list[Problem], new: list[Problem]) -> dict:
+    """
+    Computes the change set between two problem lists via slug-keyed indexes,
+    in time linear in the total number of problems.
+    """
+    old_by_slug = {p.slug: p for p in old}
+    new_by_slug = {p.slug: p for p in new}
+
+    added = [new_by_slug[s].to_dict() for s in sorted(new_by_slug - old_by_slug.keys())]
+    removed = sorted(old_by_slug.keys() - new_by_slug.keys())
+    changed = []
+    for slug in sorted(old_by_slug.keys() & new_by_slug.keys()):
+        current = new_by_slug[slug].to_dict()
+        fields = diff_fields(old_by_slug[slug].to_dict(), current)
+        if fields:
+            changed.append({"slug": slug, "changes": fields, "problem": current})
+
+    return {
+        "summary": {
+            "previous": len(old_by_slug),
+            "current": len(new_by_slug),
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed),
+        },
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+def write_change_set(change_set: dict, path: Path = CHANGE_SET_PATH) -> None:
+    """Writes the change set and ends the refresh by dropping the baseline."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(change_set, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    BASELINE_PATH.unlink(missing_ok=True)
+
+
+def describe(change_set: dict) -> str:
+    s = change_set["summary"]
+    return (
+        f"{s['added']} added, {s['removed']} removed, {s['changed']} changed "
+        f"({s['previous']} -> {s['current']} problems)"
+    )
@@ -0,0 +1,142 @@
+"""
+leetcode_dedup.py
+
+Near-duplicate detection for the unified LeetCode list. Problems that were
+renamed or aliased across source lists end up under different slugs; this
+module finds likely pairs via MinHash/LSH blocking on normalized-name
+trigrams, so only problems sharing a bucket are compared instead of every pair.
+
+Candidates are written to a reviewable merge plan. Entries whose status is
+set to "confirmed" are applied as aliases on later runs; "rejected" entries
+are remembered so they are not proposed again.
+"""
+import json
+import re
+import zlib
+from collections import defaultdict
+from itertools import combinations
+from pathlib import Path
+
+from leetcode_problem import Problem
+
+MERGE_PLAN_PATH = (
+    Path(__file__).resolve().parent / "leetcode-problems" / "dedup" / "merge-plan.json"
+)
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+# Sequel markers ("House Robber II" vs "III") look alike but are distinct problems.
+VARIANT_TOKEN_RE = re.compile(r"\b(?:[ivx]+|\d+)\b")
+
+NUM_HASHES = 32
+ROWS_PER_BAND = 4
+SIMILARITY_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+# Fixed coefficients keep bucket assignment stable across runs and machines.
+_HASH_PARAMS = [
+    (
+        zlib.crc32(f"a{i}".encode()) | 1,
+        zlib.crc32(f"b{i}".encode()),
+    )
+    for i in range(NUM_HASHES)
+]
+
+
+def name_shingles(name: str, n: int = 3) -> frozenset[str]:
+    """Character n-grams of the lowercased, punctuation-free name."""
+    text = NON_ALNUM_RE.sub(" ", name.lower()).strip()
+    if len(text) <= n:
+        return frozenset([text]) if text else frozenset()
+    return frozenset(text[i : i + n] for i in range(len(text) - n + 1))
+
+
+def variant_tokens(name: str) -> tuple[str, ...]:
+    return tuple(VARIANT_TOKEN_RE.findall(NON_ALNUM_RE.sub(" ", name.lower())))
+
+
+def minhash_signature(shingles: frozenset[str]) -> tuple[int, ...]:
+    hashed = [zlib.crc32(s.encode()) for s in shingles]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in _HASH_PARAMS
+    )
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def find_duplicate_candidates(
+    problems: dict[str, Problem], threshold: float = SIMILARITY_THRESHOLD
+) -> list[dict]:
+    """
+    Returns candidate pairs among `problems` (slug -> problem) whose names have
+    trigram Jaccard similarity >= threshold, sorted by descending similarity.
+    """
+    names = {slug: p.name or slug.replace("-", " ") for slug, p in problems.items()}
+    shingles = {slug: name_shingles(name) for slug, name in names.items()}
+
+    buckets: dict[tuple, list[str]] = defaultdict(list)
+    for slug, grams in shingles.items():
+        if not grams:
+            continue
+        signature = minhash_signature(grams)
+        for start in range(0, NUM_HASHES, ROWS_PER_BAND):
+            band = signature[start : start + ROWS_PER_BAND]
+            buckets[(start, band)].append(slug)
+
+    pairs: set[tuple[str, str]] = set()
+    for slugs in buckets.values():
+        if len(slugs) > 1:
+            pairs.update(combinations(sorted(slugs), 2))
+
+    candidates = []
+    for a, b in pairs:
+        if variant_tokens(names[a]) != variant_tokens(names[b]):
+            continue
+        similarity = jaccard(shingles[a], shingles[b])
+        if similarity < threshold:
+            continue
+        keep, alias = sorted((a, b), key=lambda s: (-len(problems[s].source), s))
+        candidates.append(
+            {
+                "keep": keep,
+                "alias": alias,
+                "names": [problems[keep].name, problems[alias].name],
+                "similarity": round(similarity, 3),
+                "status": "pending",
+            }
+        )
+    candidates.sort(key=lambda c: (-c["similarity"], c["keep"], c["alias"]))
+    return candidates
+
+
+def load_merge_plan(plan_path: Path = MERGE_PLAN_PATH) -> list[dict]:
+    if not plan_path.exists():
+        return []
+    with open(plan_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def confirmed_aliases(plan: list[dict]) -> dict[str, str]:
+    """Maps alias slug -> kept slug for every confirmed plan entry."""
+    return {e["alias"]: e["keep"] for e in plan if e.get("status") == "confirmed"}
+
+
+def update_merge_plan(plan: list[dict], candidates: list[dict]) -> list[dict]:
+    """
+    Keeps every reviewed (confirmed/rejected) entry and replaces the pending
+    ones with the current candidates that have not been reviewed yet.
+    """
+    reviewed = [e for e in plan if e.get("status") in ("confirmed", "rejected")]
+    seen = {frozenset((e["keep"], e["alias"])) for e in reviewed}
+    pending = [c for c in candidates if frozenset((c["keep"], c["alias"])) not in seen]
+    return reviewed + pending
+
+
+def write_merge_plan(plan: list[dict], plan_path: Path = MERGE_PLAN_PATH) -> None:
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(plan_path, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2, ensure_ascii=False)
+        f.write("\n")
@@ -0,0 +1,161 @@
+"""
+leetcode_problem.py
+
+Typed model for LeetCode problems as they flow through
+create-unified-leetcode-list.py and enrich_leetcode_difficulty.py.
+
+Raw JSON is validated (and its strings trimmed) once when it is loaded. After
+that the scripts work on slotted Problem objects: `source` is always a list,
+source and pattern names are interned, and difficulty is a Difficulty enum.
+"""
+import json
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+
+from leetcode_slugs import canonical_slug
+
+
+class Difficulty(str, Enum):
+    EASY = "Easy"
+    MEDIUM = "Medium"
+    HARD = "Hard"
+
+    @classmethod
+    def from_name(cls, name: str | None) -> "Difficulty | None":
+        try:
+            return cls(name)
+        except ValueError:
+            return None
+
+
+class ProblemValidationError(ValueError):
+    pass
+
+
+# Output key order; fields that are unset are omitted.
+_JSON_FIELDS = (
+    ("order_id", "order_id"),
+    ("href", "href"),
+    ("name", "name"),
+    ("source", "source"),
+    ("patterns", "patterns"),
+    ("difficulty", "difficulty"),
+    ("is_paid_only", "isPaidOnly"),
+    ("acceptance_rate", "acceptanceRate"),
+    ("topic_tags", "topicTags"),
+    ("slug", "slug"),
+)
+_KNOWN_KEYS = {key for _, key in _JSON_FIELDS}
+
+
+@dataclass(slots=True)
+class Problem:
+    href: str
+    name: str
+    slug: str
+    source: list[str] = field(default_factory=list)
+    patterns: list[str] = field(default_factory=list)
+    order_id: int | None = None
+    difficulty: Difficulty | None = None
+    is_paid_only: bool | None = None
+    acceptance_rate: float | None = None
+    topic_tags: list[str] | None = None
+    # Keys this model does not know about, passed through untouched.
+    extra: dict | None = None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Problem":
+        if not isinstance(raw, dict):
+            raise ProblemValidationError(
+                f"expected an object, got {type(raw).__name__}"
+            )
+
+        href = raw.get("href")
+        if not isinstance(href, str) or not (href := href.strip()):
+            raise ProblemValidationError(f"missing or empty 'href': {raw!r}")
+        name = raw.get("name", "")
+        if not isinstance(name, str):
+            raise ProblemValidationError(f"'name' must be a string: {raw!r}")
+
+        source = raw.get("source", ())
+        if isinstance(source, str):
+            source = (source,)
+
+        order_id = raw.get("order_id")
+        if order_id is not None and (
+            not isinstance(order_id, int) or isinstance(order_id, bool)
+        ):
+            raise ProblemValidationError(f"'order_id' must be an integer: {raw!r}")
+
+        difficulty = raw.get("difficulty")
+        if difficulty is not None:
+            try:
+                difficulty = Difficulty(difficulty)
+            except ValueError:
+                raise ProblemValidationError(
+                    f"unknown difficulty {difficulty!r}: {raw!r}"
+                ) from None
+
+        topic_tags = raw.get("topicTags")
+        unknown_keys = raw.keys() - _KNOWN_KEYS
+        return cls(
+            href=href,
+            name=name.strip(),
+            slug=canonical_slug(href),
+            source=_interned_strings(raw, "source", source),
+            patterns=_interned_strings(raw, "patterns", raw.get("patterns", ())),
+            order_id=order_id,
+            difficulty=difficulty,
+            is_paid_only=raw.get("isPaidOnly"),
+            acceptance_rate=raw.get("acceptanceRate"),
+            topic_tags=(
+                _interned_strings(raw, "topicTags", topic_tags)
+                if topic_tags is not None
+                else None
+            ),
+            extra={k: raw[k] for k in unknown_keys} if unknown_keys else None,
+        )
+
+    def to_dict(self) -> dict:
+        out = {}
+        for attr, key in _JSON_FIELDS:
+            value = getattr(self, attr)
+            if value is None:
+                continue
+            out[key] = value.value if isinstance(value, Difficulty) else value
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+def _interned_strings(raw: dict, key: str, values) -> list[str]:
+    if not isinstance(values, (list, tuple)):
+        raise ProblemValidationError(f"'{key}' must be a list of strings: {raw!r}")
+    try:
+        return [sys.intern(v.strip()) for v in values]
+    except (AttributeError, TypeError):
+        raise ProblemValidationError(
+            f"'{key}' must be a list of strings: {raw!r}"
+        ) from None
+
+
+def load_problems(path: Path) -> list[Problem]:
+    """Reads and validates a JSON array of problems."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, list):
+        raise ProblemValidationError(f"{path}: input must be a JSON array")
+    problems = []
+    for index, raw in enumerate(data):
+        try:
+            problems.append(Problem.from_dict(raw))
+        except ProblemValidationError as e:
+            raise ProblemValidationError(f"{path}[{index}]: {e}") from None
+    return problems
+
+
+def dump_problems(problems: list[Problem], path: Path, **json_kwargs) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([p.to_dict() for p in problems], f, indent=2, **json_kwargs)
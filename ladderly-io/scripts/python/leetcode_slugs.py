@@ -0,0 +1,31 @@
+"""
+leetcode_slugs.py
+
+Canonical LeetCode problem slugs, shared by create-unified-leetcode-list.py
+(merge keys) and enrich_leetcode_difficulty.py (REST/GraphQL lookups) so both
+scripts always agree on which problem an href refers to.
+
+Handles full and scheme-less URLs, trailing segments such as `/description/`
+or `/editorial/`, query strings, fragments, and bare slugs.
+"""
+import re
+from functools import lru_cache
+
+# The path segment right after `problems/`; anything after it is ignored.
+PROBLEM_SLUG_RE = re.compile(r"(?:^|/)problems/([^/?#\s]+)", re.IGNORECASE)
+QUERY_OR_FRAGMENT_RE = re.compile(r"[?#].*", re.DOTALL)
+
+
+@lru_cache(maxsize=65536)
+def canonical_slug(href: str) -> str:
+    """
+    Return the lowercase problem slug for a LeetCode URL or bare slug.
+    Falls back to the last non-empty path segment when there is no
+    `problems/` segment.
+    """
+    href = href.strip()
+    m = PROBLEM_SLUG_RE.search(href)
+    if m:
+        return m.group(1).lower()
+    path = QUERY_OR_FRAGMENT_RE.sub("", href).rstrip("/")
+    return path.rsplit("/", 1)[-1].lower()
@@ -0,0 +1,352 @@
+# batch.py
+
+"""
+Multi-Playlist Batch Mode
+
+Runs the report.py and main.py steps for several playlists, or for every
+upload of a channel, as one job. Playlists usually share videos, so each
+video is fetched and stored only once:
+   1. list every playlist's items concurrently (a channel is read through its
+      uploads playlist)
+   2. dedupe the video ids across all playlists
+   3. fetch statistics for the ids that are missing from the shared stats
+      cache or older than --max-stats-age hours, 50 ids per API call, with
+      the calls running concurrently
+   4. fetch transcripts and metadata for the ids not yet in video_data/,
+      --jobs at a time
+   5. derive each playlist's report CSV and consolidated transcript from the
+      shared store, parsing every saved video once
+
+Requires YOUTUBE_API_KEY in .env, like report.py. Playlists can be given as
+IDs or URLs; YOUTUBE_PLAYLIST_IDS (comma-separated) and YOUTUBE_CHANNEL_ID in
+.env are used when none are passed.
+
+Usage:
+   python batch.py --playlist PL... --playlist "https://www.youtube.com/playlist?list=PL..."
+   python batch.py --playlists-file playlists.txt   # one playlist per line
+   python batch.py --channel UC... [--jobs 8] [--skip-transcripts]
+   python batch.py --offline   # re-derive the outputs from the shared store
+
+Files:
+   video_data/                        shared transcripts (video_store.py)
+   video_stats.ignoreme.json          shared statistics cache, by video id
+   batch_manifest.ignoreme.json       video ids of each playlist, in order
+   playlists.ignoreme.d/<playlist id>/report_video_data.ignoreme.csv
+   playlists.ignoreme.d/<playlist id>/consolidated_transcript.txt
+
+The automated low/high-value lists are regenerated for the batch's videos
+that have statistics, as report.py does for one playlist; entries for other
+videos are kept. --offline leaves the lists alone.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import parse_qs, urlsplit
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+from http_transport import make_session
+from classify_videos import write_automated_lists
+from consolidate import output_file, video_block, write_atomically
+from exclusions import load_excluded_ids
+from main import fetch_and_save, output_dir
+from report import (
+    CSV_REPORT_FILE,
+    generate_full_report,
+    get_all_playlist_items,
+    get_channel_uploads_playlist,
+    get_video_details,
+    merge_video_details,
+)
+from video_store import DEFAULT_COMPRESSION, EXTENSIONS, load_video, video_files
+
+STATS_CACHE_FILE = "video_stats.ignoreme.json"
+MANIFEST_FILE = "batch_manifest.ignoreme.json"
+PLAYLISTS_DIR = "playlists.ignoreme.d"
+STATS_BATCH_SIZE = 50  # most ids videos.list accepts per call
+
+
+def parse_playlist_id(value):
+    """Accepts a playlist ID or any URL with a list= parameter."""
+    query = parse_qs(urlsplit(value).query)
+    if "list" in query:
+        return query["list"][0]
+    return value.strip()
+
+
+def read_playlists_file(path):
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.split("#", 1)[0].strip() for line in f]
+    return [parse_playlist_id(line) for line in lines if line]
+
+
+def load_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    """Writes atomically, so an interrupted run keeps the previous file."""
+    fd, tmp_path = tempfile.mkstemp(dir=".", prefix=".tmp-", suffix=".json")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+    instrumentation.count_file_written(path)
+
+
+@instrumentation.span("list playlists")
+def list_playlists(playlist_ids, pool):
+    """Returns {playlist_id: playlist items}, fetching the playlists concurrently."""
+    fetch = instrumentation.propagate(get_all_playlist_items)
+    return dict(zip(playlist_ids, pool.map(fetch, playlist_ids)))
+
+
+@instrumentation.span("refresh stats")
+def refresh_stats(titles, stats_cache, max_age_hours, pool):
+    """
+    Fetches statistics for the videos in `titles` that are missing from
+    `stats_cache` or older than `max_age_hours`, and updates the cache with
+    them and the latest titles. Returns the number of videos fetched.
+    """
+    now = time.time()
+    stale = [
+        video_id
+        for video_id in titles
+        if video_id not in stats_cache
+        or now - stats_cache[video_id]["fetched_at"] > max_age_hours * 3600
+    ]
+    instrumentation.count("stats.cache_hits", len(titles) - len(stale))
+    batches = [
+        stale[i : i + STATS_BATCH_SIZE] for i in range(0, len(stale), STATS_BATCH_SIZE)
+    ]
+    for video_details in pool.map(
+        instrumentation.propagate(get_video_details), batches
+    ):
+        for details in video_details:
+            stats_cache[details["video_id"]] = {**details, "fetched_at": now}
+    for video_id, title in titles.items():
+        # videos without statistics (e.g. private) keep their title and are retried
+        entry = stats_cache.setdefault(
+            video_id, {"video_id": video_id, "fetched_at": 0}
+        )
+        entry["title"] = title
+    return len(stale)
+
+
+def report_rows(video_ids, stats_cache):
+    """report.py rows for `video_ids` from the shared stats cache."""
+    items = [
+        {"video_id": v, "title": stats_cache.get(v, {}).get("title", "")}
+        for v in video_ids
+    ]
+    return merge_video_details(
+        items, [stats_cache[v] for v in video_ids if v in stats_cache]
+    )
+
+
+@instrumentation.span("fetch transcripts")
+def fetch_transcripts(video_ids, compression, bust_cache, jobs):
+    """Saves every video not yet in video_data/, `jobs` at a time."""
+    saved = video_files(output_dir)
+    missing = [v for v in video_ids if bust_cache or v not in saved]
+    instrumentation.count("videos_cached", len(video_ids) - len(missing))
+    print(f"Fetching {len(missing)} of {len(video_ids)} videos into {output_dir}/.")
+    session = make_session(pool_size=max(jobs, 1))
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {
+            pool.submit(
+                instrumentation.propagate(fetch_and_save),
+                video_id,
+                session,
+                compression,
+            ): video_id
+            for video_id in missing
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[warn] Could not save video {futures[future]}: {e}")
+
+
+@instrumentation.span("write playlist outputs")
+def write_playlist_outputs(manifest, stats_cache, raw_segments, strip_fillers):
+    """Writes each playlist's report and consolidated transcript from the shared store."""
+    excluded_ids = load_excluded_ids()
+    paths = video_files(output_dir)
+    blocks = {}
+    for video_ids in manifest.values():
+        for video_id in video_ids:
+            if video_id in blocks or video_id not in paths:
+                continue
+            blocks[video_id] = video_block(
+                load_video(paths[video_id]),
+                raw_segments=raw_segments,
+                strip_fillers=strip_fillers,
+            )
+            instrumentation.count_file_read(paths[video_id])
+
+    for playlist_id, video_ids in manifest.items():
+        playlist_dir = os.path.join(PLAYLISTS_DIR, playlist_id)
+        os.makedirs(playlist_dir, exist_ok=True)
+        generate_full_report(
+            report_rows(video_ids, stats_cache),
+            os.path.join(playlist_dir, CSV_REPORT_FILE),
+        )
+        included = [
+            blocks[v][0]
+            for v in video_ids
+            if blocks.get(v) is not None and v not in excluded_ids
+        ]
+        path = os.path.join(playlist_dir, output_file)
+        write_atomically(path, included)
+        instrumentation.count_file_written(path)
+        print(f"{playlist_id}: {len(video_ids)} videos, {len(included)} transcripts")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Report on and save transcripts for several playlists at once."
+    )
+    parser.add_argument(
+        "--playlist",
+        action="append",
+        default=[],
+        help="Playlist ID or URL; repeat for more playlists",
+    )
+    parser.add_argument("--playlists-file", help="File with one playlist per line")
+    parser.add_argument(
+        "--channel",
+        action="append",
+        default=[],
+        help="Channel ID (UC...) whose uploads to include; repeatable",
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=8, help="Concurrent playlist and video fetches"
+    )
+    parser.add_argument(
+        "--max-stats-age",
+        type=float,
+        default=24,
+        help="Hours before cached statistics are fetched again",
+    )
+    parser.add_argument(
+        "--skip-transcripts",
+        action="store_true",
+        help="Only refresh statistics and reports",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Make no API calls; derive the outputs from the last manifest and caches",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(EXTENSIONS),
+        default=DEFAULT_COMPRESSION,
+        help="How to store new videos in video_data/ (see video_store.py)",
+    )
+    parser.add_argument(
+        "--raw-segments",
+        action="store_true",
+        help="Consolidate without coalescing caption segments (see consolidate.py)",
+    )
+    parser.add_argument(
+        "--strip-fillers",
+        action="store_true",
+        help="Drop filler words from the consolidated transcripts",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    load_dotenv()
+    manifest = load_json(MANIFEST_FILE, {})
+    stats_cache = load_json(STATS_CACHE_FILE, {})
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if args.offline:
+        if not manifest:
+            print(f"No {MANIFEST_FILE} found. Run batch.py online first.")
+            return
+    else:
+        playlist_ids = [parse_playlist_id(p) for p in args.playlist]
+        if args.playlists_file:
+            playlist_ids += read_playlists_file(args.playlists_file)
+        channel_ids = args.channel
+        if not playlist_ids and not channel_ids:
+            playlist_ids = [
+                parse_playlist_id(p)
+                for p in os.getenv("YOUTUBE_PLAYLIST_IDS", "").split(",")
+                if p.strip()
+            ]
+            channel_ids = list(filter(None, [os.getenv("YOUTUBE_CHANNEL_ID")]))
+        if not playlist_ids and not channel_ids:
+            parser.error("pass --playlist, --playlists-file or --channel")
+
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            for channel_id, uploads_id in zip(
+                channel_ids,
+                pool.map(
+                    instrumentation.propagate(get_channel_uploads_playlist), channel_ids
+                ),
+            ):
+                if uploads_id is None:
+                    print(f"[warn] Channel {channel_id} was not found; skipping it.")
+                else:
+                    playlist_ids.append(uploads_id)
+            playlist_ids = list(dict.fromkeys(playlist_ids))
+            playlists = list_playlists(playlist_ids, pool)
+
+            manifest = {}
+            titles = {}
+            for playlist_id, items in playlists.items():
+                manifest[playlist_id] = [item["video_id"] for item in items]
+                for item in items:
+                    titles.setdefault(item["video_id"], item["title"])
+            total = sum(len(video_ids) for video_ids in manifest.values())
+            instrumentation.count("videos.unique", len(titles))
+            instrumentation.count("videos.duplicates", total - len(titles))
+            print(
+                f"{len(manifest)} playlists list {total} videos, {len(titles)} unique."
+            )
+            save_json(MANIFEST_FILE, manifest)
+
+            fetched = refresh_stats(titles, stats_cache, args.max_stats_age, pool)
+            print(f"Fetched statistics for {fetched} videos.")
+            save_json(STATS_CACHE_FILE, stats_cache)
+
+        if not args.skip_transcripts:
+            should_bust_cache = (
+                os.getenv("should_bust_cache", "False").lower() == "true"
+            )
+            fetch_transcripts(
+                list(titles), args.compression, should_bust_cache, args.jobs
+            )
+
+    if args.offline:
+        print("Offline: keeping the automated low/high-value lists as they are.")
+    else:
+        # Videos without fetched statistics would score as 0 views
+        video_ids = [
+            v
+            for v in dict.fromkeys(v for ids in manifest.values() for v in ids)
+            if stats_cache.get(v, {}).get("fetched_at")
+        ]
+        write_automated_lists(report_rows(video_ids, stats_cache), keep_others=True)
+    write_playlist_outputs(manifest, stats_cache, args.raw_segments, args.strip_fillers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# classify_videos.py
+
+"""
+Automated Low/High-Value Video Classifier
+
+Scores every video in the performance report from its stats and transcript,
+then writes `urls_low_value_automated.json` and `urls_high_value_automated.json`.
+report.py reruns this after every stats refresh, and exclusions.py reads
+the low-value list, so exclusions track the latest numbers instead of being
+curated by hand. The manual lists always win: a video in
+`urls_high_value_manual.json` is never marked low-value, and one in a manual
+low-value list is never marked high-value.
+
+Features, computed for all videos at once:
+   - views (log scale), likes per view and comments per view from the report
+   - transcript length in words, and talk density (words per second of video)
+   - keyword hits per 1,000 transcript words for KEYWORDS
+
+Each feature is standardized across the channel and combined with
+FEATURE_WEIGHTS. The bottom LOW_VALUE_QUANTILE of scores is low-value and the
+top HIGH_VALUE_QUANTILE is high-value; videos without a transcript score zero
+for the transcript features.
+
+Usage:
+   python classify_videos.py
+
+The report CSV (`python report.py`) and transcripts in `video_data/`
+(`python main.py`) should exist; missing transcripts are tolerated.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+from exclusions import (
+    HIGH_VALUE_AUTOMATED_FILE,
+    HIGH_VALUE_MANUAL_FILE,
+    LOW_VALUE_AUTOMATED_FILE,
+    LOW_VALUE_MANUAL_FILES,
+    load_url_list,
+    load_video_ids,
+    video_id_from_url,
+)
+from video_store import find_video_file, load_video
+
+DATA_DIR = "video_data"
+
+KEYWORDS = [
+    "ladderly",
+    "career",
+    "interview",
+    "resume",
+    "job",
+    "hiring",
+    "salary",
+    "software",
+    "engineer",
+    "developer",
+    "programming",
+    "coding",
+    "leetcode",
+    "algorithm",
+    "system design",
+    "portfolio",
+]
+KEYWORD_RE = re.compile(r"\b(?:" + "|".join(map(re.escape, KEYWORDS)) + r")\b")
+
+FEATURE_WEIGHTS = {
+    "log_views": 0.4,
+    "like_rate": 0.2,
+    "comment_rate": 0.1,
+    "talk_density": 0.15,
+    "keyword_rate": 0.15,
+}
+LOW_VALUE_QUANTILE = 0.3
+HIGH_VALUE_QUANTILE = 0.4
+
+
+def video_url(video_id):
+    return f"https://youtu.be/{video_id}"
+
+
+def transcript_features(video_id):
+    """
+    Returns (word count, keyword hits) for a saved transcript, or (0, 0)
+    when the video has no saved transcript.
+    """
+    path = find_video_file(video_id, DATA_DIR)
+    if path is None:
+        return 0, 0
+    segments = load_video(path).get("transcript") or []
+    text = " ".join(segment["text"] for segment in segments).lower()
+    return len(text.split()), len(KEYWORD_RE.findall(text))
+
+
+def standardize(values):
+    spread = values.std()
+    if spread == 0:
+        return np.zeros_like(values)
+    return (values - values.mean()) / spread
+
+
+def score_videos(video_data):
+    """
+    Scores report rows (dicts with video_id, view_count, like_count,
+    comment_count and duration_seconds). Returns an array aligned with
+    video_data; higher is more valuable.
+    """
+    views = np.array([v["view_count"] for v in video_data], dtype=float)
+    likes = np.array([v["like_count"] for v in video_data], dtype=float)
+    comments = np.array([v["comment_count"] for v in video_data], dtype=float)
+    durations = np.array([v["duration_seconds"] for v in video_data], dtype=float)
+    words, keyword_hits = (
+        np.array([transcript_features(v["video_id"]) for v in video_data], dtype=float)
+        .reshape(-1, 2)
+        .T
+    )
+
+    safe_views = np.maximum(views, 1)
+    features = {
+        "log_views": np.log1p(views),
+        "like_rate": likes / safe_views,
+        "comment_rate": comments / safe_views,
+        "talk_density": words / np.maximum(durations, 1),
+        "keyword_rate": 1000 * keyword_hits / np.maximum(words, 1),
+    }
+    return sum(
+        weight * standardize(features[name]) for name, weight in FEATURE_WEIGHTS.items()
+    )
+
+
+def classify_videos(video_data):
+    """
+    Returns (low-value URLs, high-value URLs), both sorted, honoring the
+    manual lists.
+    """
+    if not video_data:
+        return [], []
+    scores = score_videos(video_data)
+    low_cutoff = np.quantile(scores, LOW_VALUE_QUANTILE)
+    high_cutoff = np.quantile(scores, 1 - HIGH_VALUE_QUANTILE)
+    video_ids = np.array([v["video_id"] for v in video_data])
+
+    manual_low = set().union(*map(load_video_ids, LOW_VALUE_MANUAL_FILES))
+    manual_high = load_video_ids(HIGH_VALUE_MANUAL_FILE)
+    low = set(video_ids[scores <= low_cutoff]) - manual_high
+    high = set(video_ids[scores >= high_cutoff]) - manual_low - low
+    return sorted(map(video_url, low)), sorted(map(video_url, high))
+
+
+@instrumentation.span("classify videos")
+def write_automated_lists(video_data, keep_others=False):
+    """
+    Regenerates both automated URL lists from the latest report rows. With
+    keep_others, entries for videos that are not in video_data are kept, so
+    a subset of the channel can be reclassified on its own.
+    """
+    low, high = classify_videos(video_data)
+    if keep_others:
+        classified = {v["video_id"] for v in video_data}
+        low, high = (
+            sorted(
+                set(urls)
+                | {
+                    url
+                    for url in load_url_list(filename)
+                    if video_id_from_url(url) not in classified
+                }
+            )
+            for filename, urls in (
+                (LOW_VALUE_AUTOMATED_FILE, low),
+                (HIGH_VALUE_AUTOMATED_FILE, high),
+            )
+        )
+    for filename, urls in (
+        (LOW_VALUE_AUTOMATED_FILE, low),
+        (HIGH_VALUE_AUTOMATED_FILE, high),
+    ):
+        with open(filename, "w") as f:
+            json.dump(urls, f, indent=2)
+            f.write("\n")
+        instrumentation.count_file_written(filename)
+    print(
+        f"Classified {len(video_data)} videos: {len(low)} low-value, "
+        f"{len(high)} high-value."
+    )
+    return low, high
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Regenerate the automated low/high-value URL lists."
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    from report import load_video_data_from_csv
+
+    video_data = load_video_data_from_csv()
+    if not video_data:
+        print("No report data to classify. Run report.py first.")
+        return
+    write_automated_lists(video_data)
+
+
+if __name__ == "__main__":
+    main()
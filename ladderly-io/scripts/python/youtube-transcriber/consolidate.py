@@ -1,7 +1,25 @@
+import argparse
+import csv
+import gzip
 import os
-import json
+import sys
+import tempfile
+import time
 from typing import Optional, TypedDict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+from exclusions import load_excluded_ids, source_stamps
+from file_watch import watch_directory
+from transcript_segments import coalesce_segments, estimate_tokens
+from video_store import (
+    LOAD_ERRORS,
+    find_video_file,
+    load_video,
+    split_filename,
+    video_files,
+)
+
 
 class TranscriptSegment(TypedDict):
     text: str
@@ -27,6 +45,7 @@ class VideoData(TypedDict):
 
 data_dir = "video_data"
 output_file = "consolidated_transcript.txt"
+token_report_file = "token_reduction.ignoreme.csv"
 
 
 def replace_smart_quotes(s: str):
@@ -59,51 +78,319 @@ def remove_hashtags(title):
     return " ".join(word for word in title.split() if not word.startswith("#"))
 
 
+def open_text(path, mode):
+    """Opens a UTF-8 text file, gzip-compressed if the name ends in .gz."""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def transcript_text(segments, raw_segments=False, strip_fillers=False):
+    """
+    Returns (text, raw token estimate, written token estimate) for a transcript.
+    Segments are coalesced into paragraph blocks unless raw_segments is set.
+    """
+    raw_text = "\n".join([segment["text"] for segment in segments])
+    if raw_segments:
+        text = raw_text
+    else:
+        text = "\n".join(coalesce_segments(segments, strip_fillers=strip_fillers))
+    return text, estimate_tokens(raw_text), estimate_tokens(text)
+
+
+def video_block(video_data: VideoData, raw_segments=False, strip_fillers=False):
+    """
+    Returns (text, token report row) for one video's section of the
+    consolidated transcript, or None if it has no transcript.
+    """
+    if not video_data["transcript"]:
+        return None
+    transcript, raw_tokens, tokens = transcript_text(
+        video_data["transcript"],
+        raw_segments=raw_segments,
+        strip_fillers=strip_fillers,
+    )
+    row = {
+        "id": video_data["id"],
+        "raw_tokens": raw_tokens,
+        "tokens": tokens,
+        "reduction": (f"{1 - tokens / raw_tokens:.1%}" if raw_tokens else ""),
+    }
+
+    parts = [replace_smart_quotes(f"\nURL: {video_data['url']}\n")]
+    title = remove_hashtags(video_data["title"])
+    title = title.strip()
+    if title:
+        parts.append(replace_smart_quotes(f"Title: {title}\n"))
+    if video_data["description"]:
+        parts.append(
+            replace_smart_quotes(f"Description: {video_data['description']}\n")
+        )
+    parts.append("Transcript:\n")
+    parts.append(wrangle_transcript(transcript + "\n"))
+    return "".join(parts), row
+
+
+def write_token_report(token_rows):
+    with open(token_report_file, "w", newline="", encoding="utf-8") as csvfile:
+        writer = csv.DictWriter(
+            csvfile, fieldnames=["id", "raw_tokens", "tokens", "reduction"]
+        )
+        writer.writeheader()
+        writer.writerows(token_rows)
+
+
+def write_atomically(path, blocks):
+    """Replaces `path` in one step, so readers never see a half-written file."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)),
+        prefix=".consolidated-",
+        suffix=".gz" if path.endswith(".gz") else "",
+    )
+    os.close(fd)
+    with open_text(tmp_path, "w") as out_f:
+        out_f.writelines(blocks)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+
+
+class WatchedCorpus:
+    """
+    The consolidated transcript kept in memory as one block per video, in
+    output order, for --watch. New videos are appended to the output file;
+    an edited, deleted or newly excluded video rewrites it.
+    """
+
+    def __init__(self, output_path, raw_segments=False, strip_fillers=False):
+        self.output_path = output_path
+        self.options = {"raw_segments": raw_segments, "strip_fillers": strip_fillers}
+        self.blocks = {}
+        self.excluded_ids = load_excluded_ids()
+        self.writes = 0
+
+    def load(self, video_id, path):
+        """
+        Updates one video's block. Returns False if the file cannot be read
+        yet; finishing the write will report it as changed again.
+        """
+        try:
+            video_data = load_video(path)
+        except LOAD_ERRORS:
+            return False
+        instrumentation.count_file_read(path)
+        self.blocks[video_id] = video_block(video_data, **self.options)
+        return True
+
+    def included(self):
+        return [
+            block
+            for video_id, block in self.blocks.items()
+            if block is not None and video_id not in self.excluded_ids
+        ]
+
+    def rebuild(self):
+        for video_id, path in video_files(data_dir).items():
+            self.load(video_id, path)
+        self.write()
+
+    def write(self, appended=None):
+        """Writes the output (only `appended` ids' blocks, if given) and token report."""
+        included = self.included()
+        if appended is None:
+            write_atomically(self.output_path, [text for text, _ in included])
+        else:
+            with open_text(self.output_path, "a") as out_f:
+                for video_id in appended:
+                    block = self.blocks[video_id]
+                    if block is not None and video_id not in self.excluded_ids:
+                        out_f.write(block[0])
+        write_token_report([row for _, row in included])
+        instrumentation.count_file_written(self.output_path)
+        self.writes += 1
+
+    def apply(self, names):
+        """
+        Reloads the videos behind the changed file names and writes the output.
+        Returns the number of videos (added, updated, removed).
+        """
+        video_ids = {parsed[0] for parsed in map(split_filename, names) if parsed}
+        added, changed, removed = [], [], []
+        for video_id in sorted(video_ids):
+            path = find_video_file(video_id, data_dir)
+            if path is None:
+                if video_id in self.blocks:
+                    del self.blocks[video_id]
+                    removed.append(video_id)
+                continue
+            is_new = video_id not in self.blocks
+            previous = self.blocks.get(video_id)
+            if not self.load(video_id, path):
+                continue
+            if is_new:
+                added.append(video_id)
+            elif previous != self.blocks[video_id]:
+                changed.append(video_id)
+
+        excluded_ids = load_excluded_ids()
+        rewrite = changed or removed or excluded_ids != self.excluded_ids
+        self.excluded_ids = excluded_ids
+        if rewrite or added:
+            self.write(appended=None if rewrite else added)
+        return len(added), len(changed), len(removed)
+
+
+def watch(corpus, debounce=1.0, max_delay=10.0, poll=False, on_update=None):
+    """
+    Rebuilds the corpus, then applies changes in `data_dir` as they land.
+    Writes wait until no file has changed for `debounce` seconds, or at most
+    `max_delay` seconds while files keep changing; `on_update` is called
+    after each write. The exclusion lists are checked for edits every
+    `debounce` seconds while idle. Runs until interrupted.
+    """
+    watcher = watch_directory(data_dir, poll=poll, interval=debounce)
+    corpus.rebuild()
+    if on_update:
+        on_update()
+    print(
+        f"Consolidated {len(corpus.included())} transcripts to {corpus.output_path}; "
+        f"watching {data_dir}/ ({watcher.kind}). Press Ctrl+C to stop."
+    )
+    pending = set()
+    first_change = None
+    exclusion_stamps = source_stamps()
+    try:
+        while True:
+            names = watcher.wait(timeout=debounce)
+            now = time.monotonic()
+            if names:
+                pending |= names
+                first_change = first_change or now
+                if now - first_change < max_delay:
+                    continue
+            elif not pending and source_stamps() == exclusion_stamps:
+                # the exclusion lists live outside data_dir, so they are polled
+                continue
+            exclusion_stamps = source_stamps()
+            started = time.perf_counter()
+            writes = corpus.writes
+            with instrumentation.span("watch update"):
+                added, changed, removed = corpus.apply(pending)
+            pending = set()
+            first_change = None
+            if corpus.writes > writes:
+                if on_update:
+                    on_update()
+                print(
+                    f"[watch] {added} added, {changed} updated, {removed} removed, "
+                    f"{len(corpus.excluded_ids)} excluded; wrote {corpus.output_path} in {time.perf_counter() - started:.2f}s"
+                )
+    except KeyboardInterrupt:
+        if pending:
+            corpus.apply(pending)
+    finally:
+        watcher.close()
+
+
 def main():
+    parser = argparse.ArgumentParser(
+        description="Consolidate saved transcripts into one file for LLM usage."
+    )
+    parser.add_argument(
+        "--raw-segments",
+        action="store_true",
+        help="Write every caption segment on its own line, without coalescing.",
+    )
+    parser.add_argument(
+        "--strip-fillers",
+        action="store_true",
+        help="Drop filler words (um, uh, ...) and sound tags like [Music].",
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help=f"Write {output_file}.gz instead of {output_file}.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=f"Keep running and update the output as {data_dir}/ changes.",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        help="With --watch, seconds without changes before writing.",
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="With --watch, poll the directory instead of using inotify.",
+    )
+    parser.add_argument(
+        "--similarity-index",
+        action="store_true",
+        help="With --watch, also rebuild the similarity index after each update.",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
     if not os.path.exists(data_dir):
         print(f"The directory containing raw transcripts does not exist: {data_dir}")
         exit(1)
 
-    with open("urls_low_value_manual.json", "r") as low_value_urls_file:
-        low_value_urls = json.load(low_value_urls_file)
-
-    with open(output_file, "w", encoding="utf-8") as out_f:
-        for filename in os.listdir(data_dir):
-            if filename.endswith(".json"):
-                with open(os.path.join(data_dir, filename), "r") as in_f:
-                    video_data: VideoData = json.load(in_f)
-
-                    if (
-                        not video_data["transcript"]
-                        or video_data["url"] in low_value_urls
-                    ):
-                        continue
-
-                    transcript = "\n".join(
-                        [segment["text"] for segment in video_data["transcript"]]
-                    )
-
-                    out_f.write(replace_smart_quotes(f"\nURL: {video_data['url']}\n"))
-                    title = remove_hashtags(video_data["title"])
-                    title = title.strip()
-                    if title:
-                        out_f.write(replace_smart_quotes(f"Title: {title}\n"))
-                    if video_data["description"]:
-                        out_f.write(
-                            replace_smart_quotes(
-                                f"Description: {video_data['description']}\n"
-                            )
-                        )
-                    out_f.write("Transcript:\n")
-                    out_f.write(wrangle_transcript(transcript + "\n"))
-
-    print(f"Consolidated transcript written to {output_file}")
-
-    file_info = os.stat(output_file)
+    output_path = output_file + ".gz" if args.compress else output_file
+    if args.watch:
+        on_update = None
+        if args.similarity_index:
+            # similarity imports this module, so import it only when needed
+            from similarity import load_similarity_index as on_update
+        corpus = WatchedCorpus(output_path, args.raw_segments, args.strip_fillers)
+        watch(corpus, debounce=args.debounce, poll=args.poll, on_update=on_update)
+        return
+
+    excluded_ids = load_excluded_ids()
+    token_rows = []
+    with instrumentation.span("write transcripts"), open_text(
+        output_path, "w"
+    ) as out_f:
+        for path in video_files(data_dir).values():
+            video_data: VideoData = load_video(path)
+            instrumentation.count_file_read(path)
+
+            block = None
+            if video_data["id"] not in excluded_ids:
+                block = video_block(
+                    video_data,
+                    raw_segments=args.raw_segments,
+                    strip_fillers=args.strip_fillers,
+                )
+            if block is None:
+                instrumentation.count("videos_skipped")
+                continue
+            instrumentation.count("videos_written")
+
+            text, row = block
+            token_rows.append(row)
+            out_f.write(text)
+
+    instrumentation.count_file_written(output_path)
+    print(f"Consolidated transcript written to {output_path}")
+
+    write_token_report(token_rows)
+    raw_total = sum(row["raw_tokens"] for row in token_rows)
+    total = sum(row["tokens"] for row in token_rows)
+    if raw_total:
+        print(
+            f"Transcript tokens: {raw_total} raw -> {total} written "
+            f"({1 - total / raw_total:.1%} fewer); per video in {token_report_file}"
+        )
+
+    file_info = os.stat(output_path)
     file_size_MB = file_info.st_size / 1024 / 1024
     print(f"File size: {file_size_MB:.2f} MB")
 
-    with open(output_file, "r", encoding="utf-8") as f:
+    with open_text(output_path, "r") as f:
         text = f.read()
     char_count = len(text)
     print(f"Character count: {char_count}")
@@ -0,0 +1,136 @@
+# exclusions.py
+
+"""
+Video Exclusion Index
+
+One place that decides which videos are excluded from recommendations,
+playlists and the consolidated transcript. Every URL in the exclusion lists
+is canonicalized to its video id at load time, so callers do O(1) id lookups
+instead of comparing URL strings in whatever shape each list happens to use.
+
+Excluded videos are:
+   - every video in the manual low-value lists, plus
+   - every video in `urls_low_value_automated.json` (see classify_videos.py)
+     that is not in `urls_high_value_manual.json`
+
+The compiled id set is cached in `exclusions-cache.ignoreme.json` and rebuilt
+whenever one of the list files changes.
+"""
+
+import json
+import os
+import re
+from urllib.parse import parse_qs, urlparse
+
+LOW_VALUE_MANUAL_FILES = [
+    "urls_low_value_manual.ignoreme.json",
+    "urls_low_value_manual.json",
+]
+LOW_VALUE_AUTOMATED_FILE = "urls_low_value_automated.json"
+HIGH_VALUE_AUTOMATED_FILE = "urls_high_value_automated.json"
+HIGH_VALUE_MANUAL_FILE = "urls_high_value_manual.json"
+CACHE_FILE = "exclusions-cache.ignoreme.json"
+
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_HOSTS = {"youtube.com", "www.youtube.com", "m.youtube.com", "music.youtube.com"}
+
+
+def video_id_from_url(url):
+    """
+    Extracts the video ID from a YouTube URL, or accepts a bare video ID.
+
+    Handles youtu.be/<id>, youtube.com/watch?v=<id>, /embed/<id>, /v/<id>,
+    /shorts/<id> and /live/<id>, on any youtube.com host.
+
+    Args:
+        url (str): YouTube video URL or ID.
+
+    Returns:
+        str or None: Video ID if extracted, else None.
+    """
+    url = url.strip()
+    if VIDEO_ID_RE.match(url):
+        return url
+
+    parsed_url = urlparse(url if "//" in url else f"https://{url}")
+    hostname = (parsed_url.hostname or "").lower()
+    if hostname == "youtu.be":
+        return parsed_url.path[1:].split("/")[0] or None
+    if hostname in YOUTUBE_HOSTS:
+        if parsed_url.path == "/watch":
+            return parse_qs(parsed_url.query).get("v", [None])[0]
+        parts = parsed_url.path.split("/")
+        if len(parts) > 2 and parts[1] in ("embed", "v", "shorts", "live"):
+            return parts[2] or None
+    return None
+
+
+def load_url_list(filename):
+    """Reads a JSON list of video URLs; a missing file is an empty list."""
+    if not os.path.exists(filename):
+        return []
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        print(f"Error decoding JSON from {filename}. Skipping.")
+        return []
+
+
+def load_video_ids(filename):
+    """Reads a JSON list of video URLs as a set of video IDs."""
+    ids = set()
+    for url in load_url_list(filename):
+        video_id = video_id_from_url(url)
+        if video_id:
+            ids.add(video_id)
+        else:
+            print(f"Unrecognized YouTube URL in {filename}: {url}. Skipping.")
+    return ids
+
+
+def source_stamps():
+    """(mtime, size) of each list file that exists; changes when a list is edited."""
+    stamps = {}
+    for filename in [
+        *LOW_VALUE_MANUAL_FILES,
+        LOW_VALUE_AUTOMATED_FILE,
+        HIGH_VALUE_MANUAL_FILE,
+    ]:
+        if os.path.exists(filename):
+            stat = os.stat(filename)
+            stamps[filename] = [stat.st_mtime_ns, stat.st_size]
+    return stamps
+
+
+def build_excluded_ids():
+    excluded = set()
+    for filename in LOW_VALUE_MANUAL_FILES:
+        excluded |= load_video_ids(filename)
+    excluded |= load_video_ids(LOW_VALUE_AUTOMATED_FILE) - load_video_ids(
+        HIGH_VALUE_MANUAL_FILE
+    )
+    return excluded
+
+
+def load_excluded_ids(use_cache=True):
+    """
+    Returns the frozenset of excluded video IDs, from the on-disk cache when
+    no list file has changed since it was written.
+    """
+    stamps = source_stamps()
+    if use_cache and os.path.exists(CACHE_FILE):
+        try:
+            with open(CACHE_FILE, "r") as f:
+                cached = json.load(f)
+            if cached.get("sources") == stamps:
+                return frozenset(cached["video_ids"])
+        except (json.JSONDecodeError, KeyError):
+            pass
+
+    excluded = build_excluded_ids()
+    print(f"Built exclusion index: {len(excluded)} videos excluded.")
+    if use_cache:
+        with open(CACHE_FILE, "w") as f:
+            json.dump({"sources": stamps, "video_ids": sorted(excluded)}, f)
+    return frozenset(excluded)
@@ -0,0 +1,117 @@
+# file_watch.py
+
+"""
+Directory Change Watcher
+
+Reports which file names in one directory were created, rewritten, renamed or
+deleted. On Linux it uses inotify directly through ctypes, so nothing extra
+needs installing; elsewhere, or when inotify is unavailable, it compares
+directory snapshots (mtime and size) every `interval` seconds.
+
+   watcher = watch_directory("video_data")
+   changed_names = watcher.wait(timeout=1.0)  # empty set on timeout
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+# Writers that rename a finished temp file into place only trigger IN_MOVED_TO
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    kind = "inotify"
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {directory}")
+
+    def wait(self, timeout=None):
+        """Returns the names changed since the last call, waiting up to `timeout`."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        names = set()
+        while readable:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    names.add(os.fsdecode(name))
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    kind = "polling"
+
+    def __init__(self, directory, interval=1.0):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # removed while scanning
+                continue
+            snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Returns the names changed since the last call, waiting up to `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.scan()
+            names = {
+                name
+                for name in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(name) != self.snapshot.get(name)
+            }
+            self.snapshot = snapshot
+            if names:
+                return names
+            if deadline is None:
+                time.sleep(self.interval)
+            elif time.monotonic() >= deadline:
+                return set()
+            else:
+                time.sleep(min(self.interval, deadline - time.monotonic()))
+
+    def close(self):
+        pass
+
+
+def watch_directory(directory, poll=False, interval=1.0):
+    """An inotify watcher when possible, else a polling one."""
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(directory)
+        except (OSError, AttributeError) as e:
+            print(f"[warn] inotify is unavailable ({e}); polling instead")
+    return PollingWatcher(directory, interval)
@@ -1,54 +1,125 @@
-import json
+import argparse
 import os
+import sys
 from pytube import Playlist, YouTube
 from youtube_transcript_api import YouTubeTranscriptApi
 from dotenv import load_dotenv
 
-load_dotenv()
-playlist_url = os.getenv("youtube_playlist_url")
-should_bust_cache = os.getenv("should_bust_cache", "False").lower() == "true"
+try:
+    # Private in youtube-transcript-api 0.6.1 (pinned in requirements.txt);
+    # only list_transcripts() below uses it
+    from youtube_transcript_api._transcripts import TranscriptListFetcher
+except ImportError:
+    TranscriptListFetcher = None
 
-if not playlist_url:
-    playlist_url = input("Enter YouTube playlist URL: ")
+# Shared HTTP transport lives in the parent scripts directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from http_transport import make_session
+import instrumentation
+from video_store import DEFAULT_COMPRESSION, EXTENSIONS, find_video_file, save_video
 
 output_dir = "video_data"
-if not os.path.exists(output_dir):
-    os.makedirs(output_dir)
 
-playlist = Playlist(playlist_url)
-for url in playlist.video_urls:
-    video_id = url.split("?v=")[1]
 
-    # Check if we should bust cache
-    output_path = os.path.join(output_dir, f"{video_id}.json")
-    if not should_bust_cache and os.path.exists(output_path):
-        print(f"Skipping video {video_id} as it already exists in cache.")
-        continue
+def list_transcripts(video_id, session):
+    """
+    YouTubeTranscriptApi.list_transcripts(video_id) on `session` instead of a
+    fresh requests.Session, so transcripts share the pooled, retrying
+    transport. This is the body of list_transcripts in 0.6.1; if a later
+    version moves TranscriptListFetcher, the public API is used with the
+    session's proxies.
+    """
+    if TranscriptListFetcher is None:
+        return YouTubeTranscriptApi.list_transcripts(
+            video_id, proxies=session.proxies or None
+        )
+    return TranscriptListFetcher(session).fetch(video_id)
+
 
+def fetch_video(video_id, session):
+    """
+    Fetches one video's metadata through pytube and its English transcript
+    through `session`. The transcript is None if the video has none.
+    """
+    url = f"https://www.youtube.com/watch?v={video_id}"
     yt = YouTube(url)
     try:
-        transcript = YouTubeTranscriptApi.get_transcript(video_id)
+        # Same lookup as YouTubeTranscriptApi.get_transcript, on the shared session
+        with instrumentation.span("fetch transcript"):
+            transcript = (
+                list_transcripts(video_id, session).find_transcript(("en",)).fetch()
+            )
     except:
         print(
             f"An error occurred when trying to get the transcript of the video: {url}"
             "\nThe transcript may not exist."
         )
+        instrumentation.count("transcripts_missing")
         transcript = None
 
-    video_data = {
-        "id": video_id,
-        "url": f"https://youtu.be/{video_id}",
-        "title": yt.title,
-        "description": yt.description,
-        "publish_date": yt.publish_date.isoformat() if yt.publish_date else None,
-        "length": yt.length,
-        "views": yt.views,
-        "channel": yt.author,
-        "transcript": transcript,
-    }
-
-    output_path = os.path.join(output_dir, f"{video_id}.json")
-    with open(output_path, "w") as f:
-        json.dump(video_data, f, indent=2)
-
-print("Video data extracted to", output_dir)
+    # pytube fetches the watch page lazily, on the first attribute access
+    with instrumentation.span("fetch metadata"):
+        return {
+            "id": video_id,
+            "url": f"https://youtu.be/{video_id}",
+            "title": yt.title,
+            "description": yt.description,
+            "publish_date": yt.publish_date.isoformat() if yt.publish_date else None,
+            "length": yt.length,
+            "views": yt.views,
+            "channel": yt.author,
+            "transcript": transcript,
+        }
+
+
+def fetch_and_save(video_id, session, compression=DEFAULT_COMPRESSION):
+    output_path = save_video(fetch_video(video_id, session), output_dir, compression)
+    instrumentation.count_file_written(output_path)
+    instrumentation.count("videos_fetched")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Save metadata and transcripts for every video in a playlist."
+    )
+    parser.add_argument(
+        "--compression",
+        choices=list(EXTENSIONS),
+        default=DEFAULT_COMPRESSION,
+        help="How to store each video in video_data/ (see video_store.py)",
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    load_dotenv()
+    playlist_url = os.getenv("youtube_playlist_url")
+    should_bust_cache = os.getenv("should_bust_cache", "False").lower() == "true"
+
+    if not playlist_url:
+        playlist_url = input("Enter YouTube playlist URL: ")
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    # pytube opens its own urllib connections; transcripts share one pooled session
+    session = make_session()
+
+    playlist = Playlist(playlist_url)
+    for url in playlist.video_urls:
+        video_id = url.split("?v=")[1]
+
+        # Check if we should bust cache
+        if not should_bust_cache and find_video_file(video_id, output_dir):
+            print(f"Skipping video {video_id} as it already exists in cache.")
+            instrumentation.count("videos_cached")
+            continue
+
+        fetch_and_save(video_id, session, args.compression)
+
+    print("Video data extracted to", output_dir)
+
+
+if __name__ == "__main__":
+    main()
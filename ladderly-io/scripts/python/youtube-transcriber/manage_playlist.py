@@ -12,16 +12,28 @@ Usage:
 2. Run the script. All flags are optional:
    python manage_playlist.py --playlist-name "Your Playlist Name" [--video-count N]
    - If --video-count is omitted or set to -1, all top-performing videos will be added.
+   - With --similar-to URL, the playlist is that video followed by the videos whose
+     transcripts are most similar to it (see similarity.py) instead of top performers.
 """
 
 from datetime import datetime
 import os
+import sys
 import argparse
 from dotenv import load_dotenv
+from google.auth.credentials import AnonymousCredentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+
+# Shared HTTP transport lives in the parent scripts directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 from report import get_recommended_videos
+from exclusions import load_excluded_ids, video_id_from_url
+from similarity import load_similarity_index
+from http_transport import GoogleApiHttp, is_replaying, make_session
+import instrumentation
 
 # Scopes required for managing playlists
 SCOPES = ["https://www.googleapis.com/auth/youtube"]
@@ -33,6 +45,7 @@ CLIENT_SECRET_FILE = os.getenv(
 )
 
 
+@instrumentation.span("authenticate")
 def get_authenticated_service():
     """
     Authenticates the user with YouTube API using OAuth 2.0.
@@ -40,9 +53,14 @@ def get_authenticated_service():
     Returns:
         Resource: Authorized YouTube API client.
     """
-    flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-    credentials = flow.run_local_server(port=0)
-    return build("youtube", "v3", credentials=credentials)
+    if is_replaying():
+        # Recorded requests were scrubbed of credentials; skip the browser flow
+        credentials = AnonymousCredentials()
+    else:
+        flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
+        credentials = flow.run_local_server(port=0)
+    http = AuthorizedHttp(credentials, http=GoogleApiHttp(make_session()))
+    return build("youtube", "v3", http=http)
 
 
 def get_playlist_id(youtube, playlist_name):
@@ -103,6 +121,7 @@ def create_playlist(youtube, playlist_name, description=""):
         return None
 
 
+@instrumentation.span("clear playlist")
 def clear_playlist(youtube, playlist_id):
     """
     Clears all videos from a given playlist.
@@ -135,6 +154,7 @@ def clear_playlist(youtube, playlist_id):
         print(f"An error occurred while clearing playlist: {e}")
 
 
+@instrumentation.span("add videos")
 def add_videos_to_playlist(youtube, playlist_id, video_urls):
     """
     Adds a list of videos to a specified playlist.
@@ -144,12 +164,16 @@ def add_videos_to_playlist(youtube, playlist_id, video_urls):
         playlist_id (str): ID of the playlist.
         video_urls (list): List of YouTube video URLs to add.
     """
+    excluded_ids = load_excluded_ids()
     try:
         for url in video_urls:
             video_id = extract_video_id(url)
             if not video_id:
                 print(f"Invalid YouTube URL: {url}. Skipping.")
                 continue
+            if video_id in excluded_ids:
+                print(f"Video {video_id} is excluded as low-value. Skipping.")
+                continue
             request = youtube.playlistItems().insert(
                 part="snippet",
                 body={
@@ -177,19 +201,35 @@ def extract_video_id(url):
     Returns:
         str or None: Video ID if extracted, else None.
     """
-    from urllib.parse import urlparse, parse_qs
+    return video_id_from_url(url)
 
-    parsed_url = urlparse(url)
-    if parsed_url.hostname in ["youtu.be"]:
-        return parsed_url.path[1:]
-    if parsed_url.hostname in ["www.youtube.com", "youtube.com"]:
-        if parsed_url.path == "/watch":
-            return parse_qs(parsed_url.query).get("v", [None])[0]
-        elif parsed_url.path.startswith("/embed/"):
-            return parsed_url.path.split("/")[2]
-        elif parsed_url.path.startswith("/v/"):
-            return parsed_url.path.split("/")[2]
-    return None
+
+def get_similar_videos(url, n):
+    """
+    Recommends a video plus the n videos with the most similar transcripts,
+    skipping excluded videos.
+
+    Args:
+        url (str): YouTube URL of the seed video.
+        n (int): Number of similar videos. If n is -1, include every video with
+            any transcript overlap.
+
+    Returns:
+        list: List of recommended video URLs, seed first.
+    """
+    video_id = extract_video_id(url)
+    if not video_id:
+        print(f"Invalid YouTube URL: {url}.")
+        return []
+    index = load_similarity_index()
+    k = len(index.video_ids) if n == -1 else n
+    similar = index.similar_to(video_id, k, exclude=load_excluded_ids())
+    if not similar:
+        print(f"No saved transcript similar to {video_id}. Run main.py first?")
+        return []
+    return [f"https://youtu.be/{video_id}"] + [
+        f"https://youtu.be/{similar_id}" for similar_id, _ in similar
+    ]
 
 
 def main():
@@ -215,18 +255,29 @@ def main():
         default=-1,
         help="Number of top-performing videos to add to the playlist (-1 for all).",
     )
+    parser.add_argument(
+        "--similar-to",
+        type=str,
+        help="Fill the playlist with videos similar to this one instead of top performers.",
+    )
+    instrumentation.add_arguments(parser)
     args = parser.parse_args()
+    instrumentation.start(args)
 
     playlist_name = args.playlist_name
     video_count = args.video_count
     description = args.description
 
     # Fetch recommended videos using the specified video_count
-    if video_count == -1:
+    if args.similar_to:
+        print(f"Finding videos similar to {args.similar_to}...")
+        recommended_videos = get_similar_videos(args.similar_to, video_count)
+    elif video_count == -1:
         print("Fetching all recommended videos...")
+        recommended_videos = get_recommended_videos(video_count)
     else:
         print(f"Fetching top {video_count} recommended videos...")
-    recommended_videos = get_recommended_videos(video_count)
+        recommended_videos = get_recommended_videos(video_count)
     if not recommended_videos:
         print("No recommended videos found. Exiting.")
         return
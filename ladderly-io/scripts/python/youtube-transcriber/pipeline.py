@@ -0,0 +1,261 @@
+# pipeline.py
+
+"""
+Incremental Workflow Pipeline
+
+Runs the transcriber scripts as a DAG of stages. Each stage declares the files
+and directories it reads and writes; a stage is skipped, make-style, when the
+content hash of its inputs matches the last successful run and its outputs
+still exist. Stages whose dependencies are done run concurrently, so the
+report stats and the transcript fetch overlap; classification, which needs
+both, runs after them.
+
+Stages that call YouTube (report, transcripts, playlist) only see local inputs,
+so pass them to `force` to refresh remote data. The playlist stage rewrites a
+live playlist and only runs when named with `only`. Run it through invoke:
+   inv pipeline [--force report,transcripts] [--only consolidate] [--jobs 2]
+   inv pipeline --only playlist
+
+Hashes of the last successful runs live in `pipeline-state.ignoreme.json`.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from exclusions import (
+    HIGH_VALUE_AUTOMATED_FILE,
+    HIGH_VALUE_MANUAL_FILE,
+    LOW_VALUE_AUTOMATED_FILE,
+    LOW_VALUE_MANUAL_FILES,
+)
+
+STATE_FILE = "pipeline-state.ignoreme.json"
+# report.py's CSV; importing report.py would need its API client
+CSV_REPORT_FILE = "report_video_data.ignoreme.csv"
+
+
+@dataclass
+class Stage:
+    name: str
+    command: list[str]
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    deps: list[str] = field(default_factory=list)
+    opt_in: bool = False  # skipped unless named in `only`
+
+
+def python_stage(name, script, *args, **kwargs):
+    return Stage(name, [sys.executable, script, *args], **kwargs)
+
+
+# Every list exclusions.py reads, so editing any of them reruns its readers
+EXCLUSION_LISTS = [
+    *LOW_VALUE_MANUAL_FILES,
+    LOW_VALUE_AUTOMATED_FILE,
+    HIGH_VALUE_MANUAL_FILE,
+]
+
+STAGES = [
+    python_stage(
+        "report",
+        "report.py",
+        "--no-classify",
+        inputs=["report.py", ".env"],
+        outputs=[CSV_REPORT_FILE],
+    ),
+    python_stage(
+        "transcripts",
+        "main.py",
+        inputs=["main.py", "video_store.py", ".env"],
+        outputs=["video_data"],
+    ),
+    python_stage(
+        "classify",
+        "classify_videos.py",
+        inputs=[
+            "classify_videos.py",
+            "exclusions.py",
+            "video_store.py",
+            CSV_REPORT_FILE,
+            "video_data",
+            *LOW_VALUE_MANUAL_FILES,
+            HIGH_VALUE_MANUAL_FILE,
+        ],
+        outputs=[LOW_VALUE_AUTOMATED_FILE, HIGH_VALUE_AUTOMATED_FILE],
+        deps=["report", "transcripts"],
+    ),
+    python_stage(
+        "consolidate",
+        "consolidate.py",
+        inputs=[
+            "consolidate.py",
+            "transcript_segments.py",
+            "exclusions.py",
+            "video_store.py",
+            "video_data",
+            *EXCLUSION_LISTS,
+        ],
+        outputs=["consolidated_transcript.txt"],
+        deps=["classify", "transcripts"],
+    ),
+    python_stage(
+        "similarity",
+        "similarity.py",
+        inputs=["similarity.py", "video_store.py", "video_data"],
+        outputs=["similarity-index.ignoreme.npz", "similarity-index.ignoreme.json"],
+        deps=["transcripts"],
+    ),
+    # Rewrites a live YouTube playlist through an OAuth browser flow, so it
+    # only runs when asked for with --only playlist
+    python_stage(
+        "playlist",
+        "manage_playlist.py",
+        inputs=["manage_playlist.py", CSV_REPORT_FILE, *EXCLUSION_LISTS],
+        deps=["classify"],
+        opt_in=True,
+    ),
+]
+
+
+class ContentHasher:
+    """
+    Hashes files and directory trees, reusing a file's previous hash while its
+    size and mtime are unchanged.
+    """
+
+    def __init__(self, memo=None):
+        self.memo = memo or {}
+
+    def file_hash(self, path):
+        stat = os.stat(path)
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        cached = self.memo.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        self.memo[path] = [*stamp, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def path_hash(self, path):
+        if os.path.isdir(path):
+            digest = hashlib.sha256()
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    file_path = os.path.join(root, name)
+                    digest.update(f"{file_path}:{self.file_hash(file_path)}\n".encode())
+            return digest.hexdigest()
+        if os.path.exists(path):
+            return self.file_hash(path)
+        return "missing"
+
+    def inputs_hash(self, stage):
+        digest = hashlib.sha256(json.dumps(stage.command[1:]).encode())
+        for path in stage.inputs:
+            digest.update(f"{path}:{self.path_hash(path)}\n".encode())
+        return digest.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_FILE):
+        return {"stages": {}, "files": {}}
+    with open(STATE_FILE, "r") as f:
+        return json.load(f)
+
+
+def save_state(state):
+    with open(STATE_FILE, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def select_stages(stages, only=None):
+    """
+    `only` stages plus everything they depend on, in declaration order.
+    Without `only`, every stage except the opt-in ones.
+    """
+    if not only:
+        return [stage for stage in stages if not stage.opt_in]
+    by_name = {stage.name: stage for stage in stages}
+    unknown = set(only) - by_name.keys()
+    if unknown:
+        raise ValueError(f"unknown stages: {', '.join(sorted(unknown))}")
+    wanted = set()
+    pending = list(only)
+    while pending:
+        name = pending.pop()
+        if name not in wanted:
+            wanted.add(name)
+            pending.extend(by_name[name].deps)
+    return [stage for stage in stages if stage.name in wanted]
+
+
+def run_stage(stage):
+    started = time.perf_counter()
+    result = subprocess.run(stage.command, stdin=subprocess.DEVNULL)
+    return result.returncode, time.perf_counter() - started
+
+
+def run_pipeline(stages=STAGES, force=(), only=None, jobs=2):
+    """
+    Runs `stages` in dependency order, at most `jobs` at a time. Returns
+    {stage name: (status, seconds)} in declaration order, with status ran,
+    skipped, failed or blocked (a dependency failed).
+    """
+    stages = select_stages(stages, only)
+    state = load_state()
+    hasher = ContentHasher(state.get("files"))
+    results = {}
+    remaining = {stage.name: stage for stage in stages}
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while remaining or running:
+            for name, stage in list(remaining.items()):
+                if not all(dep in results for dep in stage.deps):
+                    continue
+                del remaining[name]
+                if any(results[dep][0] in ("failed", "blocked") for dep in stage.deps):
+                    results[name] = ("blocked", 0.0)
+                elif (
+                    name not in force
+                    and state["stages"].get(name) == hasher.inputs_hash(stage)
+                    and all(os.path.exists(path) for path in stage.outputs)
+                ):
+                    results[name] = ("skipped", 0.0)
+                else:
+                    print(f"[pipeline] running {name}: {' '.join(stage.command)}")
+                    running[pool.submit(run_stage, stage)] = stage
+            if not running:
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                returncode, seconds = future.result()
+                if returncode == 0:
+                    results[stage.name] = ("ran", seconds)
+                    # Hash after the run: a stage may rewrite its own inputs
+                    state["stages"][stage.name] = hasher.inputs_hash(stage)
+                else:
+                    results[stage.name] = ("failed", seconds)
+                    state["stages"].pop(stage.name, None)
+
+    state["files"] = hasher.memo
+    save_state(state)
+    return {stage.name: results[stage.name] for stage in stages}
+
+
+def print_summary(results):
+    print("\nstage          status   cache  seconds")
+    for name, (status, seconds) in results.items():
+        cache = {"skipped": "hit", "blocked": "-"}.get(status, "miss")
+        print(f"{name:14} {status:8} {cache:5} {seconds:8.2f}")
@@ -17,6 +17,8 @@ Usage:
      YOUTUBE_PLAYLIST_ID=<your_playlist_id>
 
 3. (Optional) Prepare Ignored URLs:
+   - `urls_low_value_automated.json` is regenerated by classify_videos.py each time the report is built
+   - exclusions.py merges these lists into one set of excluded video IDs
    - Create `urls_low_value_manual.ignoreme.json`
    - Each file should contain a list of YouTube video URLs to exclude from recommendations.
      Example content:
@@ -26,11 +28,15 @@ Usage:
      ]
 
 4. Run the script. All flags are optional:
-   python report.py [--offline-partial] [--recommend-next-n N]
+   python report.py [--offline-partial] [--recommend-next-n N] [--no-classify]
 
    Options:
    --offline-partial      Generate a partial report using cached data without making API calls
    --recommend-next-n     Recommend the next N top-performing videos based on the report
+   --no-classify          Skip regenerating the automated URL lists (run classify_videos.py later)
+
+HTTP requests go through ../http_transport.py (pooling, timeouts, retries); set
+LADDERLY_HTTP_REWRITE to point the YouTube API at a local fixture server.
 
 Note: This script fetches all publicly available metrics from the YouTube Data API for all videos in the specified playlist.
 Watch time is not available through this API, and dislike counts are no longer public.
@@ -38,6 +44,7 @@ The report focuses on views, likes, comments, and other available metrics.
 """
 
 import os
+import sys
 import csv
 import json
 import argparse
@@ -46,15 +53,25 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import isodate
 
+# Shared HTTP transport lives in the parent scripts directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+from http_transport import GoogleApiHttp, make_session
+from classify_videos import write_automated_lists
+from exclusions import load_excluded_ids
+
 load_dotenv()
 API_KEY = os.getenv("YOUTUBE_API_KEY")
 PLAYLIST_ID = os.getenv("YOUTUBE_PLAYLIST_ID")
 PROGRESS_FILE = "progress.ignoreme.json"
 CSV_REPORT_FILE = "report_video_data.ignoreme.csv"
 
-youtube = build("youtube", "v3", developerKey=API_KEY)
+youtube = build(
+    "youtube", "v3", developerKey=API_KEY, http=GoogleApiHttp(make_session())
+)
 
 
+@instrumentation.span("fetch playlist items")
 def get_all_playlist_items(playlist_id):
     """
     Retrieves all video items from the specified YouTube playlist.
@@ -94,6 +111,7 @@ def get_all_playlist_items(playlist_id):
     return videos
 
 
+@instrumentation.span("fetch video details")
 def get_video_details(video_ids):
     """
     Retrieves detailed statistics for a list of video IDs.
@@ -135,6 +153,57 @@ def get_video_details(video_ids):
     return video_details
 
 
+@instrumentation.span("fetch channel")
+def get_channel_uploads_playlist(channel_id):
+    """
+    Looks up the playlist holding every upload of a channel.
+
+    Args:
+        channel_id (str): The ID of the YouTube channel (starts with UC).
+
+    Returns:
+        str: The uploads playlist ID, or None if the channel was not found.
+    """
+    try:
+        response = (
+            youtube.channels().list(part="contentDetails", id=channel_id).execute()
+        )
+    except HttpError as e:
+        print(f"An HTTP error occurred while fetching channel {channel_id}: {e}")
+        return None
+    for item in response.get("items", []):
+        return item["contentDetails"]["relatedPlaylists"]["uploads"]
+    return None
+
+
+def merge_video_details(video_data, video_details):
+    """
+    Combines playlist items with their statistics into report rows.
+
+    Args:
+        video_data (list): Playlist items with video_id and title.
+        video_details (list): Video statistics from get_video_details.
+
+    Returns:
+        list: One report row per playlist item, with 0 for missing statistics.
+    """
+    merged_data = []
+    details_dict = {video["video_id"]: video for video in video_details}
+    for video in video_data:
+        details = details_dict.get(video["video_id"], {})
+        merged_data.append(
+            {
+                "video_id": video["video_id"],
+                "title": video["title"],
+                "view_count": details.get("view_count", 0),
+                "like_count": details.get("like_count", 0),
+                "comment_count": details.get("comment_count", 0),
+                "duration_seconds": details.get("duration_seconds", 0),
+            }
+        )
+    return merged_data
+
+
 def save_progress(video_data):
     """
     Saves the fetched video data to a progress JSON file.
@@ -164,14 +233,16 @@ def load_progress():
     return video_data
 
 
-def generate_full_report(video_data):
+@instrumentation.span("write report")
+def generate_full_report(video_data, path=CSV_REPORT_FILE):
     """
     Generates a CSV report from the video data.
 
     Args:
         video_data (list): A list of video data dictionaries.
+        path (str): Where to write the report.
     """
-    with open(CSV_REPORT_FILE, "w", newline="", encoding="utf-8") as csvfile:
+    with open(path, "w", newline="", encoding="utf-8") as csvfile:
         fieldnames = [
             "video_id",
             "title",
@@ -193,7 +264,8 @@ def generate_full_report(video_data):
                     "duration_seconds": video.get("duration_seconds", 0),
                 }
             )
-    print(f"Full report generated at {CSV_REPORT_FILE}.")
+    instrumentation.count_file_written(path)
+    print(f"Full report generated at {path}.")
 
 
 def load_video_data_from_csv():
@@ -248,34 +320,7 @@ def calculate_percentile(values, percentile):
     return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
 
 
-def load_ignored_urls():
-    """
-    Loads URLs to ignore from JSON files.
-
-    Returns:
-        set: A set of YouTube video URLs to exclude from recommendations.
-    """
-    ignored_files = [
-        "urls_low_value_manual.ignoreme.json",
-        "urls_low_value_manual.json",
-    ]
-    ignored_urls = set()
-
-    for filename in ignored_files:
-        if os.path.exists(filename):
-            try:
-                with open(filename, "r") as f:
-                    urls = json.load(f)
-                    ignored_urls.update(urls)
-                print(f"Loaded {len(urls)} URLs from {filename}.")
-            except json.JSONDecodeError:
-                print(f"Error decoding JSON from {filename}. Skipping.")
-        else:
-            print(f"Ignored URLs file {filename} not found. Skipping.")
-
-    return ignored_urls
-
-
+@instrumentation.span("recommend")
 def recommend_next_videos(n):
     """
     Recommends the next n top-performing videos based on view count percentile,
@@ -292,8 +337,8 @@ def recommend_next_videos(n):
         print("No video data available for recommendations.")
         return []
 
-    # Load ignored URLs
-    ignored_urls = load_ignored_urls()
+    # Load excluded video IDs (manual and automated low-value lists)
+    excluded_ids = load_excluded_ids()
 
     # Calculate the 75th percentile of view counts
     view_counts = [video["view_count"] for video in video_data]
@@ -304,11 +349,9 @@ def recommend_next_videos(n):
     top_videos = [video for video in video_data if video["view_count"] >= p75]
     print(f"Number of top-performing videos (view_count >= p75): {len(top_videos)}")
 
-    # Exclude ignored URLs
+    # Exclude ignored videos
     top_videos = [
-        video
-        for video in top_videos
-        if f"https://youtu.be/{video['video_id']}" not in ignored_urls
+        video for video in top_videos if video["video_id"] not in excluded_ids
     ]
     print(
         f"Number of top-performing videos after excluding ignored URLs: {len(top_videos)}"
@@ -334,7 +377,7 @@ def recommend_next_videos(n):
                     video
                     for video in video_data
                     if video["view_count"] < p75
-                    and f"https://youtu.be/{video['video_id']}" not in ignored_urls
+                    and video["video_id"] not in excluded_ids
                 ],
                 key=lambda x: x["view_count"],
                 reverse=True,
@@ -366,22 +409,10 @@ def get_recommended_videos(n):
         print("CSV report not found. Generating report first...")
         video_data = get_all_playlist_items(PLAYLIST_ID)
         video_details = get_video_details([video["video_id"] for video in video_data])
-        # Merge video_data and video_details
-        merged_data = []
-        details_dict = {video["video_id"]: video for video in video_details}
-        for video in video_data:
-            details = details_dict.get(video["video_id"], {})
-            merged_video = {
-                "video_id": video["video_id"],
-                "title": video["title"],
-                "view_count": details.get("view_count", 0),
-                "like_count": details.get("like_count", 0),
-                "comment_count": details.get("comment_count", 0),
-                "duration_seconds": details.get("duration_seconds", 0),
-            }
-            merged_data.append(merged_video)
+        merged_data = merge_video_details(video_data, video_details)
         save_progress(merged_data)
         generate_full_report(merged_data)
+        write_automated_lists(merged_data)
 
     return recommend_next_videos(n)
 
@@ -400,7 +431,14 @@ def main():
         type=int,
         help="Recommend the next n top-performing videos, assuming the CSV report is already created.",
     )
+    parser.add_argument(
+        "--no-classify",
+        action="store_true",
+        help="Do not regenerate the automated URL lists; run classify_videos.py once transcripts are saved.",
+    )
+    instrumentation.add_arguments(parser)
     args = parser.parse_args()
+    instrumentation.start(args)
 
     if args.recommend_next_n is not None:
         # Recommend next n videos
@@ -426,20 +464,7 @@ def main():
             video_details = get_video_details(
                 [video["video_id"] for video in video_data]
             )
-            # Merge video_data and video_details
-            merged_data = []
-            details_dict = {video["video_id"]: video for video in video_details}
-            for video in video_data:
-                details = details_dict.get(video["video_id"], {})
-                merged_video = {
-                    "video_id": video["video_id"],
-                    "title": video["title"],
-                    "view_count": details.get("view_count", 0),
-                    "like_count": details.get("like_count", 0),
-                    "comment_count": details.get("comment_count", 0),
-                    "duration_seconds": details.get("duration_seconds", 0),
-                }
-                merged_data.append(merged_video)
+            merged_data = merge_video_details(video_data, video_details)
             save_progress(merged_data)
 
         if not video_data:
@@ -450,6 +475,8 @@ def main():
 
         print(f"\nGenerating report for {len(video_data)} videos...")
         generate_full_report(video_data)
+        if not args.no_classify:
+            write_automated_lists(video_data)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,263 @@
+# similarity.py
+
+"""
+Transcript Similarity Engine
+
+Builds a TF-IDF matrix over the transcripts main.py saves in `video_data/` and
+answers "videos similar to X" with sparse cosine similarity, plus topic
+clusters for playlist building. The matrix is saved in the directory that
+holds `video_data/` (`similarity-index.ignoreme.npz` / `.json`), whatever the
+working directory, and rebuilt only when the set of transcript files or their
+modification times change.
+
+Usage:
+   python similarity.py --similar-to https://youtu.be/VIDEO_ID [-k 10]
+   python similarity.py --clusters 8
+
+manage_playlist.py --similar-to URL uses the same index to fill a playlist.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+from scipy import sparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+from consolidate import wrangle_transcript
+from exclusions import video_id_from_url
+from video_store import load_video, split_filename, video_files
+
+DATA_DIR = "video_data"
+INDEX_MATRIX_FILE = "similarity-index.ignoreme.npz"
+INDEX_META_FILE = "similarity-index.ignoreme.json"
+
+TOKEN_RE = re.compile(r"[a-z][a-z']+")
+STOP_WORDS = set(
+    """
+    a about after all also an and any are as at be because been but by can
+    could did do does doing don't for from get go going gonna got had has have
+    he her here him his how i i'm if in into is it it's its just know like
+    me more my no not now of on one or our out really right say so some than
+    that that's the their them then there they thing things think this to um
+    uh up us very was way we we're well were what when where which who will
+    with would yeah you you're your
+    """.split()
+)
+# Terms in more than this share of transcripts carry no topic signal
+MAX_DOCUMENT_FREQUENCY = 0.5
+MIN_DOCUMENT_COUNT = 2
+
+
+def index_paths(data_dir=DATA_DIR):
+    """The (matrix, metadata) files of the index built from `data_dir`."""
+    parent = os.path.dirname(os.path.abspath(data_dir))
+    return (
+        os.path.join(parent, INDEX_MATRIX_FILE),
+        os.path.join(parent, INDEX_META_FILE),
+    )
+
+
+def tokenize(text):
+    """Normalizes a transcript like consolidate.py does, then splits it into terms."""
+    return [
+        token
+        for token in TOKEN_RE.findall(wrangle_transcript(text))
+        if token not in STOP_WORDS
+    ]
+
+
+def load_transcripts(data_dir=DATA_DIR):
+    """Returns {video_id: transcript text} for every saved video with a transcript."""
+    transcripts = {}
+    for _, path in sorted(video_files(data_dir).items()):
+        video_data = load_video(path)
+        if video_data.get("transcript"):
+            transcripts[video_data["id"]] = " ".join(
+                segment["text"] for segment in video_data["transcript"]
+            )
+    return transcripts
+
+
+def source_fingerprint(data_dir=DATA_DIR):
+    digest = hashlib.sha256()
+    for entry in sorted(os.scandir(data_dir), key=lambda e: e.name):
+        if split_filename(entry.name):
+            digest.update(f"{entry.name}:{entry.stat().st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+class SimilarityIndex:
+    """
+    Row-normalized TF-IDF matrix (videos x terms), so a sparse product of two
+    rows is their cosine similarity.
+    """
+
+    def __init__(self, video_ids, terms, matrix):
+        self.video_ids = list(video_ids)
+        self.terms = list(terms)
+        self.matrix = matrix.tocsr()
+        self.positions = {video_id: i for i, video_id in enumerate(self.video_ids)}
+
+    @classmethod
+    @instrumentation.span("build similarity index")
+    def build(cls, transcripts):
+        """Builds the index from {video_id: transcript text}."""
+        video_ids = list(transcripts)
+        counts = [Counter(tokenize(transcripts[video_id])) for video_id in video_ids]
+        document_counts = Counter(term for c in counts for term in c)
+        max_count = MAX_DOCUMENT_FREQUENCY * len(video_ids)
+        terms = sorted(
+            term
+            for term, count in document_counts.items()
+            if MIN_DOCUMENT_COUNT <= count <= max_count
+        )
+        columns = {term: j for j, term in enumerate(terms)}
+
+        rows, cols, values = [], [], []
+        for i, c in enumerate(counts):
+            for term, count in c.items():
+                j = columns.get(term)
+                if j is not None:
+                    rows.append(i)
+                    cols.append(j)
+                    values.append(1 + math.log(count))
+        tf = sparse.csr_matrix(
+            (values, (rows, cols)), shape=(len(video_ids), len(terms))
+        )
+        idf = np.log((1 + len(video_ids)) / (1 + tf.getnnz(axis=0))) + 1
+        tfidf = tf.multiply(idf).tocsr()
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return cls(video_ids, terms, sparse.diags(1 / norms) @ tfidf)
+
+    def save(self, fingerprint, data_dir=DATA_DIR):
+        matrix_path, meta_path = index_paths(data_dir)
+        sparse.save_npz(matrix_path, self.matrix)
+        with open(meta_path, "w") as f:
+            json.dump(
+                {
+                    "fingerprint": fingerprint,
+                    "video_ids": self.video_ids,
+                    "terms": self.terms,
+                },
+                f,
+            )
+
+    @classmethod
+    def load(cls, fingerprint, data_dir=DATA_DIR):
+        """Returns the saved index if it was built from the same transcripts."""
+        matrix_path, meta_path = index_paths(data_dir)
+        if not (os.path.exists(meta_path) and os.path.exists(matrix_path)):
+            return None
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        if meta.get("fingerprint") != fingerprint:
+            return None
+        return cls(meta["video_ids"], meta["terms"], sparse.load_npz(matrix_path))
+
+    def similar_to(self, video_id, k=10, exclude=()):
+        """
+        Returns up to k (video_id, cosine similarity) pairs most similar to
+        video_id, best first, skipping the video itself and `exclude`.
+        """
+        position = self.positions.get(video_id)
+        if position is None:
+            return []
+        scores = (self.matrix @ self.matrix[position].T).toarray().ravel()
+        scores[position] = -1
+        for excluded_id in exclude:
+            if excluded_id in self.positions:
+                scores[self.positions[excluded_id]] = -1
+        k = min(k, int((scores > 0).sum()))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.video_ids[i], float(scores[i])) for i in top]
+
+    def topic_clusters(self, n_clusters=8, iterations=20, seed=0):
+        """
+        Spherical k-means over the TF-IDF rows. Returns a list of
+        (top terms, [video ids]) per cluster, largest first.
+        """
+        n_clusters = min(n_clusters, len(self.video_ids))
+        rng = np.random.default_rng(seed)
+        centroids = self.matrix[
+            rng.choice(len(self.video_ids), n_clusters, replace=False)
+        ].toarray()
+        for _ in range(iterations):
+            labels = np.asarray((self.matrix @ centroids.T).argmax(axis=1)).ravel()
+            for cluster in range(n_clusters):
+                members = self.matrix[labels == cluster]
+                if members.shape[0]:
+                    centroid = np.asarray(members.sum(axis=0)).ravel()
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1)
+
+        clusters = []
+        for cluster in range(n_clusters):
+            members = [self.video_ids[i] for i in np.flatnonzero(labels == cluster)]
+            if members:
+                top_terms = [self.terms[j] for j in np.argsort(-centroids[cluster])[:5]]
+                clusters.append((top_terms, members))
+        return sorted(clusters, key=lambda c: len(c[1]), reverse=True)
+
+
+def load_similarity_index(data_dir=DATA_DIR):
+    """Loads the saved index, rebuilding it first if the transcripts changed."""
+    fingerprint = source_fingerprint(data_dir)
+    index = SimilarityIndex.load(fingerprint, data_dir)
+    if index is None:
+        print("Building transcript similarity index...")
+        with instrumentation.span("load transcripts"):
+            transcripts = load_transcripts(data_dir)
+        index = SimilarityIndex.build(transcripts)
+        index.save(fingerprint, data_dir)
+        print(
+            f"Indexed {len(index.video_ids)} transcripts over {len(index.terms)} terms."
+        )
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript similarity engine")
+    parser.add_argument("--similar-to", help="YouTube URL or video ID")
+    parser.add_argument("-k", type=int, default=10, help="Number of similar videos")
+    parser.add_argument("--clusters", type=int, help="Print N topic clusters")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    if not os.path.exists(DATA_DIR):
+        print(f"The directory containing raw transcripts does not exist: {DATA_DIR}")
+        exit(1)
+    index = load_similarity_index()
+
+    if args.similar_to:
+        video_id = video_id_from_url(args.similar_to)
+        if video_id is None:
+            print(f"Not a YouTube video URL or ID: {args.similar_to}")
+            exit(1)
+        if video_id not in index.positions:
+            print(f"No saved transcript for {video_id}. Run main.py first?")
+            exit(1)
+        for similar_id, score in index.similar_to(video_id, args.k):
+            print(f"{score:.3f}  https://youtu.be/{similar_id}")
+    if args.clusters:
+        with instrumentation.span("topic clusters"):
+            clusters = index.topic_clusters(args.clusters)
+        for top_terms, members in clusters:
+            print(f"\n{len(members)} videos: {', '.join(top_terms)}")
+            for video_id in members:
+                print(f"  https://youtu.be/{video_id}")
+
+
+if __name__ == "__main__":
+    main()
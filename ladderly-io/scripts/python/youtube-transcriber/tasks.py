@@ -1,5 +1,7 @@
 from invoke import task, Context
 
+from pipeline import STAGES, print_summary, run_pipeline
+
 
 @task
 def format(ctx: Context) -> None:
@@ -7,3 +9,30 @@ def format(ctx: Context) -> None:
     Format code using black
     """
     ctx.run("black .")
+
+
+@task(
+    help={
+        "force": "Comma-separated stages to rerun even if up to date, e.g. report,transcripts",
+        "only": "Comma-separated stages to run, plus the stages they depend on",
+        "jobs": "Maximum stages to run at once",
+    }
+)
+def pipeline(ctx: Context, force: str = "", only: str = "", jobs: int = 2) -> None:
+    """
+    Run report, transcripts, classify, consolidate and similarity stages (and
+    playlist with --only playlist), skipping stages whose inputs are unchanged
+    (see pipeline.py)
+    """
+    names = {stage.name for stage in STAGES}
+    force_stages = set(filter(None, force.split(",")))
+    if force_stages - names:
+        raise ValueError(f"unknown stages: {', '.join(sorted(force_stages - names))}")
+    results = run_pipeline(
+        force=force_stages,
+        only=list(filter(None, only.split(","))),
+        jobs=jobs,
+    )
+    print_summary(results)
+    if any(status in ("failed", "blocked") for status, _ in results.values()):
+        raise SystemExit(1)
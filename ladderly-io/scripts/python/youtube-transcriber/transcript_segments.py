@@ -0,0 +1,101 @@
+# transcript_segments.py
+
+"""
+Transcript Segment Coalescing
+
+YouTube captions arrive as 2-3 second fragments, and auto-captions often
+repeat the tail of one fragment at the head of the next. This module merges
+segments into paragraph-sized blocks using their `start`/`duration`, drops
+words a segment repeats from its neighbor, and can strip filler words, so the
+consolidated transcript spends fewer LLM tokens on the same speech.
+
+A new block starts after a pause longer than `max_gap` seconds or once a block
+spans `max_block_seconds`. Overlap detection compares at most MAX_OVERLAP_WORDS
+words per segment, so the whole pass is linear in the number of segments.
+"""
+
+import re
+
+# Repeats shorter than this are left alone; "very very" is usually real speech
+MIN_OVERLAP_WORDS = 2
+MAX_OVERLAP_WORDS = 12
+
+FILLER_WORDS = {"um", "umm", "uh", "uhh", "uhm", "erm", "hmm", "mm", "mhm"}
+# Auto-caption sound tags such as [Music] or [Applause]
+SOUND_TAG_RE = re.compile(r"\[[^\]]*\]")
+PUNCTUATION = ".,!?;:\"'()"
+
+
+def estimate_tokens(text):
+    """Same rough estimate consolidate.py prints: about 4 characters per token."""
+    return len(text) // 4
+
+
+def _comparable(word):
+    return word.strip(PUNCTUATION).lower()
+
+
+def overlap_length(tail, words):
+    """
+    Length of the longest run that ends `tail` and starts `words`,
+    compared case- and punctuation-insensitively. `tail` is already in
+    comparable form and at most MAX_OVERLAP_WORDS long.
+    """
+    head = [_comparable(word) for word in words[:MAX_OVERLAP_WORDS]]
+    for size in range(min(len(tail), len(head)), MIN_OVERLAP_WORDS - 1, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    return 0
+
+
+def coalesce_segments(
+    segments, max_gap=2.0, max_block_seconds=45.0, strip_fillers=False
+):
+    """
+    Merges caption segments into blocks of text.
+
+    Args:
+        segments (list): TranscriptSegment dicts with text, start and duration.
+        max_gap (float): Pause, in seconds, that always starts a new block.
+        max_block_seconds (float): Longest span a block may cover.
+        strip_fillers (bool): Drop FILLER_WORDS and sound tags like [Music].
+
+    Returns:
+        list: One string per block, in order.
+    """
+    blocks = []
+    block_words = []
+    block_start = 0.0
+    previous_end = None
+    tail = []
+
+    for segment in segments:
+        text = segment["text"].replace("\n", " ")
+        if strip_fillers:
+            text = SOUND_TAG_RE.sub(" ", text)
+        words = text.split()
+        if strip_fillers:
+            words = [w for w in words if _comparable(w) not in FILLER_WORDS]
+        if not words:
+            continue
+
+        start = segment.get("start", 0.0)
+        end = start + segment.get("duration", 0.0)
+        if block_words and (
+            start - previous_end > max_gap or end - block_start > max_block_seconds
+        ):
+            blocks.append(" ".join(block_words))
+            block_words = []
+        if not block_words:
+            block_start = start
+        previous_end = end if previous_end is None else max(previous_end, end)
+
+        words = words[overlap_length(tail, words) :]
+        block_words.extend(words)
+        tail = (tail + [_comparable(word) for word in words[-MAX_OVERLAP_WORDS:]])[
+            -MAX_OVERLAP_WORDS:
+        ]
+
+    if block_words:
+        blocks.append(" ".join(block_words))
+    return blocks
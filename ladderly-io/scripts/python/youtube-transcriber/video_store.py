@@ -0,0 +1,267 @@
+# video_store.py
+
+"""
+Compressed Video Data Store
+
+main.py saves one JSON document per video in `video_data/`. Each file's
+extension says how it is stored, so all three formats can be read together:
+   <id>.json       plain, pretty-printed (the original format)
+   <id>.json.gz    gzip, compact JSON
+   <id>.json.zst   zstandard, compact JSON, with a dictionary trained on the
+                   saved videos once you run --train-dictionary (needs
+                   `pip install zstandard`)
+
+Compressed files take about a sixth of the space. Loading is dominated by
+JSON parsing, so zstd loads about as fast as plain files and gzip somewhat
+slower (benchmarks/bench_video_store.py). main.py writes zstd when zstandard
+is installed and gzip otherwise; set LADDERLY_VIDEO_DATA_COMPRESSION=none|gzip|zstd
+to override that. Readers decompress in chunks as they read.
+
+Usage:
+   python video_store.py --compress gzip   # convert every saved video
+   python video_store.py --train-dictionary
+   python video_store.py --stats
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .json.zst files
+    zstandard = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import instrumentation
+
+# What load_video raises for a missing, partly written or corrupt file
+LOAD_ERRORS = (OSError, EOFError, ValueError) + (
+    () if zstandard is None else (zstandard.ZstdError,)
+)
+
+DATA_DIR = "video_data"
+EXTENSIONS = {"none": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+DEFAULT_COMPRESSION = os.getenv(
+    "LADDERLY_VIDEO_DATA_COMPRESSION", "gzip" if zstandard is None else "zstd"
+)
+DICTIONARY_FILE = "zstd-dictionary.bin"
+DICTIONARY_SIZE = 112_640
+ZSTD_LEVEL = 10
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+READ_CHUNK_SIZE = 1 << 16
+
+_dictionaries = {}
+
+
+def split_filename(filename):
+    """Returns (video id, compression) for a video file name, else None."""
+    for compression, extension in EXTENSIONS.items():
+        if filename.endswith(extension):
+            return filename[: -len(extension)], compression
+    return None
+
+
+def video_files(data_dir=DATA_DIR):
+    """
+    Returns {video_id: path} for every saved video, in directory order. When
+    a video is stored in more than one format, the newest file wins.
+    """
+    files = {}
+    mtimes = {}
+    for entry in os.scandir(data_dir):
+        parsed = split_filename(entry.name)
+        if parsed is None:
+            continue
+        video_id = parsed[0]
+        mtime = entry.stat().st_mtime_ns
+        if video_id not in files or mtime > mtimes[video_id]:
+            files[video_id] = entry.path
+            mtimes[video_id] = mtime
+    return files
+
+
+def find_video_file(video_id, data_dir=DATA_DIR):
+    """Path of the saved video in any format, or None."""
+    for extension in EXTENSIONS.values():
+        path = os.path.join(data_dir, video_id + extension)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _zstd_dictionary(data_dir):
+    path = os.path.join(data_dir, DICTIONARY_FILE)
+    if not os.path.exists(path):
+        return None
+    mtime = os.stat(path).st_mtime_ns
+    cached = _dictionaries.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, "rb") as f:
+            cached = (mtime, zstandard.ZstdCompressionDict(f.read()))
+        _dictionaries[path] = cached
+    return cached[1]
+
+
+def _require_zstandard():
+    if zstandard is None:
+        raise RuntimeError(
+            "zstandard is not installed; run `pip install zstandard` to use .json.zst files"
+        )
+
+
+def load_video(path):
+    """Parses one saved video, decompressing as it reads."""
+    compression = split_filename(os.path.basename(path))[1]
+    with open(path, "rb") as f:
+        if compression == "none":
+            # json detects the encoding; parsing bytes skips a text decode layer
+            return json.load(f)
+        if compression == "gzip":
+            decompressor = zlib.decompressobj(GZIP_WBITS)
+            chunks = [
+                decompressor.decompress(chunk)
+                for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b"")
+            ]
+            chunks.append(decompressor.flush())
+            return json.loads(b"".join(chunks))
+        _require_zstandard()
+        dictionary = _zstd_dictionary(os.path.dirname(path))
+        decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+        with decompressor.stream_reader(f) as reader:
+            return json.load(reader)
+
+
+def iter_videos(data_dir=DATA_DIR):
+    """Yields every saved video's data, in directory order."""
+    for path in video_files(data_dir).values():
+        yield load_video(path)
+
+
+def encode_video(video_data, compression, data_dir=DATA_DIR):
+    if compression == "none":
+        return json.dumps(video_data, indent=2).encode("utf-8")
+    raw = json.dumps(video_data, separators=(",", ":")).encode("utf-8")
+    if compression == "gzip":
+        # mtime=0 keeps the bytes identical for identical content
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+    _require_zstandard()
+    compressor = zstandard.ZstdCompressor(
+        level=ZSTD_LEVEL, dict_data=_zstd_dictionary(data_dir)
+    )
+    return compressor.compress(raw)
+
+
+def save_video(video_data, data_dir=DATA_DIR, compression=DEFAULT_COMPRESSION):
+    """
+    Writes a video atomically in the given format and removes its copies in
+    other formats. Returns the path written.
+    """
+    if compression not in EXTENSIONS:
+        raise ValueError(f"unknown compression: {compression}")
+    path = os.path.join(data_dir, video_data["id"] + EXTENSIONS[compression])
+    data = encode_video(video_data, compression, data_dir)
+    fd, tmp_path = tempfile.mkstemp(dir=data_dir, prefix=".tmp-")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    for extension in EXTENSIONS.values():
+        other = os.path.join(data_dir, video_data["id"] + extension)
+        if other != path and os.path.exists(other):
+            os.remove(other)
+    return path
+
+
+def train_dictionary(data_dir=DATA_DIR, size=DICTIONARY_SIZE):
+    """
+    Trains the zstd dictionary on the saved videos and re-encodes existing
+    .json.zst files with it, since each file can only be read with the
+    dictionary it was written with.
+    """
+    _require_zstandard()
+    videos = list(iter_videos(data_dir))
+    samples = [
+        json.dumps(video_data, separators=(",", ":")).encode("utf-8")
+        for video_data in videos
+    ]
+    dictionary = zstandard.train_dictionary(size, samples)
+    path = os.path.join(data_dir, DICTIONARY_FILE)
+    with open(path, "wb") as f:
+        f.write(dictionary.as_bytes())
+    _dictionaries.pop(path, None)
+    for video_data in videos:
+        if find_video_file(video_data["id"], data_dir).endswith(EXTENSIONS["zstd"]):
+            save_video(video_data, data_dir, "zstd")
+    return path
+
+
+def compress_all(compression, data_dir=DATA_DIR):
+    """Rewrites every saved video in the given format. Returns the count."""
+    if compression == "zstd":
+        _require_zstandard()
+    if compression == "zstd" and _zstd_dictionary(data_dir) is None:
+        try:
+            train_dictionary(data_dir)
+        except zstandard.ZstdError as e:  # e.g. too few videos to train on
+            print(f"[warn] Compressing without a zstd dictionary: {e}")
+    count = 0
+    for video_id, path in video_files(data_dir).items():
+        if split_filename(os.path.basename(path))[1] != compression:
+            save_video(load_video(path), data_dir, compression)
+            count += 1
+    return count
+
+
+def disk_usage(data_dir=DATA_DIR):
+    """Returns {compression: (file count, total bytes)}."""
+    usage = {compression: (0, 0) for compression in EXTENSIONS}
+    for entry in os.scandir(data_dir):
+        parsed = split_filename(entry.name)
+        if parsed:
+            files, size = usage[parsed[1]]
+            usage[parsed[1]] = (files + 1, size + entry.stat().st_size)
+    return usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the saved video data")
+    parser.add_argument(
+        "--compress",
+        choices=list(EXTENSIONS),
+        help="Rewrite every saved video in this format",
+    )
+    parser.add_argument(
+        "--train-dictionary",
+        action="store_true",
+        help="Retrain the zstd dictionary on the saved videos",
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="Print file counts and sizes per format"
+    )
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args()
+    instrumentation.start(args)
+
+    if not os.path.exists(DATA_DIR):
+        print(f"The directory containing raw transcripts does not exist: {DATA_DIR}")
+        exit(1)
+    if args.train_dictionary:
+        with instrumentation.span("train dictionary"):
+            print(f"Trained zstd dictionary: {train_dictionary()}")
+    if args.compress:
+        with instrumentation.span("compress"):
+            count = compress_all(args.compress)
+        instrumentation.count("videos_converted", count)
+        print(f"Converted {count} videos to {args.compress}.")
+    if args.stats or not (args.compress or args.train_dictionary):
+        for compression, (files, size) in disk_usage().items():
+            print(f"{compression:5} {files:6} files {size / 1024 / 1024:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()